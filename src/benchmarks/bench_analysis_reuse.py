@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Gap analysis: cold scan vs persisted report vs reuse within a run
+
+Installs --leaders synthetic leaders (some with missing or extra files, plus a
+few orphaned leader directories), then times a cold analysis, the next run
+reusing the persisted report, a second analysis in the same run, and a run
+after one leader changed, checking every report equals a fresh scan.
+
+Usage:
+    python benchmarks/bench_analysis_reuse.py [--leaders 2000] [--specialists 4]
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.analyzer import GapAnalyzer
+from models.manifest import SkillsManifest
+
+
+def leader(i: int, specialists: int) -> dict:
+    return {
+        'name': f"leader-{i:05d}",
+        'domain': 'generic',
+        'phase': '4-implementation',
+        'specialists': [
+            {'id': f"spec-{j}", 'name': f"Specialist {i}.{j}", 'domain': f"Domain {j}", 'skills': ['review']}
+            for j in range(specialists)
+        ]
+    }
+
+
+def install(skills_root: Path, data: dict) -> None:
+    short = data['name'].replace('-leader', '')
+    leader_path = skills_root / data['name']
+    files = [
+        "SKILL.md",
+        f"agents/leader-{short}.md",
+        "workflows/route-to-specialist.yaml",
+        "references/routing-rules.md",
+    ] + [f"agents/specialist-{s['id']}.md" for s in data['specialists']]
+    for rel in files:
+        path = leader_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(rel)
+
+
+def age(root: Path, seconds: int = 60) -> None:
+    """Backdate the tree so its report is not racy and gets persisted"""
+    stamp = time.time() - seconds
+    for dirpath, dirnames, filenames in os.walk(root):
+        for name in dirnames + filenames:
+            os.utime(os.path.join(dirpath, name), (stamp, stamp))
+
+
+def timed(analyzer: GapAnalyzer, manifest):
+    start = time.perf_counter()
+    report = analyzer.analyze(manifest)
+    return report, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark gap analysis reuse')
+    parser.add_argument('--leaders', type=int, default=2000, help='Leaders in the manifest')
+    parser.add_argument('--specialists', type=int, default=4, help='Specialists per leader')
+    args = parser.parse_args()
+    
+    root = Path(tempfile.mkdtemp(prefix="bmad-analysis-bench-"))
+    # Saved reports go to the user cache directory; keep them with the project
+    os.environ['BMAD_PROVISIONER_CACHE'] = str(root / "cache")
+    try:
+        leaders = [leader(i, args.specialists) for i in range(args.leaders)]
+        manifest_path = root / "manifest.yaml"
+        manifest_path.write_text(yaml.safe_dump(
+            {'project': {'name': 'bench', 'bmad_version': 'v6.x', 'root': str(root), 'leaders': leaders}},
+            sort_keys=False
+        ))
+        manifest = SkillsManifest.from_yaml(manifest_path)
+        
+        (root / "_bmad" / "_config").mkdir(parents=True)
+        (root / "_bmad" / "_config" / "manifest.yaml").write_text("installation:\n  version: 6.0.0\n")
+        skills_root = root / "_bmad" / "custom-skills"
+        for i, data in enumerate(leaders):
+            if i % 10:
+                install(skills_root, data)
+            if i % 10 and i % 7 == 0:
+                (skills_root / data['name'] / "agents" / "specialist-retired.md").write_text("old")
+        # Orphans: leaders the manifest does not declare
+        for i in range(5):
+            install(skills_root, leader(args.leaders + i, 1))
+        age(root)
+        
+        print(f"📊 {args.leaders} leaders x {args.specialists} specialists")
+        cold, cold_time = timed(GapAnalyzer(root), manifest)
+        print(f"⏱️  Cold scan: {cold_time:.3f}s")
+        
+        analyzer = GapAnalyzer(root)
+        persisted, persisted_time = timed(analyzer, manifest)
+        print(f"⏱️  Next run, persisted report: {persisted_time:.3f}s "
+              f"({cold_time / persisted_time:.1f}x faster, reused={analyzer.context.reused})")
+        again, again_time = timed(analyzer, manifest)
+        print(f"⏱️  Same run, second analysis: {again_time * 1000:.2f}ms")
+        
+        changed = leaders[1]['name']
+        (skills_root / changed / "references" / "routing-rules.md").unlink()
+        analyzer = GapAnalyzer(root)
+        after, after_time = timed(analyzer, manifest)
+        print(f"⏱️  One leader changed: {after_time:.3f}s (reused={analyzer.context.reused})")
+        
+        fresh = GapAnalyzer(root)
+        fresh.report_path = root / "unused.json"
+        expected = fresh.analyze(manifest)
+        
+        if persisted.to_dict() != cold.to_dict() or again.to_dict() != cold.to_dict():
+            print("❌ Reused report differs from the scan")
+            return 1
+        if analyzer.context.reused or after.to_dict() != expected.to_dict():
+            print("❌ Stale report reused after a change")
+            return 1
+        print("✅ Same reports, change detected")
+        return 0
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark - CSV merge in memory vs spilled to disk under a memory budget
+
+Writes a --rows CSV with user edits and custom rows, merges freshly generated
+rows into two copies of it, once in memory and once through the spill path
+(budget exhausted), and reports the time and traced peak memory of each. The
+merged CSVs and their .base sidecars must be byte-identical.
+
+Usage:
+    python benchmarks/bench_csv_spill.py [--rows 100000]
+"""
+
+import sys
+import csv
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.csv_merger import SmartCSVMerger, CSVBaseStore
+from core.memory import MemoryBudget, format_bytes
+
+
+HEADERS = ['keyword', 'category', 'risk_level']
+
+
+def generated_rows(rows: int, rng: random.Random, revision: str):
+    return [
+        [f"keyword-{i:07d}", f"category {rng.randrange(50)} {revision}", rng.choice(['low', 'medium', 'high'])]
+        for i in range(rows)
+    ]
+
+
+def write_project_csv(csv_path: Path, rows: int, rng: random.Random) -> None:
+    """Provision once, then edit like a user: changed cells and custom rows"""
+    SmartCSVMerger().merge(csv_path, generated_rows(rows, rng, 'v1'), HEADERS)
+    with open(csv_path, 'r', newline='', encoding='utf-8') as f:
+        existing = list(csv.reader(f))[1:]
+    for row in existing:
+        if rng.random() < 0.05:
+            row[2] = 'critical'
+    existing += [[f"custom-{i:06d}", 'user', 'high'] for i in range(rows // 20)]
+    rng.shuffle(existing)
+    SmartCSVMerger().write_csv(csv_path, HEADERS, existing)
+
+
+def timed(merge):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = merge()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark in-memory vs spilled CSV merges')
+    parser.add_argument('--rows', type=int, default=100000, help='Generated rows in the CSV')
+    args = parser.parse_args()
+    
+    root = Path(tempfile.mkdtemp(prefix="bmad-spill-bench-"))
+    try:
+        memory_csv = root / "memory" / "phi-keywords.csv"
+        spill_csv = root / "spill" / "phi-keywords.csv"
+        write_project_csv(memory_csv, args.rows, random.Random(0))
+        spill_csv.parent.mkdir(parents=True)
+        for path in (memory_csv, CSVBaseStore(memory_csv).path):
+            shutil.copy(path, spill_csv.parent / path.name)
+        size = memory_csv.stat().st_size
+        
+        new_rows = generated_rows(args.rows, random.Random(1), 'v2')
+        merger = SmartCSVMerger()
+        result, memory_time, memory_peak = timed(lambda: merger.merge(memory_csv, new_rows, HEADERS))
+        print(f"📊 {result.total_rows} rows ({format_bytes(size)}): in memory {memory_time:.2f}s, "
+              f"peak {format_bytes(memory_peak)}")
+        
+        spilled, spill_time, spill_peak = timed(lambda: merger.merge(
+            spill_csv, new_rows, HEADERS, budget=MemoryBudget(0)
+        ))
+        print(f"💽 Spilled to disk: {spill_time:.2f}s, peak {format_bytes(spill_peak)}")
+        
+        identical = (
+            memory_csv.read_bytes() == spill_csv.read_bytes()
+            and CSVBaseStore(memory_csv).path.read_bytes() == CSVBaseStore(spill_csv).path.read_bytes()
+        )
+        same_stats = (
+            (result.new_rows, result.preserved_rows, result.updated_rows, result.custom_rows, result.removed_rows)
+            == (spilled.new_rows, spilled.preserved_rows, spilled.updated_rows, spilled.custom_rows, spilled.removed_rows)
+        )
+        if spilled.spilled_rows is None or not identical or not same_stats:
+            print("❌ Spilled merge differs from the in-memory merge")
+            return 1
+        print(f"✅ Identical output, {memory_peak / max(spill_peak, 1):.1f}x less peak memory")
+        return 0
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
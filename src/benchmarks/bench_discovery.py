@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Project discovery on a synthetic workspace
+
+Builds a temporary tree of ~10k directories (projects, nested sources,
+node_modules and virtualenvs that must be pruned) with a handful of BMAD
+installations, then times ProjectDiscovery against it.
+
+Usage:
+    python benchmarks/bench_discovery.py [--dirs 10000] [--projects 10] [--budget 10]
+"""
+
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.discovery import ProjectDiscovery
+
+
+MANIFEST = """installation:
+  version: 6.0.0-Beta.2
+modules:
+  - name: core
+    version: 6.0.0-Beta.2
+  - name: bmm
+    version: 6.0.0-Beta.2
+"""
+
+
+def build_tree(root: Path, total_dirs: int, projects: int) -> int:
+    """Create the synthetic workspace, return the number of directories made"""
+    created = 0
+    per_project = max(1, total_dirs // max(projects * 4, 1))
+    
+    for p in range(projects * 4):
+        project = root / f"project-{p:04d}"
+        
+        # Only one checkout in four is a BMAD project
+        if p % 4 == 0:
+            config = project / "_bmad" / "_config"
+            config.mkdir(parents=True)
+            (config / "manifest.yaml").write_text(MANIFEST)
+            (project / "_bmad" / "custom-skills" / "qa-leader").mkdir(parents=True)
+            created += 4
+        
+        # Pruned trees: a BMAD manifest inside them must not be found
+        decoy = project / "node_modules" / "pkg" / "_bmad" / "_config"
+        decoy.mkdir(parents=True)
+        (decoy / "manifest.yaml").write_text(MANIFEST)
+        venv = project / "env"
+        (venv / "lib").mkdir(parents=True)
+        (venv / "pyvenv.cfg").write_text("home = /usr/bin\n")
+        created += 7
+        
+        for d in range(per_project):
+            (project / "src" / f"pkg{d // 50}" / f"mod{d}").mkdir(parents=True, exist_ok=True)
+            created += 1
+    
+    return created
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark BMAD project discovery')
+    parser.add_argument('--dirs', type=int, default=10000, help='Approximate directories to create')
+    parser.add_argument('--projects', type=int, default=10, help='BMAD projects to plant')
+    parser.add_argument('--budget', type=float, default=10.0, help='Fail above this many seconds')
+    args = parser.parse_args()
+    
+    root = Path(tempfile.mkdtemp(prefix="bmad-discovery-bench-"))
+    try:
+        created = build_tree(root, args.dirs, args.projects)
+        print(f"🌲 Synthetic tree: ~{created} directories, {args.projects} BMAD projects")
+        
+        start = time.perf_counter()
+        projects = ProjectDiscovery().discover(root)
+        elapsed = time.perf_counter() - start
+        
+        print(f"⏱️  Discovery: {elapsed:.3f}s, {len(projects)} project(s) found")
+        
+        if len(projects) != args.projects:
+            print(f"❌ Expected {args.projects} projects")
+            return 1
+        if elapsed > args.budget:
+            print(f"❌ Over budget ({args.budget}s)")
+            return 1
+        
+        print("✅ Within budget")
+        return 0
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark - CLI import time per mode
+
+Runs bmad_provisioner.py under `python -X importtime` for each mode against a
+throwaway project, subtracts the bare interpreter's own imports, and reports
+each mode's import time next to `import yaml` (what every manifest mode needs
+at least). Absolute times depend on the machine; which modules each mode may
+import is checked by tests/test_import_time.py.
+
+Usage:
+    python benchmarks/bench_import_time.py [--repeat 10]
+"""
+
+import sys
+import shutil
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+from typing import List, Tuple
+
+CLI = Path(__file__).parent.parent / "bmad_provisioner.py"
+
+MODES = ['validate', 'analyze', 'diff', 'impact', 'verify', 'backups', 'discover']
+
+MANIFEST = """project:
+  name: import-bench
+  bmad_version: v6.x
+  root: {root}
+  leaders:
+    - name: dev-leader
+      domain: generic
+      specialists:
+        - id: backend
+          name: Backend Developer
+          domain: FastAPI
+          skills: [REST APIs]
+"""
+
+
+def parse_importtime(stderr: str) -> Tuple[int, List[str]]:
+    """Sum the self time (us) of every import and list the imported modules"""
+    total = 0
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        total += int(self_us)
+        modules.append(name.strip())
+    return total, modules
+
+
+def measure(args: List[str], repeat: int) -> Tuple[float, List[str]]:
+    """Best-of-repeat import time in ms, with the modules of the last run"""
+    best = None
+    modules = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime'] + args,
+            capture_output=True, text=True
+        )
+        total, modules = parse_importtime(result.stderr)
+        best = total if best is None else min(best, total)
+    return best / 1000, modules
+
+
+def mode_args(mode: str, root: Path, manifest: Path) -> List[str]:
+    if mode == 'discover':
+        return [str(CLI), '--mode', 'discover', '--discover-root', str(root)]
+    return [str(CLI), '--config', str(manifest), '--mode', mode]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark CLI import time per mode')
+    parser.add_argument('--repeat', type=int, default=10, help='Runs per mode (best is kept)')
+    args = parser.parse_args()
+    
+    root = Path(tempfile.mkdtemp(prefix="bmad-import-bench-"))
+    try:
+        config = root / "_bmad" / "_config"
+        config.mkdir(parents=True)
+        (config / "manifest.yaml").write_text("installation:\n  version: 6.0.0\nmodules: []\n")
+        (config / "files-manifest.csv").write_text("type,name,module,path,hash\n")
+        manifest = root / "skills-manifest.yaml"
+        manifest.write_text(MANIFEST.format(root=root))
+        
+        baseline, _ = measure(['-c', 'pass'], args.repeat)
+        floor, _ = measure(['-c', 'import yaml'], args.repeat)
+        floor -= baseline
+        print(f"🐍 Interpreter startup imports: {baseline:.1f} ms, import yaml: {floor:.1f} ms")
+        
+        for mode in MODES:
+            elapsed, modules = measure(mode_args(mode, root, manifest), args.repeat)
+            own = elapsed - baseline
+            print(f"⏱️  {mode:<9} {own:6.1f} ms ({own / floor:.1f}x import yaml, {len(modules)} modules)")
+        return 0
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
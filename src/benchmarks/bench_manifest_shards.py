@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Loading a monolithic manifest vs leader shards vs one leader (--only)
+
+Writes --leaders synthetic leaders once as a single manifest and once as
+leaders/*.yaml shards, then times SkillsManifest.from_yaml on each and with
+only=[one leader], and checks the parsed leaders are the same.
+
+Usage:
+    python benchmarks/bench_manifest_shards.py [--leaders 3000] [--specialists 4]
+"""
+
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from models.manifest import SkillsManifest, YAML_LOADER
+
+
+def leader(i: int, specialists: int) -> dict:
+    return {
+        'name': f"leader-{i:05d}",
+        'domain': 'generic',
+        'phase': '4-implementation',
+        'specialists': [
+            {
+                'id': f"spec-{j}",
+                'name': f"Specialist {i}.{j}",
+                'domain': f"Domain {(i + j) % 23}",
+                'skills': [f"skill-{(i * j + k) % 97}" for k in range(6)]
+            }
+            for j in range(specialists)
+        ]
+    }
+
+
+def timed(path: Path, only=None):
+    start = time.perf_counter()
+    manifest = SkillsManifest.from_yaml(path, only=only)
+    return manifest, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark sharded manifest loading')
+    parser.add_argument('--leaders', type=int, default=3000, help='Leaders in the manifest')
+    parser.add_argument('--specialists', type=int, default=4, help='Specialists per leader')
+    args = parser.parse_args()
+    
+    root = Path(tempfile.mkdtemp(prefix="bmad-manifest-bench-"))
+    try:
+        leaders = [leader(i, args.specialists) for i in range(args.leaders)]
+        project = {'name': 'bench', 'bmad_version': 'v6.x', 'root': str(root)}
+        
+        monolithic = root / "monolithic.yaml"
+        monolithic.write_text(yaml.safe_dump({'project': {**project, 'leaders': leaders}}, sort_keys=False))
+        
+        sharded = root / "sharded.yaml"
+        sharded.write_text(yaml.safe_dump({'project': {**project, 'leader_files': ['leaders/*.yaml']}}))
+        (root / "leaders").mkdir()
+        for data in leaders:
+            (root / "leaders" / f"{data['name']}.yaml").write_text(yaml.safe_dump(data, sort_keys=False))
+        
+        print(f"📄 {args.leaders} leaders x {args.specialists} specialists ({YAML_LOADER.__name__})")
+        full, full_time = timed(monolithic)
+        print(f"⏱️  Monolithic manifest: {full_time:.3f}s")
+        shards, shard_time = timed(sharded)
+        print(f"⏱️  Shards: {shard_time:.3f}s")
+        target = leaders[len(leaders) // 2]['name']
+        one, one_time = timed(sharded, only=[target])
+        print(f"⏱️  Shards, --only {target}: {one_time:.4f}s ({full_time / one_time:.0f}x faster than monolithic)")
+        
+        if full.project.leaders != shards.project.leaders:
+            print("❌ Sharded manifest parsed differently")
+            return 1
+        if [l.name for l in one.project.leaders] != [target] or len(one.project.leader_names) != args.leaders:
+            print("❌ --only loaded the wrong leaders")
+            return 1
+        print("✅ Same leaders")
+        return 0
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Packaging many leaders: cold build, incremental rebuild, determinism
+
+Creates --leaders synthetic leader trees, packages them (cold), packages again
+(every archive reused), changes one leader (only it is rebuilt), then rebuilds
+from scratch into a second directory and checks the archives are byte-identical.
+
+Usage:
+    python benchmarks/bench_packaging.py [--leaders 200] [--files 30] [--workers 8]
+"""
+
+import sys
+import time
+import random
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.packager import SkillPackager
+
+
+WORDS = "route specialist leader workflow domain review agent skill phase validate".split()
+
+
+def build_tree(skills_root: Path, leaders: int, files: int, rng: random.Random) -> None:
+    for i in range(leaders):
+        leader_dir = skills_root / f"leader-{i:04d}"
+        for j in range(files):
+            sub = ("agents", "workflows", "references", "data")[j % 4]
+            path = leader_dir / sub / f"file-{j:03d}.md"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("\n".join(" ".join(rng.choices(WORDS, k=12)) for _ in range(60)))
+        (leader_dir / ".render-state.json").write_text("{}")
+
+
+def timed(packager: SkillPackager, leaders):
+    start = time.perf_counter()
+    results = packager.package(leaders)
+    return results, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark skill packaging')
+    parser.add_argument('--leaders', type=int, default=200, help='Leaders to package')
+    parser.add_argument('--files', type=int, default=30, help='Files per leader')
+    parser.add_argument('--workers', type=int, default=None, help='Packaging threads (default: CPU count)')
+    args = parser.parse_args()
+    
+    root = Path(tempfile.mkdtemp(prefix="bmad-package-bench-"))
+    try:
+        skills_root = root / "custom-skills"
+        build_tree(skills_root, args.leaders, args.files, random.Random(0))
+        leaders = sorted(p.name for p in skills_root.iterdir())
+        
+        packager = SkillPackager(skills_root, root / "out", max_workers=args.workers)
+        results, cold = timed(packager, leaders)
+        size = sum(r.size for r in results)
+        print(f"📦 {args.leaders} leaders x {args.files} files: cold build {cold:.3f}s, {size / 1024:.0f} KB")
+        
+        results, warm = timed(packager, leaders)
+        reused = sum(1 for r in results if r.reused)
+        print(f"♻️  Unchanged rebuild: {warm:.3f}s, {reused}/{len(results)} reused")
+        
+        (skills_root / leaders[0] / "agents" / "file-000.md").write_text("changed")
+        results, one = timed(packager, leaders)
+        rebuilt = [r.leader for r in results if not r.reused]
+        print(f"🔁 One leader changed: {one:.3f}s, rebuilt {rebuilt}")
+        
+        fresh = SkillPackager(skills_root, root / "out-fresh", max_workers=args.workers)
+        fresh_results = fresh.package(leaders)
+        identical = all(
+            a.archive.name == b.archive.name and a.archive.read_bytes() == b.archive.read_bytes()
+            for a, b in zip(results, fresh_results)
+        )
+        
+        if reused != len(leaders) or rebuilt != [leaders[0]]:
+            print("❌ Incremental rebuild did not reuse unchanged leaders")
+            return 1
+        if not identical:
+            print("❌ Archives are not reproducible")
+            return 1
+        print("✅ Reproducible and incremental")
+        return 0
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark - PHI keyword scanning throughput on synthetic source files
+
+Writes --size-mb of text spread over --files files (plus a binary file that
+must be skipped), plants a known number of PHI keywords, then times
+PhiScanner over the tree.
+
+Usage:
+    python benchmarks/bench_phi_scan.py [--size-mb 200] [--files 50] [--min-rate 1024]
+"""
+
+import sys
+import time
+import random
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.phi_scanner import PhiScanner, PhiKeyword
+
+
+KEYWORDS = ['patient', 'medical record', 'diagnosis', 'prescription', 'SSN', 'insurance', 'PHI']
+WORDS = "def return class import self value data result config items index buffer request".split()
+
+
+def build_tree(root: Path, size_mb: int, files: int, rng: random.Random) -> int:
+    """Create the synthetic files, return the number of planted keywords"""
+    lines = [" ".join(rng.choices(WORDS, k=10)) + "\n" for _ in range(1000)]
+    block = "".join(lines).encode()
+    per_file = size_mb * 1024 * 1024 // files
+    planted = 0
+    
+    for i in range(files):
+        path = root / f"pkg{i % 8}" / f"module_{i:04d}.py"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as f:
+            written = 0
+            while written < per_file:
+                f.write(block)
+                written += len(block)
+                f.write(f"# {rng.choice(KEYWORDS)} handled here\n".encode())
+                planted += 1
+    
+    (root / "image.bin").write_bytes(b"\0patient" * 1024)
+    return planted
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark PHI keyword scanning')
+    parser.add_argument('--size-mb', type=int, default=200, help='Total text to scan (MB)')
+    parser.add_argument('--files', type=int, default=50, help='Files to spread it over')
+    parser.add_argument('--min-rate', type=float, default=1024.0, help='Fail below this many MB/minute')
+    args = parser.parse_args()
+    
+    root = Path(tempfile.mkdtemp(prefix="bmad-phi-bench-"))
+    try:
+        planted = build_tree(root, args.size_mb, args.files, random.Random(0))
+        print(f"📝 Synthetic tree: {args.size_mb} MB in {args.files} files, {planted} planted keywords")
+        
+        keywords = {k.lower(): PhiKeyword(k, 'PHI', 'HIGH') for k in KEYWORDS}
+        scanner = PhiScanner(keywords)
+        
+        start = time.perf_counter()
+        found = sum(1 for _ in scanner.scan(root))
+        elapsed = time.perf_counter() - start
+        
+        rate = scanner.stats.bytes / (1024 * 1024) / elapsed * 60
+        print(f"⏱️  Scan: {elapsed:.3f}s, {rate:.0f} MB/minute, {scanner.stats.skipped} skipped")
+        
+        if found != planted:
+            print(f"❌ Expected {planted} findings, got {found}")
+            return 1
+        if rate < args.min_rate:
+            print(f"❌ Below {args.min_rate:.0f} MB/minute")
+            return 1
+        
+        print("✅ Within budget")
+        return 0
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
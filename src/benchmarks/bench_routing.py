@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Keyword routing throughput on a synthetic routing table
+
+Compiles a table of --specialists specialists with --keywords keywords each,
+then routes --requests generated prompts (each planting one specialist's
+keywords) and checks that every request reaches the planted specialist.
+
+Usage:
+    python benchmarks/bench_routing.py [--specialists 200] [--keywords 20] [--requests 10000] [--budget 10]
+"""
+
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.router import RoutingTable
+
+
+FILLER = "please help us review the module before the next release and explain the tradeoffs".split()
+
+
+def build_rules(specialists: int, keywords: int) -> dict:
+    rules = {}
+    for s in range(specialists):
+        for k in range(keywords):
+            rules[f"term{s}x{k}"] = {f"spec{s:04d}": 1.0}
+    return rules
+
+
+def build_requests(specialists: int, keywords: int, count: int, rng: random.Random) -> list:
+    requests = []
+    for _ in range(count):
+        target = rng.randrange(specialists)
+        words = rng.sample(FILLER, 8)
+        for k in rng.sample(range(keywords), 3):
+            words.insert(rng.randrange(len(words) + 1), f"term{target}x{k}")
+        requests.append((" ".join(words), f"spec{target:04d}"))
+    return requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark keyword routing')
+    parser.add_argument('--specialists', type=int, default=200, help='Specialists in the table')
+    parser.add_argument('--keywords', type=int, default=20, help='Keywords per specialist')
+    parser.add_argument('--requests', type=int, default=10000, help='Requests to route')
+    parser.add_argument('--budget', type=float, default=10.0, help='Fail above this many seconds')
+    args = parser.parse_args()
+    
+    rng = random.Random(0)
+    
+    start = time.perf_counter()
+    table = RoutingTable.compile("bench-leader", build_rules(args.specialists, args.keywords))
+    compiled = time.perf_counter() - start
+    print(f"🧩 Compiled {args.specialists * args.keywords} keywords in {compiled:.3f}s")
+    
+    requests = build_requests(args.specialists, args.keywords, args.requests, rng)
+    
+    start = time.perf_counter()
+    misses = sum(1 for text, expected in requests if table.route(text)[0].specialist != expected)
+    elapsed = time.perf_counter() - start
+    
+    print(f"⏱️  Routed {len(requests)} requests in {elapsed:.3f}s ({len(requests) / elapsed:.0f}/s)")
+    
+    if misses:
+        print(f"❌ {misses} request(s) routed to the wrong specialist")
+        return 1
+    if elapsed > args.budget:
+        print(f"❌ Over budget ({args.budget}s)")
+        return 1
+    
+    print("✅ Within budget")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Single-pass manifest validation on a large manifest
+
+Writes a manifest of --leaders synthetic leaders with a few planted errors
+(missing fields, unknown references, a trigger colliding with BMAD's
+workflow-manifest.csv), validates it, and checks every planted error was
+reported with its line. Reading the bare YAML event stream (the floor the
+validator walks on) and loading the same manifest are timed for comparison.
+
+Usage:
+    python benchmarks/bench_validate.py [--leaders 10000] [--specialists 4]
+"""
+
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.manifest_validator import ManifestValidator
+from models.manifest import YAML_LOADER, SkillsManifest
+
+
+def leader(i: int, specialists: int) -> dict:
+    return {
+        'name': f"leader-{i:05d}",
+        'domain': 'generic',
+        'phase': '4-implementation',
+        'specialists': [
+            {
+                'id': f"spec-{j}",
+                'name': f"Specialist {i}.{j}",
+                'domain': f"Domain {(i + j) % 23}",
+                'skills': [f"skill-{(i * j + k) % 97}" for k in range(6)]
+            }
+            for j in range(specialists)
+        ]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark manifest validation')
+    parser.add_argument('--leaders', type=int, default=10000, help='Leaders in the manifest')
+    parser.add_argument('--specialists', type=int, default=4, help='Specialists per leader')
+    args = parser.parse_args()
+    
+    root = Path(tempfile.mkdtemp(prefix="bmad-validate-bench-"))
+    try:
+        config_dir = root / "_bmad" / "_config"
+        config_dir.mkdir(parents=True)
+        (config_dir / "workflow-manifest.csv").write_text('name,description,module,path\n"research","Research","bmm","x"\n')
+        
+        leaders = [leader(i, args.specialists) for i in range(args.leaders)]
+        planted = 3
+        del leaders[1]['domain']
+        leaders[2]['specialists'][0]['skills'] = 'not a list'
+        leaders[3]['name'] = 'research-leader'
+        manifest = {
+            'project': {
+                'name': 'bench', 'bmad_version': 'v6.x', 'root': str(root), 'leaders': leaders,
+                'customizations': {'ghost-leader': {'memories': ['x']}},
+                'integration': {'workflows': [{'phase': '4', 'name': 'flow', 'sequence': ['missing-leader']}]}
+            }
+        }
+        planted += 2
+        path = root / "manifest.yaml"
+        path.write_text(yaml.safe_dump(manifest, sort_keys=False))
+        print(f"📄 {args.leaders} leaders x {args.specialists} specialists, {path.stat().st_size / 1e6:.1f} MB")
+        
+        start = time.perf_counter()
+        validator = ManifestValidator(root)
+        validator.validate_file(path)
+        elapsed = time.perf_counter() - start
+        print(f"⏱️  Validation: {elapsed:.3f}s, {len(validator.errors)} error(s)")
+        for issue in validator.errors:
+            print(f"   - {issue}")
+        
+        start = time.perf_counter()
+        with open(path, 'rb') as f:
+            loader = YAML_LOADER(f)
+            events = 0
+            while loader.get_event() is not None:
+                events += 1
+            loader.dispose()
+        print(f"⏱️  YAML events only: {time.perf_counter() - start:.3f}s ({events} events)")
+        
+        start = time.perf_counter()
+        try:
+            SkillsManifest.from_yaml(path)
+        except KeyError as e:
+            print(f"⏱️  Loading: {time.perf_counter() - start:.3f}s, stopped at KeyError {e}")
+        
+        if len(validator.errors) != planted or not all(issue.line > 1 for issue in validator.errors):
+            print(f"❌ Expected {planted} errors with positions")
+            return 1
+        print("✅ Every planted error reported")
+        return 0
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
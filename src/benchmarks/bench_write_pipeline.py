@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Rendering specialist agents with synchronous writes vs the write pipeline
+
+Renders --specialists specialist agents (markdown + .agent.yaml) into a
+throwaway directory twice: once writing each file before rendering the next,
+once through WritePipeline (with the --fsync policy), and checks both trees
+are identical.
+
+Usage:
+    python benchmarks/bench_write_pipeline.py [--specialists 2000] [--writers 4] [--fsync none]
+"""
+
+import sys
+import time
+import shutil
+import filecmp
+import argparse
+import tempfile
+import importlib.util
+from pathlib import Path
+
+GENERATOR = Path(__file__).parent.parent / "bmad-skill-generator" / "scripts" / "init_bmad_skill.py"
+
+
+def load_generator():
+    spec = importlib.util.spec_from_file_location("init_bmad_skill", GENERATOR)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def render(generator, skill_path: Path, count: int) -> None:
+    for i in range(count):
+        domain = f"Domain {i % 17}"
+        spec = {
+            'id': f"spec-{i:05d}",
+            'name': f"Specialist {i}",
+            'domain': domain,
+            'description': f"Specialist in {domain}",
+            'skills': [f"skill-{i % 5}", f"skill-{i % 11}"],
+            'trigger_conditions': f"Request involves {domain}",
+            'leader_name': 'bench',
+            'communication_style': 'Professional, domain-focused',
+            'principles': [f'Follow {domain} best practices']
+        }
+        generator.generate_specialist_agent(skill_path, spec, domain='healthcare')
+        generator.generate_agent_yaml(skill_path, 'specialist', spec)
+
+
+def same_tree(left: Path, right: Path) -> bool:
+    comparison = filecmp.dircmp(left, right)
+    if comparison.left_only or comparison.right_only or comparison.diff_files:
+        return False
+    return all(same_tree(left / d, right / d) for d in comparison.common_dirs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the generator write pipeline')
+    parser.add_argument('--specialists', type=int, default=2000, help='Specialists to render')
+    parser.add_argument('--writers', type=int, default=4, help='Writer threads')
+    parser.add_argument('--max-pending', type=int, default=64, help='Queue bound')
+    parser.add_argument('--fsync', choices=['none', 'file', 'end'], default='none', help='Pipeline fsync policy')
+    args = parser.parse_args()
+    
+    generator = load_generator()
+    root = Path(tempfile.mkdtemp(prefix="bmad-write-bench-"))
+    try:
+        sync_path = root / "sync" / "bench-leader"
+        pipe_path = root / "pipeline" / "bench-leader"
+        
+        start = time.perf_counter()
+        render(generator, sync_path, args.specialists)
+        sync_time = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        with generator.open_pipeline(writers=args.writers, max_pending=args.max_pending, fsync=args.fsync):
+            render(generator, pipe_path, args.specialists)
+        pipe_time = time.perf_counter() - start
+        
+        files = args.specialists * 2
+        print(f"📝 {files} files")
+        print(f"⏱️  Synchronous writes: {sync_time:.3f}s")
+        print(f"⏱️  {args.writers} writers, queue of {args.max_pending}, fsync={args.fsync}: {pipe_time:.3f}s ({sync_time / pipe_time:.1f}x)")
+        
+        if not same_tree(sync_path, pipe_path):
+            print("❌ Pipeline output differs")
+            return 1
+        print("✅ Identical output")
+        return 0
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -5,9 +5,16 @@ Generates BMAD-compliant skills with leader-router and domain specialists
 v0.3 - Smart CSV Merging support
 """
 
+import io
 import os
 import sys
+import json
+import time
+import queue
+import tarfile
+import hashlib
 import argparse
+import threading
 from pathlib import Path
 import yaml
 import csv
@@ -21,6 +28,15 @@ try:
 except ImportError:
     HAS_MERGER = False
 
+try:
+    from core.memory import MemoryBudget, PENDING_FILE_BYTES, process_peak_rss
+    HAS_MEMORY_BUDGET = True
+except ImportError:
+    HAS_MEMORY_BUDGET = False
+
+# Set by --memory-budget: large CSV merges go through disk
+_memory_budget = None
+
 
 # Domain-specific templates
 HEALTHCARE_DOMAINS = {
@@ -85,6 +101,15 @@ def write_csv_smart(csv_path, headers, rows, verbose=True):
     
     Falls back to direct write if merger not available
     """
+    if isinstance(_pipeline, TarSink):
+        # Merged by whoever consumes the stream
+        out = io.StringIO(newline='')
+        writer = csv.writer(out)
+        writer.writerow(headers)
+        writer.writerows(rows)
+        write_file(csv_path, out.getvalue())
+        return
+    
     csv_path.parent.mkdir(parents=True, exist_ok=True)
     
     if HAS_MERGER:
@@ -94,17 +119,273 @@ def write_csv_smart(csv_path, headers, rows, verbose=True):
             new_rows=rows,
             headers=headers,
             primary_key_column=0,
-            verbose=verbose
+            verbose=verbose,
+            budget=_memory_budget
         )
         
         if verbose and (result.custom_rows > 0 or result.preserved_rows > 0):
             print(f"      🔄 Preserved {result.custom_rows} custom + {result.preserved_rows} modified rows")
     else:
         # Fallback: direct write (overwrites existing)
-        with open(csv_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(headers)
-            writer.writerows(rows)
+        buffer = io.StringIO(newline='')
+        writer = csv.writer(buffer)
+        writer.writerow(headers)
+        writer.writerows(rows)
+        replace_file(csv_path, buffer.getvalue().encode('utf-8'))
+
+
+def replace_file(path, data, fsync=False):
+    """
+    Write data to a temporary file next to path and rename it over path
+    
+    The old file is replaced, never written in place, so a hard link to it
+    (another project, a cache object, a backup) keeps its contents.
+    """
+    tmp_path = path.with_name(f".{path.name}.tmp-{threading.get_ident()}")
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class WritePipeline:
+    """
+    Bounded queue between rendering and a pool of writer threads
+    
+    Rendering submits (path, bytes) and carries on while writers drain the
+    queue; submit() blocks once max_pending items are waiting, which bounds
+    memory. Writers create each directory once and apply the fsync policy:
+    'none', 'file' (fsync every file) or 'end' (fsync files and their
+    directories when the pipeline closes).
+    """
+    
+    FSYNC_POLICIES = ('none', 'file', 'end')
+    
+    def __init__(self, writers=4, max_pending=64, fsync='none'):
+        if fsync not in self.FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync}")
+        self.fsync = fsync
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.written = []
+        self.errors = []
+        self._dirs = set()
+        self._lock = threading.Lock()
+        self._threads = [
+            threading.Thread(target=self._drain, name=f"writer-{i}", daemon=True)
+            for i in range(max(1, writers))
+        ]
+        for thread in self._threads:
+            thread.start()
+    
+    def submit(self, path, data):
+        if self.errors:
+            raise self.errors[0]
+        self.queue.put((Path(path), data))
+    
+    def _ensure_dir(self, directory):
+        with self._lock:
+            if directory in self._dirs:
+                return
+            directory.mkdir(parents=True, exist_ok=True)
+            self._dirs.add(directory)
+    
+    def _drain(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    return
+                path, data = item
+                self._ensure_dir(path.parent)
+                replace_file(path, data, fsync=self.fsync == 'file')
+                with self._lock:
+                    self.written.append(path)
+            except OSError as e:
+                with self._lock:
+                    self.errors.append(e)
+            finally:
+                self.queue.task_done()
+    
+    def close(self):
+        """Wait for every queued write; re-raise the first write error"""
+        for _ in self._threads:
+            self.queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        
+        if self.fsync == 'end' and not self.errors:
+            for path in self.written:
+                fd = os.open(path, os.O_RDONLY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+            for directory in self._dirs:
+                fd = os.open(directory, os.O_RDONLY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+        
+        if self.errors:
+            raise self.errors[0]
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        set_sink(None)
+        if exc_type is None:
+            self.close()
+        else:
+            # Still let queued writes finish before propagating the error
+            try:
+                self.close()
+            except OSError:
+                pass
+        return False
+
+
+class TarSink:
+    """
+    Write rendered files into a tar stream instead of the filesystem
+    
+    Member names are relative to base_dir (the --output directory), so a
+    skill's files appear as <skill_name>/... CSVs are written as generated,
+    without merging.
+    """
+    
+    def __init__(self, fileobj, base_dir):
+        self.base_dir = Path(base_dir)
+        self.tar = tarfile.open(fileobj=fileobj, mode='w|', format=tarfile.GNU_FORMAT)
+        self.mtime = int(time.time())
+        self.written = []
+    
+    def submit(self, path, data):
+        info = tarfile.TarInfo(Path(path).relative_to(self.base_dir).as_posix())
+        info.size = len(data)
+        info.mtime = self.mtime
+        info.mode = 0o644
+        self.tar.addfile(info, io.BytesIO(data))
+        self.written.append(path)
+    
+    def close(self):
+        self.tar.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        set_sink(None)
+        self.close()
+        return False
+
+
+# Where write_file() sends files: a WritePipeline, a TarSink or any object
+# with submit(path, data) (None: write synchronously)
+_pipeline = None
+
+
+def set_sink(sink):
+    """Route write_file() to sink until set_sink(None)"""
+    global _pipeline
+    _pipeline = sink
+    return sink
+
+
+def open_pipeline(writers=4, max_pending=64, fsync='none'):
+    """Route write_file() through a new WritePipeline until it is closed"""
+    return set_sink(WritePipeline(writers=writers, max_pending=max_pending, fsync=fsync))
+
+
+def write_file(path, content):
+    """Write a generated artifact, through the open pipeline if there is one"""
+    data = content.encode('utf-8') if isinstance(content, str) else content
+    if _pipeline is not None:
+        _pipeline.submit(path, data)
+    else:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        replace_file(path, data)
+    return path
+
+
+class RenderState:
+    """
+    Remember what each generated artifact was rendered from
+    
+    Artifacts are grouped in units (one leader agent, one specialist's files,
+    the routing rules, ...). A unit is re-rendered only when the fingerprint of
+    its inputs changed or one of its files is missing, so adding a specialist
+    rewrites that specialist's files plus the files built from the list.
+    State lives in <skill>/.render-state.json.
+    """
+    
+    FILENAME = '.render-state.json'
+    FORMAT = 1
+    
+    def __init__(self, skill_path, force=False):
+        self.skill_path = Path(skill_path)
+        self.path = self.skill_path / self.FILENAME
+        self.force = force
+        self.units = {}
+        self.rendered = {}
+        self.written = 0
+        self.kept = 0
+        # The generator's own source is an input of every artifact
+        self.generator_digest = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+        
+        if self.path.exists() and not force:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('format') == self.FORMAT:
+                    self.units = data.get('units', {})
+            except (OSError, ValueError):
+                self.units = {}
+    
+    def fingerprint(self, inputs):
+        canonical = json.dumps([self.generator_digest, inputs], sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+    
+    def render(self, unit, inputs, render_fn):
+        """
+        Call render_fn() unless the unit is up to date
+        
+        render_fn returns the written path or a list of paths.
+        Returns the list of paths written, or None if the unit was kept.
+        """
+        fingerprint = self.fingerprint(inputs)
+        entry = self.units.get(unit)
+        if (
+            entry and entry['fingerprint'] == fingerprint
+            and all((self.skill_path / rel).exists() for rel in entry['files'])
+        ):
+            self.rendered[unit] = entry
+            self.kept += len(entry['files'])
+            return None
+        
+        result = render_fn()
+        paths = result if isinstance(result, list) else [result]
+        self.rendered[unit] = {
+            'fingerprint': fingerprint,
+            'files': [Path(p).relative_to(self.skill_path).as_posix() for p in paths]
+        }
+        self.written += len(paths)
+        return paths
+    
+    def save(self):
+        """Write the state of this run (units no longer generated are dropped)"""
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({'format': self.FORMAT, 'units': self.rendered}, f, indent=1, sort_keys=True)
 
 
 def generate_healthcare_csvs(skill_path, domain='healthcare'):
@@ -255,13 +536,17 @@ Coordinate and route requests to specialized agents based on domain expertise.
 """
     
     leader_path = skill_path / "agents" / f"leader-{leader_name}.md"
-    leader_path.write_text(content)
-    return leader_path
+    return write_file(leader_path, content)
 
 
 def generate_specialist_agent(skill_path, specialist, domain=None):
     """Generate specialist agent"""
-    specialist_id = specialist['id']
+    spec_path = skill_path / "agents" / f"specialist-{specialist['id']}.md"
+    return write_file(spec_path, render_specialist_agent(specialist, domain=domain))
+
+
+def render_specialist_agent(specialist, domain=None):
+    """Markdown of a specialist agent"""
     specialist_name = specialist['name']
     specialist_domain = specialist['domain']
     specialist_description = specialist['description']
@@ -323,10 +608,7 @@ def generate_specialist_agent(skill_path, specialist, domain=None):
 - Works with: Other specialists as coordinated by {leader_name}
 - Escalate: Complex cross-domain issues to {leader_name}
 """
-    
-    spec_path = skill_path / "agents" / f"specialist-{specialist_id}.md"
-    spec_path.write_text(content)
-    return spec_path
+    return content
 
 
 def generate_routing_workflow(skill_path, leader_name, specialists):
@@ -362,8 +644,7 @@ def generate_routing_workflow(skill_path, leader_name, specialists):
     }
     
     workflow_path = skill_path / "workflows" / "route-to-specialist.yaml"
-    with open(workflow_path, 'w') as f:
-        yaml.dump(workflow, f, default_flow_style=False, sort_keys=False)
+    write_file(workflow_path, yaml.dump(workflow, default_flow_style=False, sort_keys=False))
     
     return workflow_path
 ######
@@ -376,7 +657,6 @@ def generate_advanced_workflows(skill_path, leader_name, specialists, phase='4-i
     - cross-leader handoff workflows
     """
     workflows_dir = skill_path / "workflows"
-    workflows_dir.mkdir(parents=True, exist_ok=True)
     
     # 1. Complete workflow with validation
     complete_workflow = {
@@ -422,8 +702,7 @@ def generate_advanced_workflows(skill_path, leader_name, specialists, phase='4-i
     }
     
     complete_path = workflows_dir / f'{leader_name}-complete.yaml'
-    with open(complete_path, 'w') as f:
-        yaml.dump(complete_workflow, f, default_flow_style=False, sort_keys=False, allow_unicode=True)
+    write_file(complete_path, yaml.dump(complete_workflow, default_flow_style=False, sort_keys=False, allow_unicode=True))
     
     # 2. Multi-specialist workflow
     if len(specialists) > 1:
@@ -463,8 +742,7 @@ def generate_advanced_workflows(skill_path, leader_name, specialists, phase='4-i
         })
         
         multi_path = workflows_dir / f'{leader_name}-multi.yaml'
-        with open(multi_path, 'w') as f:
-            yaml.dump(multi_workflow, f, default_flow_style=False, sort_keys=False, allow_unicode=True)
+        write_file(multi_path, yaml.dump(multi_workflow, default_flow_style=False, sort_keys=False, allow_unicode=True))
         
         return [complete_path, multi_path]
     
@@ -478,7 +756,6 @@ def generate_cross_leader_workflow(skill_path, workflow_name, leader_sequence, p
     Example: ba-leader → architect-leader → dev-leader → qa-leader
     """
     workflows_dir = skill_path / "workflows"
-    workflows_dir.mkdir(parents=True, exist_ok=True)
     
     workflow = {
         'name': workflow_name,
@@ -506,8 +783,7 @@ def generate_cross_leader_workflow(skill_path, workflow_name, leader_sequence, p
         workflow['steps'].append(step)
     
     workflow_path = workflows_dir / f'{workflow_name}.yaml'
-    with open(workflow_path, 'w') as f:
-        yaml.dump(workflow, f, default_flow_style=False, sort_keys=False, allow_unicode=True)
+    write_file(workflow_path, yaml.dump(workflow, default_flow_style=False, sort_keys=False, allow_unicode=True))
     
     return workflow_path
 
@@ -556,8 +832,7 @@ When a request requires multiple specialists:
 """
     
     rules_path = skill_path / "references" / "routing-rules.md"
-    rules_path.write_text(content)
-    return rules_path
+    return write_file(rules_path, content)
 
 def generate_agent_yaml(skill_path, agent_type, agent_data):
     """
@@ -568,6 +843,15 @@ def generate_agent_yaml(skill_path, agent_type, agent_data):
         agent_type: 'leader' or 'specialist'
         agent_data: Dict with agent configuration
     """
+    agent_id, content = render_agent_yaml(agent_type, agent_data)
+    yaml_path = skill_path / "agents" / f"{agent_id}.agent.yaml"
+    write_file(yaml_path, content)
+    
+    return yaml_path
+
+
+def render_agent_yaml(agent_type, agent_data):
+    """Agent id and .agent.yaml text (see generate_agent_yaml)"""
     if agent_type == 'leader':
         agent_id = f"leader-{agent_data['name']}"
         agent_yaml = {
@@ -632,12 +916,87 @@ def generate_agent_yaml(skill_path, agent_type, agent_data):
             }
         }
     
-    # Write YAML file
-    yaml_path = skill_path / "agents" / f"{agent_id}.agent.yaml"
-    with open(yaml_path, 'w') as f:
-        yaml.dump(agent_yaml, f, default_flow_style=False, sort_keys=False, allow_unicode=True)
+    return agent_id, yaml.dump(agent_yaml, default_flow_style=False, sort_keys=False, allow_unicode=True)
+
+
+class SpecialistTemplates:
+    """
+    Render each distinct specialist once, whichever leaders use it
     
-    return yaml_path
+    A specialist's files only depend on its definition, the domain and the
+    leader it reports to. They are rendered with a placeholder for the leader
+    and stored under <store_dir>/<digest>.json, keyed by the definition,
+    domain and generator; every leader sharing the definition (in this
+    process or a later one) fills the placeholder in instead of rendering.
+    """
+    
+    PLACEHOLDER = '__BMAD_SPECIALIST_LEADER__'
+    
+    def __init__(self, store_dir, generator_digest):
+        self.store_dir = Path(store_dir)
+        self.generator_digest = generator_digest
+        self.memo = {}
+        self.rendered = 0
+        self.reused = 0
+    
+    def key(self, specialist, domain):
+        definition = {k: v for k, v in specialist.items() if k != 'leader_name'}
+        canonical = json.dumps([self.generator_digest, domain, definition], sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def substitutable(leader_name):
+        """The placeholder can stand for leader_name only if YAML writes it unquoted"""
+        return yaml.safe_dump({'leader': leader_name}) == f"leader: {leader_name}\n"
+    
+    def _load(self, key):
+        if key in self.memo:
+            return self.memo[key]
+        try:
+            with open(self.store_dir / f"{key}.json", 'r', encoding='utf-8') as f:
+                template = json.load(f)
+        except (OSError, ValueError):
+            return None
+        self.memo[key] = template
+        return template
+    
+    def _store(self, key, template):
+        self.memo[key] = template
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        # Leaders render concurrently: publish atomically
+        tmp_path = self.store_dir / f".{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+        tmp_path.write_text(json.dumps(template), encoding='utf-8')
+        os.replace(tmp_path, self.store_dir / f"{key}.json")
+    
+    def generate(self, skill_path, specialist, domain=None):
+        """Write a specialist's .md and .agent.yaml; returns both paths"""
+        leader_name = specialist['leader_name']
+        if not self.substitutable(leader_name):
+            return [
+                generate_specialist_agent(skill_path, specialist, domain=domain),
+                generate_agent_yaml(skill_path, 'specialist', specialist)
+            ]
+        
+        key = self.key(specialist, domain)
+        template = self._load(key)
+        if template is None:
+            shared = {**specialist, 'leader_name': self.PLACEHOLDER}
+            agent_id, agent_yaml = render_agent_yaml('specialist', shared)
+            template = {
+                'agent_id': agent_id,
+                'md': render_specialist_agent(shared, domain=domain),
+                'yaml': agent_yaml
+            }
+            self._store(key, template)
+            self.rendered += 1
+        else:
+            self.reused += 1
+        
+        agents_dir = skill_path / "agents"
+        return [
+            write_file(agents_dir / f"{template['agent_id']}.md", template['md'].replace(self.PLACEHOLDER, leader_name)),
+            write_file(agents_dir / f"{template['agent_id']}.agent.yaml", template['yaml'].replace(self.PLACEHOLDER, leader_name))
+        ]
 
 
 
@@ -766,8 +1125,7 @@ Adjust phase in workflow YAML as needed.
 """
     
     skill_md_path = skill_path / "SKILL.md"
-    skill_md_path.write_text(content)
-    return skill_md_path
+    return write_file(skill_md_path, content)
 
 
 def main():
@@ -807,9 +1165,73 @@ Examples:
         default='generic',
         help='Domain specialization (adds domain-specific templates and CSV files)'
     )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Rewrite every artifact, even those whose inputs did not change'
+    )
+    parser.add_argument(
+        '--shared-specialists',
+        metavar='DIR',
+        help='Store of rendered specialists shared across leaders: a specialist '
+             'defined identically elsewhere is rendered once'
+    )
+    parser.add_argument(
+        '--tar',
+        metavar='FILE',
+        help='Write the skill as a tar stream to FILE ("-" for stdout) instead of '
+             'into --output; CSVs are not merged and messages go to stderr'
+    )
+    parser.add_argument(
+        '--writers',
+        type=int,
+        default=4,
+        help='Writer threads draining rendered files to disk (default: 4)'
+    )
+    parser.add_argument(
+        '--max-pending',
+        type=int,
+        default=64,
+        help='Rendered files allowed to wait for a writer before rendering blocks (default: 64)'
+    )
+    parser.add_argument(
+        '--fsync',
+        choices=list(WritePipeline.FSYNC_POLICIES),
+        default='none',
+        help='fsync each file, everything once at the end, or not at all (default: none)'
+    )
+    parser.add_argument(
+        '--memory-budget',
+        type=int,
+        metavar='MB',
+        help='Stay within MB of memory: large CSV merges spill to disk and fewer '
+             'rendered files wait for a writer'
+    )
+    parser.add_argument(
+        '--memory-report',
+        action='store_true',
+        help='Print the peak resident memory of this run at the end'
+    )
     
     args = parser.parse_args()
     
+    tar_stream = None
+    if args.tar == '-':
+        # stdout carries the archive
+        tar_stream = sys.stdout.buffer
+        sys.stdout = sys.stderr
+    elif args.tar:
+        tar_stream = open(args.tar, 'wb')
+    
+    if args.memory_budget and HAS_MEMORY_BUDGET:
+        global _memory_budget
+        _memory_budget = MemoryBudget.from_mb(args.memory_budget)
+        # Files waiting for a writer are the renderer's only buffer
+        fitting = max(1, _memory_budget.available() // PENDING_FILE_BYTES)
+        if fitting < args.max_pending:
+            args.max_pending = fitting
+            print(f"💽 Memory budget: at most {fitting} rendered file(s) wait for a writer")
+    
     # Parse leader name
     leader_name = args.leader if args.leader else args.skill_name.replace('-leader', '')
     
@@ -861,8 +1283,14 @@ Examples:
         print(f"   ⚠️  Smart CSV Merging not available (will overwrite CSV files)")
     
     include_data = args.domain != 'generic'
-    skill_path = create_directory_structure(args.output, args.skill_name, include_data=include_data)
-    print(f"✅ Created directory structure at {skill_path}")
+    if tar_stream is not None:
+        skill_path = Path(args.output) / args.skill_name
+        sink = set_sink(TarSink(tar_stream, args.output))
+        print(f"✅ Streaming {args.skill_name} as a tar archive")
+    else:
+        skill_path = create_directory_structure(args.output, args.skill_name, include_data=include_data)
+        sink = None
+        print(f"✅ Created directory structure at {skill_path}")
     
     # Generate domain-specific CSV files
     if args.domain == 'healthcare':
@@ -881,43 +1309,83 @@ Examples:
         for csv_file in csv_files:
             print(f"   - {csv_file.name}")
     
-    # Generate files
-    leader_path = generate_leader_agent(skill_path, leader_name, specialists, domain=args.domain)
-    print(f"✅ Generated leader agent: {leader_path.name}")
-    # Generate leader .agent.yaml
-    leader_yaml_path = generate_agent_yaml(
-        skill_path,
-        'leader',
-        {
-            'name': leader_name,
+    # Generate files, skipping units whose inputs did not change
+    # Nothing on disk to compare with when streaming
+    state = RenderState(skill_path, force=args.force or sink is not None)
+    templates = None
+    if args.shared_specialists:
+        templates = SpecialistTemplates(args.shared_specialists, state.generator_digest)
+    with sink or open_pipeline(writers=args.writers, max_pending=args.max_pending, fsync=args.fsync):
+        specialist_list = [
+            {k: v for k, v in spec.items() if k != 'leader_name'} for spec in specialists
+        ]
+        list_inputs = {
+            'skill': args.skill_name,
+            'leader': leader_name,
             'domain': args.domain,
-            'specialists': specialists
+            'phase': args.phase,
+            'bmad': bmad_config,
+            'specialists': specialist_list
         }
-    )
-    print(f"✅ Generated leader YAML: {leader_yaml_path.name}")
-
-
-
-    for spec in specialists:
-        spec_path = generate_specialist_agent(skill_path, spec, domain=args.domain)
-        print(f"✅ Generated specialist: {spec_path.name}")
-        spec_yaml_path = generate_agent_yaml(skill_path, 'specialist', spec)
-        print(f"✅ Generated specialist YAML: {spec_yaml_path.name}")
-
-
-
-    workflow_path = generate_routing_workflow(skill_path, leader_name, specialists)
-    print(f"✅ Generated routing workflow: {workflow_path.name}")
-    advanced_workflows = generate_advanced_workflows(skill_path, leader_name, specialists, phase=args.phase)
-    for wf_path in advanced_workflows:
-        print(f"✅ Generated advanced workflow: {wf_path.name}")
-
-
-    rules_path = generate_routing_rules(skill_path, specialists)
-    print(f"✅ Generated routing rules: {rules_path.name}")
+        
+        leader_paths = state.render('leader', list_inputs, lambda: [
+            generate_leader_agent(skill_path, leader_name, specialists, domain=args.domain),
+            generate_agent_yaml(
+                skill_path,
+                'leader',
+                {
+                    'name': leader_name,
+                    'domain': args.domain,
+                    'specialists': specialists
+                }
+            )
+        ])
+        if leader_paths:
+            print(f"✅ Generated leader agent: {leader_paths[0].name}")
+            print(f"✅ Generated leader YAML: {leader_paths[1].name}")
+        
+        for spec in specialists:
+            spec_inputs = {'leader': leader_name, 'domain': args.domain, 'specialist': spec}
+            if templates is not None:
+                render_spec = lambda spec=spec: templates.generate(skill_path, spec, domain=args.domain)
+            else:
+                render_spec = lambda spec=spec: [
+                    generate_specialist_agent(skill_path, spec, domain=args.domain),
+                    generate_agent_yaml(skill_path, 'specialist', spec)
+                ]
+            spec_paths = state.render(f"specialist:{spec['id']}", spec_inputs, render_spec)
+            if spec_paths:
+                print(f"✅ Generated specialist: {spec_paths[0].name}")
+                print(f"✅ Generated specialist YAML: {spec_paths[1].name}")
+        
+        workflow_paths = state.render('routing-workflow', list_inputs, lambda: generate_routing_workflow(
+            skill_path, leader_name, specialists
+        ))
+        if workflow_paths:
+            print(f"✅ Generated routing workflow: {workflow_paths[0].name}")
+        advanced_workflows = state.render('advanced-workflows', list_inputs, lambda: generate_advanced_workflows(
+            skill_path, leader_name, specialists, phase=args.phase
+        ))
+        for wf_path in advanced_workflows or []:
+            print(f"✅ Generated advanced workflow: {wf_path.name}")
+        
+        rules_paths = state.render('routing-rules', list_inputs, lambda: generate_routing_rules(skill_path, specialists))
+        if rules_paths:
+            print(f"✅ Generated routing rules: {rules_paths[0].name}")
+        
+        skill_md_paths = state.render('skill-md', list_inputs, lambda: generate_skill_md(
+            skill_path, args.skill_name, leader_name, specialists, bmad_config
+        ))
+        if skill_md_paths:
+            print(f"✅ Generated SKILL.md: {skill_md_paths[0].name}")
     
-    skill_md_path = generate_skill_md(skill_path, args.skill_name, leader_name, specialists, bmad_config)
-    print(f"✅ Generated SKILL.md: {skill_md_path.name}")
+    if sink is None:
+        state.save()
+    elif args.tar != '-':
+        tar_stream.close()
+    print(f"✅ Rendered {state.written} file(s), kept {state.kept} unchanged")
+    if templates is not None and templates.reused:
+        print(f"♻️  {templates.reused} shared specialist(s) reused, {templates.rendered} rendered")
     # Generate cross-leader workflow example (only for first skill)
 
 
@@ -930,7 +1398,10 @@ Examples:
         print(f"4. Test with: /{leader_name}")
     else:
         print(f"3. Test with: /{leader_name}")
-    print(f"4. Package with: scripts/package_skill.py {skill_path}")
+    print("4. Package with: bmad_provisioner.py --config skills-manifest.yaml --mode package")
+    
+    if args.memory_report and HAS_MEMORY_BUDGET:
+        print(f"📈 Peak memory: {process_peak_rss()} bytes")
 
 
 if __name__ == '__main__':
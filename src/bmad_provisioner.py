@@ -8,76 +8,250 @@ Survives BMAD version updates by re-provisioning from manifest.
 
 import sys
 import argparse
+import contextlib
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, List, Optional, Union
 
 # Add parent dir to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from models.manifest import SkillsManifest
-from core.analyzer import GapAnalyzer
-from core.generator import SkillGenerator, SkillBackup
+# Subsystems are imported by the methods that use them, so each mode only pays
+# for its own imports (validate runs from git hooks on every commit).
+# tests/test_import_time.py keeps each mode away from modules it does not need.
+
+
+@dataclass
+class ProvisionPolicy:
+    """How provisioning answers its questions instead of prompting"""
+    on_missing_version: str = 'prompt'   # prompt | continue | abort
+    on_failure: str = 'prompt'           # prompt | restore | keep | abort
+    interactive: bool = True
+    
+    # Answers used when a prompt cannot be shown (same as pressing Enter)
+    DEFAULTS = {'on_missing_version': 'abort', 'on_failure': 'keep'}
+    
+    def resolve(self, name: str, question: str, yes: str, no: str) -> str:
+        """Return the configured action, prompting only when allowed"""
+        action = getattr(self, name)
+        if action != 'prompt':
+            return action
+        
+        if not self.interactive or not sys.stdin.isatty():
+            action = self.DEFAULTS[name]
+            print(f"   Non-interactive: {name.replace('_', '-')}={action}")
+            return action
+        
+        response = input(f"{question} (y/N): ")
+        return yes if response.lower() == 'y' else no
 
 
 class BMADProvisioner:
     """Main provisioner orchestrator"""
     
-    def __init__(self, manifest_path: Path, project_root: Optional[Path] = None):
+    def __init__(
+        self,
+        manifest_path: Path,
+        project_root: Optional[Path] = None,
+        policy: Optional[ProvisionPolicy] = None,
+        only: Optional[List[str]] = None,
+        memory=None,
+        memory_budget=None
+    ):
+        from models.manifest import SkillsManifest
+        
         self.manifest_path = manifest_path
-        self.manifest = SkillsManifest.from_yaml(manifest_path)
+        # Optional MemoryTracker (--memory-report) and MemoryBudget (--memory-budget)
+        self.memory = memory
+        self.memory_budget = memory_budget
+        # With only, the other leaders' shards are never parsed
+        try:
+            with self.track('manifest load'):
+                self.manifest = SkillsManifest.from_yaml(manifest_path, only=only)
+        except Exception as e:
+            # Report every problem of the manifest, not just the first one
+            from core.manifest_validator import ManifestValidator, ManifestError
+            validator = ManifestValidator(project_root)
+            validator.validate_file(manifest_path)
+            if validator.errors:
+                raise ManifestError(validator.issues) from e
+            raise
+        self.policy = policy or ProvisionPolicy()
         
         # Use project root from manifest or override
         self.project_root = project_root or self.manifest.project.root
-        self.analyzer = GapAnalyzer(self.project_root)
+        self._analyzer = None
+    
+    @property
+    def analyzer(self):
+        """Gap analyzer, created on first use"""
+        if self._analyzer is None:
+            from core.analyzer import GapAnalyzer
+            self._analyzer = GapAnalyzer(self.project_root)
+        return self._analyzer
     
-    def validate_manifest(self) -> bool:
-        """Validate manifest configuration"""
-        print("🔍 Validating manifest...")
+    def track(self, phase: str):
+        """Record the memory of phase with --memory-report (core.memory is not imported otherwise)"""
+        if self.memory is None:
+            return contextlib.nullcontext()
+        from core.memory import track
+        return track(self.memory, phase)
+    
+    def validate_manifest(self, stream=None) -> bool:
+        """Validate manifest configuration (messages go to stream, default stdout)"""
+        from core.scheduler import ProvisionGraph
+        
+        print("🔍 Validating manifest...", file=stream)
         errors = self.manifest.validate(self.project_root)
+        errors.extend(ProvisionGraph.from_manifest(self.manifest).errors)
         
         if errors:
-            print("❌ Manifest validation failed:")
+            print("❌ Manifest validation failed:", file=stream)
             for error in errors:
-                print(f"   - {error}")
+                print(f"   - {error}", file=stream)
             return False
         
-        print("✅ Manifest is valid")
+        print("✅ Manifest is valid", file=stream)
+        library = self.manifest.project.specialist_library
+        if library.unique < library.references:
+            print(f"   ♻️  {library.references} specialists share {library.unique} definitions", file=stream)
         return True
     
-    def analyze(self) -> bool:
-        """Perform gap analysis"""
+    def _emit(self, record: dict) -> None:
+        """Write one NDJSON record, flushed so consumers see it immediately"""
+        import json
+        print(json.dumps({'project': str(self.project_root), **record}, ensure_ascii=False), flush=True)
+    
+    def analyze(self, output_format: str = 'text') -> bool:
+        """
+        Perform gap analysis
+        
+        Args:
+            output_format: 'text' report, one 'json' document, or 'ndjson'
+                records streamed as each file and leader is checked
+        """
+        if output_format == 'json':
+            import json
+            report = self.analyzer.analyze(self.manifest)
+            print(json.dumps({'project': str(self.project_root), **report.to_dict()}, indent=2, ensure_ascii=False))
+            return True
+        
+        if output_format == 'ndjson':
+            self._emit({'type': 'analysis', 'bmad_version': self.analyzer.detect_bmad_version()})
+            missing, outdated, extras = [], [], 0
+            for kind, leader_name, status in self.analyzer.iter_analysis(self.manifest):
+                if kind == 'file':
+                    self._emit({'type': 'file', 'leader': leader_name, **status.to_dict()})
+                elif kind == 'leader':
+                    self._emit({'type': 'leader', **status.to_dict(include_files=False)})
+                    extras += len(status.extras)
+                    if not status.installed:
+                        missing.append(leader_name)
+                    elif status.needs_update:
+                        outdated.append(leader_name)
+                else:
+                    self._emit({'type': 'orphan', **status.to_dict()})
+                    extras += 1
+            self._emit({
+                'type': 'summary',
+                'recommendations': self.analyzer.recommendations(missing, outdated, extras)
+            })
+            return True
+        
         print(f"📊 Analyzing project: {self.manifest.project.name}")
         print(f"   Root: {self.project_root}")
         print()
         
         report = self.analyzer.analyze(self.manifest)
+        if self.analyzer.context.reused:
+            print("♻️  Project unchanged since the last analysis (report reused)")
+            print()
         print(report.summary())
         
         return True
     
-    def provision(self, dry_run: bool = False, generator_script: Optional[Path] = None) -> bool:
-        """Provision skills to project"""
+    def provision(
+        self,
+        dry_run: bool = False,
+        generator_script: Optional[Path] = None,
+        affected_only: bool = False,
+        knowledge_top: int = 5,
+        render_cache: str = 'copy',
+        render_cache_max_mb: int = 500,
+        prune: bool = False,
+        tar_output: Union[Path, BinaryIO, None] = None,
+        tar_base: Optional[Path] = None
+    ) -> bool:
+        """
+        Provision skills to project
+        
+        Args:
+            dry_run: Preview without changes
+            generator_script: Path to init_bmad_skill.py (default: auto-detect)
+            affected_only: Only re-provision leaders affected by a BMAD upgrade
+                since the last successful provision (plus uninstalled ones)
+            knowledge_top: BMAD knowledge fragments to reference per specialist (0 = none)
+            render_cache: Reuse identical leader renders across projects by
+                'copy' from the user cache, or 'off'
+            render_cache_max_mb: Size bound of the render cache (LRU eviction)
+            prune: Remove generated files and leader directories the manifest
+                no longer produces (after backing them up)
+            tar_output: Write the provisioned files to this tar file (or binary
+                stream) instead of the project; nothing under the project changes
+            tar_base: Tarball of a previous provision whose CSVs are merged
+                with the generated ones and whose other files are carried over
+        """
+        from core.generator import SkillGenerator, SkillBackup
+        from core.memory import track
+        from core.render_cache import project_cache_dir
+        
         if dry_run:
             print("🔍 Dry run mode - no changes will be made")
         
         print("🚀 Provisioning custom skills...")
         
         # First, analyze
-        report = self.analyzer.analyze(self.manifest)
+        with track(self.memory, 'analyze'):
+            report = self.analyzer.analyze(self.manifest)
         
         # Check if safe to provision
         if not report.bmad_version:
             print("⚠️  Warning: BMAD version not detected")
             if not dry_run:
-                response = input("Continue anyway? (y/N): ")
-                if response.lower() != 'y':
+                action = self.policy.resolve(
+                    'on_missing_version', "Continue anyway?", yes='continue', no='abort'
+                )
+                if action != 'continue':
                     print("❌ Provisioning cancelled")
                     return False
         
-        print(f"\n📦 Leaders to provision: {len(self.manifest.project.leaders)}")
-        for leader in self.manifest.project.leaders:
+        leaders = self.manifest.project.leaders
+        if affected_only:
+            impact = self.analyzer.upgrade_impact(self.manifest)
+            installed = {l.name for l in report.leaders if l.installed}
+            selected = set(impact.affected_leaders) | {l.name for l in leaders if l.name not in installed}
+            leaders = [l for l in leaders if l.name in selected]
+            print(f"\n🔀 Upgrade impact: {len(leaders)} of {len(self.manifest.project.leaders)} leader(s) affected")
+        
+        print(f"\n📦 Leaders to provision: {len(leaders)}")
+        for leader in leaders:
             print(f"   - {leader.name} ({leader.domain}): {len(leader.specialists)} specialists")
         
+        extras = report.extras
+        if extras:
+            print(f"\n📦 Orphaned artifacts: {len(extras)}{'' if prune else ' (keep; use --prune to remove)'}")
+            for file_status in extras:
+                print(f"   - {file_status.path.relative_to(self.analyzer.custom_skills_root)}: {file_status.details}")
+        if not prune:
+            extras = []
+        elif tar_output is not None:
+            print("⚠️  --prune ignored: the project is not modified when writing a tar archive")
+            extras = []
+        
+        if not leaders and not extras:
+            print("\n✅ Nothing to provision")
+            return True
+        
         if dry_run:
             print("\n✅ Dry run complete - no changes made")
             return True
@@ -107,19 +281,97 @@ class BMADProvisioner:
         
         print(f"\n🔧 Using generator: {generator_script}")
         
-        # Backup existing skills
+        if tar_output is not None:
+            return self._provision_tar(generator_script, leaders, report, knowledge_top, tar_output, tar_base)
+        
+        # Backup only the leaders about to be regenerated or pruned
         backup = SkillBackup(self.project_root)
-        backup_path = backup.backup_skills()
+        backed_up = [leader.name for leader in leaders]
+        for file_status in extras:
+            top = file_status.path.relative_to(self.analyzer.custom_skills_root).parts[0]
+            if top not in backed_up:
+                backed_up.append(top)
+        backup_path = backup.backup_skills(leaders=backed_up)
         if backup_path:
             print(f"   Backup saved: {backup_path.name}")
         
+        if extras:
+            removed = self.analyzer.prune(extras)
+            self.analyzer.invalidate()
+            print(f"🗑️  Pruned {removed} orphaned artifact(s)")
+        
+        if not leaders:
+            print("\n✅ Nothing to provision")
+            return True
+        
         # Generate skills
         generator = SkillGenerator(generator_script, self.project_root)
+        self._attach_knowledge(generator, report, knowledge_top)
+        generator.shared_specialists = project_cache_dir(self.project_root) / "specialists"
+        generator.memory = self.memory
+        generator.memory_budget = self.memory_budget
+        
+        if render_cache != 'off':
+            from core.render_cache import RenderCache
+            generator.render_cache = RenderCache(max_bytes=render_cache_max_mb * 1024 * 1024)
         
         print("\n📦 Generating skills...")
-        results = generator.generate_all(self.manifest)
+        with track(self.memory, 'generation'):
+            results = generator.generate_all(
+                self.manifest,
+                stop_on_failure=self.policy.on_failure == 'abort',
+                leaders=leaders
+            )
+        self.analyzer.invalidate()
+        
+        fail_count = self._print_summary(generator, leaders, results)
+        if generator.render_cache is not None:
+            print(f"♻️  Render cache: {generator.render_cache.stats.summary()}")
+        skipped = [l.name for l in leaders if l.name not in results]
+        if skipped:
+            print(f"Skipped after upstream failure: {', '.join(skipped)}")
+        
+        if fail_count > 0:
+            print("\n⚠️  Some skills failed to provision")
+            failed_leaders = [name for name, success in results.items() if not success]
+            # Only leaders are restored; a failed integration workflow is reported
+            if backup_path and failed_leaders:
+                if self.policy.on_failure == 'abort':
+                    action = 'restore'
+                else:
+                    action = self.policy.resolve(
+                        'on_failure',
+                        f"Restore {len(failed_leaders)} failed leader(s) from backup?",
+                        yes='restore', no='keep'
+                    )
+                if action == 'restore':
+                    backup.restore_backup(backup_path, leaders=failed_leaders)
+                    # The purge thread is a daemon; finish it before the CLI exits
+                    backup.wait_for_purge()
+            return False
+        
+        # Future --affected-only runs diff these leaders against this install
+        self.analyzer.save_baseline([leader.name for leader in leaders])
+        
+        print("\n✅ All skills provisioned successfully!")
+        print(f"\n📁 Custom skills location:")
+        print(f"   {self.project_root / '_bmad/custom-skills'}")
+        
+        return True
+    
+    def _attach_knowledge(self, generator, report, knowledge_top: int) -> None:
+        """Give the generator the BMAD knowledge index (knowledge_top > 0)"""
+        from core.knowledge_index import KnowledgeIndex
         
-        # Summary
+        if knowledge_top > 0:
+            index = KnowledgeIndex(self.project_root)
+            indexed, retokenized, removed = index.update(report.bmad_version)
+            print(f"\n📚 Knowledge index: {indexed} document(s), {retokenized} re-indexed, {removed} removed")
+            generator.knowledge = index
+            generator.knowledge_top = knowledge_top
+    
+    def _print_summary(self, generator, leaders, results) -> int:
+        """Print per-leader and per-workflow outcomes; returns the number of failed leaders and workflows"""
         print("\n" + "="*50)
         print("📊 Provisioning Summary")
         print("="*50)
@@ -131,24 +383,102 @@ class BMADProvisioner:
             status = "✅" if success else "❌"
             print(f"{status} {leader_name}")
         
-        print(f"\nTotal: {success_count} success, {fail_count} failed")
+        for workflow_name, outcome in generator.workflow_results.items():
+            status = {True: "✅", False: "❌", None: "⏭️ "}[outcome]
+            print(f"{status} workflow {workflow_name}")
+        # Skipped workflows (None) are downstream of a failed leader, already counted
+        failed_workflows = sum(1 for outcome in generator.workflow_results.values() if outcome is False)
         
-        if fail_count > 0:
-            print("\n⚠️  Some skills failed to provision")
-            if backup_path:
-                response = input("Restore from backup? (y/N): ")
-                if response.lower() == 'y':
-                    backup.restore_backup(backup_path)
+        summary = f"\nTotal: {success_count} success, {fail_count} failed"
+        if failed_workflows:
+            summary += f", {failed_workflows} workflow(s) failed"
+        print(summary)
+        return fail_count + failed_workflows
+    
+    def _provision_tar(self, generator_script: Path, leaders, report, knowledge_top: int,
+                       tar_output: Union[Path, BinaryIO], tar_base: Optional[Path]) -> bool:
+        """
+        Provision into a tar archive instead of the project
+        
+        No backup, render cache or baseline: the project is only read. A
+        failed leader fails the run, and whatever was written stays in the
+        archive.
+        """
+        from core.generator import SkillGenerator
+        from core.memory import track
+        from core.tar_output import TarOutput
+        
+        if tar_base is not None and not tar_base.exists():
+            print(f"❌ Base tarball not found: {tar_base}")
             return False
         
-        print("\n✅ All skills provisioned successfully!")
-        print(f"\n📁 Custom skills location:")
-        print(f"   {self.project_root / '_bmad/custom-skills'}")
+        generator = SkillGenerator(generator_script, self.project_root)
+        self._attach_knowledge(generator, report, knowledge_top)
+        generator.memory = self.memory
+        generator.memory_budget = self.memory_budget
+        
+        stream = open(tar_output, 'wb') if isinstance(tar_output, Path) else tar_output
+        try:
+            generator.tar_output = TarOutput(stream, self.project_root, tar_base)
+            generator.tar_output.memory = self.memory
+            print("\n📦 Generating skills into tar archive...")
+            with track(self.memory, 'generation'):
+                results = generator.generate_all(
+                    self.manifest,
+                    stop_on_failure=self.policy.on_failure == 'abort',
+                    leaders=leaders
+                )
+                generator.tar_output.close()
+        finally:
+            if stream is not tar_output:
+                stream.close()
+            else:
+                stream.flush()
+        
+        fail_count = self._print_summary(generator, leaders, results)
+        tar = generator.tar_output
+        print(f"📦 Archive: {len(tar.written)} file(s), {tar.merged} CSV(s) merged with base")
+        if isinstance(tar_output, Path):
+            print(f"   {tar_output}")
+        
+        if fail_count > 0 or len(results) < len(leaders):
+            print("\n⚠️  Some skills failed to provision")
+            return False
         
+        print("\n✅ All skills provisioned into archive!")
         return True
     
-    def diff(self) -> bool:
-        """Show what would change"""
+    def _iter_changes(self):
+        """Yield what provisioning would create, update or prune, as each file is checked"""
+        from core.analyzer import ChangeType
+        
+        installed = {}
+        for kind, leader_name, status in self.analyzer.iter_analysis(self.manifest):
+            if kind == 'leader':
+                continue
+            if status.change_type == ChangeType.EXTRA:
+                action = 'prune'
+            elif status.change_type in (ChangeType.MISSING, ChangeType.OUTDATED):
+                if leader_name not in installed:
+                    installed[leader_name] = self.analyzer.check_leader_installed(leader_name)
+                action = 'update' if installed[leader_name] else 'create'
+            else:
+                continue
+            yield {'action': action, 'leader': leader_name, **status.to_dict()}
+    
+    def diff(self, output_format: str = 'text') -> bool:
+        """Show what would change (output_format as for analyze)"""
+        if output_format == 'json':
+            import json
+            changes = list(self._iter_changes())
+            print(json.dumps({'project': str(self.project_root), 'changes': changes}, indent=2, ensure_ascii=False))
+            return True
+        
+        if output_format == 'ndjson':
+            for change in self._iter_changes():
+                self._emit({'type': 'change', **change})
+            return True
+        
         print("🔍 Computing differences...")
         
         report = self.analyzer.analyze(self.manifest)
@@ -169,7 +499,300 @@ class BMADProvisioner:
                     if file_status.change_type.value in ['missing', 'outdated']:
                         print(f"   - {file_status.path.name}: {file_status.details}")
         
+        for file_status in report.extras:
+            print(f"\n🗑️  PRUNE (with --prune): {file_status.path.relative_to(self.analyzer.custom_skills_root)}")
+            print(f"   {file_status.details}")
+        
+        return True
+    
+    def impact(self) -> bool:
+        """Show which leaders a BMAD upgrade affects"""
+        print(f"🔀 Upgrade impact for: {self.manifest.project.name}")
+        print()
+        print(self.analyzer.upgrade_impact(self.manifest).summary())
+        return True
+    
+    def verify(self, verbose: bool = False) -> bool:
+        """Verify installed BMAD files against files-manifest.csv"""
+        from core.integrity import IntegrityVerifier
+        
+        verifier = IntegrityVerifier(self.project_root)
+        if not verifier.files_manifest.exists():
+            print(f"❌ files-manifest.csv not found: {verifier.files_manifest}")
+            return False
+        
+        print(f"🔐 Verifying BMAD installation: {self.project_root}")
+        report = verifier.verify()
+        
+        if verbose:
+            print(report.summary())
+        else:
+            # Extras are informational (installer-compiled agents, local files)
+            for name in sorted(report.modules):
+                module = report.modules[name]
+                for path in module.missing:
+                    print(f"   ❌ missing: {path}")
+                for path in module.modified:
+                    print(f"   ⚠️  modified: {path}")
+            extra = sum(len(m.extra) for m in report.modules.values())
+            print(f"   {report.hashed} hashed, {report.cached} cached, {extra} extra file(s) (--verbose to list)")
+        
+        if report.is_intact:
+            print("✅ BMAD installation matches files-manifest.csv")
+        else:
+            print("❌ BMAD installation was modified")
+        return report.is_intact
+    
+    def route(
+        self,
+        request: Optional[str] = None,
+        requests_path: Optional[Path] = None,
+        leader: Optional[str] = None,
+        top: int = 3
+    ) -> bool:
+        """Score a request (or an NDJSON batch) against the provisioned specialists"""
+        import json
+        import time
+        from core.router import RoutingEngine
+        
+        engine = RoutingEngine(self.project_root)
+        
+        if leader:
+            leaders = [leader]
+        else:
+            leaders = [l.name for l in self.manifest.project.leaders if (engine.skills_dir / l.name).is_dir()]
+        if not leaders:
+            print("❌ No provisioned leaders to route to")
+            return False
+        
+        if requests_path is None:
+            if not request:
+                print("❌ --mode route needs --request or --requests")
+                return False
+            matches = engine.route(request, leaders)
+            if not matches:
+                print("⚠️  No specialist matched")
+                return False
+            for match in matches[:top]:
+                print(f"🎯 {match.leader}/{match.specialist}: {match.score:.2f} ({', '.join(match.keywords)})")
+            return True
+        
+        # NDJSON in, NDJSON out; stats go to stderr
+        start = time.perf_counter()
+        total = checked = correct = errors = 0
+        stream = sys.stdin if str(requests_path) == '-' else open(requests_path, 'r', encoding='utf-8')
+        try:
+            for result in engine.route_batch(stream, leaders, top):
+                print(json.dumps(result, ensure_ascii=False))
+                total += 1
+                if 'error' in result:
+                    errors += 1
+                elif 'ok' in result:
+                    checked += 1
+                    correct += result['ok']
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+        elapsed = time.perf_counter() - start
+        
+        rate = total / elapsed if elapsed > 0 else 0.0
+        print(f"📨 Routed {total} request(s) in {elapsed:.2f}s ({rate:.0f}/s)", file=sys.stderr)
+        if errors:
+            print(f"❌ {errors} request(s) could not be routed", file=sys.stderr)
+        if checked:
+            print(f"🎯 {correct}/{checked} matched the expected specialist", file=sys.stderr)
+        return errors == 0 and correct == checked
+    
+    def scan_phi(self, scan_root: Optional[Path] = None, keywords_csv: Optional[Path] = None) -> bool:
+        """Scan a tree for the PHI keywords of the provisioned healthcare leaders"""
+        import time
+        from core.phi_scanner import PhiScanner, load_phi_keywords, provisioner_paths
+        
+        if keywords_csv:
+            csv_paths = [keywords_csv]
+        else:
+            csv_paths = sorted((self.project_root / "_bmad" / "custom-skills").glob("*/data/phi-keywords.csv"))
+        if not csv_paths:
+            print("❌ No phi-keywords.csv found (provision a healthcare leader or pass --phi-keywords)")
+            return False
+        
+        # The keyword lists and the skills generated from them are never findings;
+        # by default the BMAD install is left out too (its method docs are not the project's)
+        exclude = provisioner_paths(self.project_root) + csv_paths
+        if scan_root is None:
+            scan_root = self.project_root
+            exclude.append(self.project_root / "_bmad")
+        keywords = load_phi_keywords(csv_paths)
+        print(f"🩺 Scanning {scan_root} for {len(keywords)} PHI keyword(s)...", file=sys.stderr)
+        
+        scanner = PhiScanner(keywords, exclude=exclude)
+        start = time.perf_counter()
+        for finding in scanner.scan(scan_root):
+            print(f"{finding.path}:{finding.line}: [{finding.risk_level}] {finding.keyword} ({finding.category})")
+        elapsed = time.perf_counter() - start
+        
+        stats = scanner.stats
+        rate = stats.bytes / elapsed / (1024 * 1024) if elapsed > 0 else 0.0
+        print(
+            f"📄 {stats.files} file(s), {stats.bytes / (1024 * 1024):.1f} MB in {elapsed:.2f}s "
+            f"({rate:.0f} MB/s), {stats.skipped} binary/empty skipped",
+            file=sys.stderr
+        )
+        
+        if stats.findings:
+            print(f"⚠️  {stats.findings} PHI finding(s)", file=sys.stderr)
+            return False
+        print("✅ No PHI keywords found", file=sys.stderr)
         return True
+    
+    def package(self, out_dir: Optional[Path] = None, archive_format: str = 'zip') -> bool:
+        """Build reproducible archives of the provisioned leaders (unchanged ones are reused)"""
+        import time
+        from core.packager import SkillPackager
+        
+        skills_root = self.project_root / "_bmad" / "custom-skills"
+        out_dir = out_dir or self.project_root / "_bmad" / ".packages"
+        
+        leaders = [l.name for l in self.manifest.project.leaders if (skills_root / l.name).is_dir()]
+        missing = [l.name for l in self.manifest.project.leaders if l.name not in leaders]
+        for name in missing:
+            print(f"⚠️  {name} is not provisioned - skipped")
+        if not leaders:
+            print("❌ No provisioned leaders to package")
+            return False
+        
+        try:
+            packager = SkillPackager(skills_root, out_dir, archive_format)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return False
+        
+        print(f"📦 Packaging {len(leaders)} leader(s) into {out_dir}")
+        start = time.perf_counter()
+        results = packager.package(leaders)
+        elapsed = time.perf_counter() - start
+        
+        for result in results:
+            status = "♻️ " if result.reused else "✅"
+            print(f"{status} {result.archive.name} ({result.files} files, {result.size / 1024:.1f} KB)")
+        
+        built = sum(1 for r in results if not r.reused)
+        print(f"\n📊 {built} built, {len(results) - built} reused in {elapsed:.2f}s")
+        print(f"   Digests and sha256s: {out_dir / 'index.json'}")
+        return True
+    
+    def backups(self, action: str = 'list', keep: int = 5) -> bool:
+        """List, prune or verify skill backups"""
+        from core.generator import SkillBackup
+        
+        backup = SkillBackup(self.project_root)
+        
+        if action == 'list':
+            backup.list_backups()
+            return True
+        elif action == 'prune':
+            backup.prune_backups(keep)
+            return True
+        elif action == 'verify':
+            return backup.verify_backups()
+        
+        print(f"❌ Unknown backup action: {action}")
+        return False
+
+
+def discover(root: Path, inventory_out: Optional[Path] = None) -> bool:
+    """Find BMAD projects under root and print (or write) an inventory"""
+    import time
+    from core.discovery import ProjectDiscovery, write_inventory
+    
+    print(f"🔎 Discovering BMAD projects under {root}...", file=sys.stderr)
+    
+    start = time.perf_counter()
+    projects = ProjectDiscovery().discover(root)
+    elapsed = time.perf_counter() - start
+    
+    content = write_inventory(projects, inventory_out)
+    if inventory_out is None:
+        print(content, end='')
+    else:
+        print(f"✅ Inventory written to {inventory_out}", file=sys.stderr)
+    
+    print(f"📦 {len(projects)} project(s) found in {elapsed:.2f}s", file=sys.stderr)
+    return True
+
+
+def validate(manifest_path: Path, project_root: Optional[Path] = None) -> bool:
+    """Check the whole manifest (and its shards) in one pass, listing every issue with its position"""
+    import time
+    from core.manifest_validator import ManifestValidator
+    
+    print("🔍 Validating manifest...")
+    start = time.perf_counter()
+    validator = ManifestValidator(project_root)
+    issues = validator.validate_file(manifest_path)
+    elapsed = time.perf_counter() - start
+    
+    errors = validator.errors
+    warnings = [issue for issue in issues if issue.severity == 'warning']
+    if warnings:
+        print(f"⚠️  {len(warnings)} warning(s):")
+        for issue in warnings:
+            print(f"   - {issue}")
+    if errors:
+        print(f"❌ Manifest validation failed: {len(errors)} error(s)")
+        for issue in errors:
+            print(f"   - {issue}")
+        return False
+    
+    print(f"✅ Manifest is valid ({len(validator.leaders)} leader(s) checked in {elapsed:.2f}s)")
+    return True
+
+
+def status_stream(args):
+    """Where progress messages go: stderr when stdout carries JSON or a tar archive"""
+    return sys.stderr if args.format != 'text' or str(args.tar_output) == '-' else None
+
+
+def run_mode(provisioner: BMADProvisioner, args) -> bool:
+    """Execute the requested mode against one project"""
+    if args.mode == 'validate':
+        return validate(provisioner.manifest_path, provisioner.project_root)
+    elif args.mode == 'analyze':
+        if not provisioner.validate_manifest(status_stream(args)):
+            return False
+        with provisioner.track('analyze'):
+            return provisioner.analyze(args.format)
+    elif args.mode == 'diff':
+        if not provisioner.validate_manifest(status_stream(args)):
+            return False
+        with provisioner.track('analyze'):
+            return provisioner.diff(args.format)
+    elif args.mode == 'provision':
+        tar_output = args.tar_output
+        with contextlib.ExitStack() as stack:
+            if str(tar_output) == '-':
+                # stdout carries the archive; messages go to stderr
+                tar_output = sys.stdout.buffer
+                stack.enter_context(contextlib.redirect_stdout(sys.stderr))
+            return provisioner.validate_manifest() and provisioner.provision(
+                args.dry_run, args.generator_script, args.affected_only, args.knowledge_top,
+                args.render_cache, args.render_cache_max_mb, args.prune, tar_output, args.tar_base
+            )
+    elif args.mode == 'impact':
+        return provisioner.validate_manifest() and provisioner.impact()
+    elif args.mode == 'package':
+        return provisioner.package(args.package_dir, args.package_format)
+    elif args.mode == 'backups':
+        return provisioner.backups(args.backup_action, args.keep)
+    elif args.mode == 'verify':
+        return provisioner.verify(args.verbose)
+    elif args.mode == 'route':
+        return provisioner.route(args.request, args.requests, args.leader, args.top)
+    elif args.mode == 'scan-phi':
+        return provisioner.scan_phi(args.scan_root, args.phi_keywords)
+    
+    print(f"❌ Unknown mode: {args.mode}")
+    sys.exit(1)
 
 
 def main():
@@ -190,16 +813,50 @@ Examples:
   # Provision for real
   bmad-provisioner.py --config skills-manifest.yaml --mode provision
   
+  # Provision unattended (CI)
+  bmad-provisioner.py --config skills-manifest.yaml --mode provision \\
+    --non-interactive --on-missing-version continue --on-failure restore
+  
   # Override project root
   bmad-provisioner.py --config skills-manifest.yaml --project-root ~/my-project --mode analyze
+  
+  # Find every BMAD project under ~/projects, then analyze them all
+  bmad-provisioner.py --mode discover --discover-root ~/projects --inventory-out inventory.yaml
+  bmad-provisioner.py --config skills-manifest.yaml --inventory inventory.yaml --mode analyze
+  
+  # Re-provision two leaders of a sharded manifest
+  bmad-provisioner.py --config skills-manifest.yaml --mode provision --only dev-leader,qa-leader
+  
+  # Provision into a container image layer without touching the project
+  bmad-provisioner.py --config skills-manifest.yaml --mode provision \
+    --non-interactive --tar-output - --tar-base previous.tar > skills.tar
+  
+  # After a BMAD upgrade: see and re-provision only the affected leaders
+  bmad-provisioner.py --config skills-manifest.yaml --mode impact
+  bmad-provisioner.py --config skills-manifest.yaml --mode provision --affected-only
+  
+  # Check the BMAD install was not hand-edited
+  bmad-provisioner.py --config skills-manifest.yaml --mode verify
+  
+  # Which specialist handles a request? (or regression-test a batch)
+  bmad-provisioner.py --config skills-manifest.yaml --mode route --request "HIPAA audit logging"
+  bmad-provisioner.py --config skills-manifest.yaml --mode route --requests samples.ndjson > routed.ndjson
+  
+  # Look for PHI terms (phi-keywords.csv) anywhere in a repository
+  bmad-provisioner.py --config skills-manifest.yaml --mode scan-phi --scan-root ~/projects/my-app
+  
+  # Package provisioned leaders for distribution
+  bmad-provisioner.py --config skills-manifest.yaml --mode package --package-dir dist/
+  
+  # Manage backups
+  bmad-provisioner.py --config skills-manifest.yaml --mode backups --backup-action prune --keep 3
         """
     )
     
     parser.add_argument(
         '--config', '-c',
         type=Path,
-        required=True,
-        help='Path to skills-manifest.yaml'
+        help='Path to skills-manifest.yaml (required except for --mode discover)'
     )
     
     parser.add_argument(
@@ -216,17 +873,194 @@ Examples:
     
     parser.add_argument(
         '--mode', '-m',
-        choices=['analyze', 'provision', 'diff', 'validate'],
+        choices=['analyze', 'provision', 'diff', 'validate', 'impact', 'verify', 'route', 'scan-phi', 'package', 'backups', 'discover'],
         default='analyze',
         help='Operation mode (default: analyze)'
     )
     
+    parser.add_argument(
+        '--only',
+        type=lambda value: [name.strip() for name in value.split(',') if name.strip()],
+        metavar='LEADER[,LEADER]',
+        help='Only load and act on these leaders (other leader shards are not parsed)'
+    )
+    
+    parser.add_argument(
+        '--memory-report',
+        action='store_true',
+        help='Report peak and retained memory per phase and per leader (tracemalloc); '
+             'leaders are then generated one at a time'
+    )
+    
+    parser.add_argument(
+        '--memory-budget',
+        type=int,
+        metavar='MB',
+        help='Keep provisioning within MB of memory: fewer leaders at a time, large '
+             'CSV merges spilled to disk, rendered files streamed to disk'
+    )
+    
+    parser.add_argument(
+        '--discover-root',
+        type=Path,
+        default=Path.cwd(),
+        help='Directory to scan for BMAD projects in --mode discover (default: current directory)'
+    )
+    
+    parser.add_argument(
+        '--inventory-out',
+        type=Path,
+        help='Write the discovery inventory to this file instead of stdout'
+    )
+    
+    parser.add_argument(
+        '--inventory',
+        type=Path,
+        help='Run the mode against every project of a discovery inventory'
+    )
+    
     parser.add_argument(
         '--dry-run',
         action='store_true',
         help='Preview changes without applying them'
     )
     
+    parser.add_argument(
+        '--affected-only',
+        action='store_true',
+        help='Provision only leaders affected by BMAD changes since the last successful provision'
+    )
+    
+    parser.add_argument(
+        '--knowledge-top',
+        type=int,
+        default=5,
+        help='BMAD knowledge fragments referenced per specialist when provisioning (0 to skip, default: 5)'
+    )
+    
+    parser.add_argument(
+        '--render-cache',
+        choices=['copy', 'off'],
+        default='copy',
+        help='Reuse identical leader renders from the user cache by copy, or off (default: copy)'
+    )
+    
+    parser.add_argument(
+        '--render-cache-max-mb',
+        type=int,
+        default=500,
+        help='Render cache size bound in MB, least recently used entries evicted first (default: 500)'
+    )
+    
+    parser.add_argument(
+        '--prune',
+        action='store_true',
+        help='Remove generated files and leader directories no longer in the manifest (backed up first)'
+    )
+    
+    parser.add_argument(
+        '--tar-output',
+        type=Path,
+        help='Provision into this tar archive ("-" for stdout) instead of the project'
+    )
+    
+    parser.add_argument(
+        '--tar-base',
+        type=Path,
+        help='Tarball of a previous --tar-output: its CSVs are merged and its other files carried over'
+    )
+    
+    parser.add_argument(
+        '--on-missing-version',
+        choices=['prompt', 'continue', 'abort'],
+        default='prompt',
+        help='What to do when the BMAD version is not detected (default: prompt)'
+    )
+    
+    parser.add_argument(
+        '--on-failure',
+        choices=['prompt', 'restore', 'keep', 'abort'],
+        default='prompt',
+        help='What to do when a leader fails: restore it from backup, keep the '
+             'partial output, or abort the remaining leaders and restore (default: prompt)'
+    )
+    
+    parser.add_argument(
+        '--non-interactive',
+        action='store_true',
+        help='Never prompt; "prompt" policies fall back to abort (missing version) and keep (failure)'
+    )
+    
+    parser.add_argument(
+        '--request',
+        help='Request text to route in --mode route'
+    )
+    
+    parser.add_argument(
+        '--requests',
+        type=Path,
+        help='NDJSON file of {"request": ..., "expected": ...} lines to route ("-" for stdin)'
+    )
+    
+    parser.add_argument(
+        '--leader',
+        help='Route only to this leader\'s specialists (default: all provisioned leaders)'
+    )
+    
+    parser.add_argument(
+        '--top',
+        type=int,
+        default=3,
+        help='Matches to report per request in --mode route (default: 3)'
+    )
+    
+    parser.add_argument(
+        '--scan-root',
+        type=Path,
+        help='Directory or file to scan in --mode scan-phi (default: project root without _bmad; the provisioner\'s own output is never scanned)'
+    )
+    
+    parser.add_argument(
+        '--phi-keywords',
+        type=Path,
+        help='phi-keywords.csv to use (default: every provisioned leader\'s data/phi-keywords.csv)'
+    )
+    
+    parser.add_argument(
+        '--package-dir',
+        type=Path,
+        help='Where --mode package writes archives (default: <project>/_bmad/.packages)'
+    )
+    
+    parser.add_argument(
+        '--package-format',
+        choices=['zip', 'tar.zst'],
+        default='zip',
+        help='Archive format for --mode package; tar.zst needs the zstandard package (default: zip)'
+    )
+    
+    parser.add_argument(
+        '--backup-action',
+        choices=['list', 'prune', 'verify'],
+        default='list',
+        help='Backup operation for --mode backups (default: list)'
+    )
+    
+    parser.add_argument(
+        '--keep',
+        type=int,
+        default=5,
+        help='Snapshots to keep when pruning backups (default: 5)'
+    )
+    
+    parser.add_argument(
+        '--format',
+        choices=['text', 'json', 'ndjson'],
+        default='text',
+        help='Output of --mode analyze/diff: text report, one JSON document, or NDJSON '
+             'records streamed as results are known (default: text)'
+    )
+    
     parser.add_argument(
         '--verbose', '-v',
         action='store_true',
@@ -235,27 +1069,61 @@ Examples:
     
     args = parser.parse_args()
     
+    if args.mode == 'discover':
+        sys.exit(0 if discover(args.discover_root.expanduser(), args.inventory_out) else 1)
+    
     # Validate config file exists
+    if args.config is None:
+        parser.error("--config is required for this mode")
+    
     if not args.config.exists():
         print(f"❌ Config file not found: {args.config}")
         sys.exit(1)
     
+    if args.memory_budget is not None and args.memory_budget <= 0:
+        parser.error("--memory-budget must be a positive number of MB")
+    
+    if args.tar_output is not None:
+        if args.mode != 'provision':
+            parser.error("--tar-output only applies to --mode provision")
+        if args.inventory:
+            parser.error("--tar-output writes one project; it cannot be combined with --inventory")
+    
+    memory = memory_budget = None
+    if args.memory_report:
+        from core.memory import MemoryTracker
+        memory = MemoryTracker()
+        memory.start()
+    if args.memory_budget is not None:
+        from core.memory import MemoryBudget
+        memory_budget = MemoryBudget.from_mb(args.memory_budget)
+    
     try:
-        provisioner = BMADProvisioner(args.config, args.project_root)
-        
-        # Execute requested mode
-        if args.mode == 'validate':
-            success = provisioner.validate_manifest()
-        elif args.mode == 'analyze':
-            success = provisioner.validate_manifest() and provisioner.analyze()
-        elif args.mode == 'diff':
-            success = provisioner.validate_manifest() and provisioner.diff()
-        elif args.mode == 'provision':
-            success = provisioner.validate_manifest() and provisioner.provision(args.dry_run, args.generator_script)
+        policy = ProvisionPolicy(
+            on_missing_version=args.on_missing_version,
+            on_failure=args.on_failure,
+            interactive=not args.non_interactive
+        )
+        
+        if args.inventory:
+            from core.discovery import load_inventory
+            project_roots = [project.root for project in load_inventory(args.inventory)]
         else:
-            print(f"❌ Unknown mode: {args.mode}")
-            sys.exit(1)
+            project_roots = [args.project_root]
+        
+        success = True
+        for project_root in project_roots:
+            if len(project_roots) > 1:
+                print(f"\n{'='*50}\n📁 {project_root}\n{'='*50}", file=status_stream(args))
+            if args.mode == 'validate':
+                # Works on manifests that would not load
+                success = validate(args.config, project_root) and success
+                continue
+            provisioner = BMADProvisioner(args.config, project_root, policy, args.only, memory, memory_budget)
+            success = run_mode(provisioner, args) and success
         
+        if memory is not None:
+            print("\n" + memory.report(), file=status_stream(args))
         sys.exit(0 if success else 1)
         
     except Exception as e:
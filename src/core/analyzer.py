@@ -2,13 +2,41 @@
 Gap Analyzer - Compare manifest vs installed BMAD configuration
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from fnmatch import fnmatch
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional, Set, Tuple
+import os
 import yaml
 import csv
 from enum import Enum
 
+from .render_cache import project_cache_dir
+
+
+# Files the generator owns inside a leader; anything else there (data CSVs and
+# their merge bases, render state, user additions) is never reported as EXTRA
+GENERATED_PATTERNS = (
+    'SKILL.md',
+    'agents/leader-*.md',
+    'agents/specialist-*.md',
+    'agents/*.agent.yaml',
+    'workflows/route-to-specialist.yaml',
+    'workflows/*-complete.yaml',
+    'workflows/*-multi.yaml',
+    'references/routing-rules.md',
+    'references/knowledge-*.md',
+)
+
+INTEGRATIONS_DIR = "_integrations"
+
+# Bump when the analysis changes, so persisted reports are not reused
+ANALYSIS_CACHE_VERSION = 1
+
+# A persisted report is only written when every fingerprinted path is older
+# than this (a change in the same mtime tick as the scan would go unseen)
+RACY_WINDOW_NS = 2 * 10**9
+
 
 class ChangeType(Enum):
     """Type of change detected"""
@@ -35,6 +63,17 @@ class FileStatus:
             ChangeType.EXTRA: "📦"
         }
         return f"{emoji[self.change_type]} {self.path}: {self.details}"
+    
+    def to_dict(self) -> dict:
+        return {
+            'path': str(self.path),
+            'change': self.change_type.value,
+            'details': self.details
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'FileStatus':
+        return cls(path=Path(data['path']), change_type=ChangeType(data['change']), details=data['details'])
 
 
 @dataclass
@@ -46,12 +85,44 @@ class LeaderStatus:
     
     @property
     def is_up_to_date(self) -> bool:
-        return all(f.change_type == ChangeType.UP_TO_DATE for f in self.files)
+        return all(f.change_type in (ChangeType.UP_TO_DATE, ChangeType.EXTRA) for f in self.files)
     
     @property
     def needs_update(self) -> bool:
         return any(f.change_type in [ChangeType.MISSING, ChangeType.OUTDATED] 
                    for f in self.files)
+    
+    @property
+    def extras(self) -> List[FileStatus]:
+        return [f for f in self.files if f.change_type == ChangeType.EXTRA]
+    
+    @property
+    def state(self) -> str:
+        if not self.installed:
+            return "not_installed"
+        return "needs_update" if self.needs_update else "up_to_date"
+    
+    def to_dict(self, include_files: bool = True) -> dict:
+        changes: Dict[str, int] = {}
+        for file_status in self.files:
+            changes[file_status.change_type.value] = changes.get(file_status.change_type.value, 0) + 1
+        data = {
+            'name': self.name,
+            'installed': self.installed,
+            'status': self.state,
+            'changes': changes
+        }
+        if include_files:
+            data['files'] = [f.to_dict() for f in self.files]
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'LeaderStatus':
+        return cls(
+            name=data['name'],
+            installed=data['installed'],
+            files=[FileStatus.from_dict(f) for f in data.get('files', [])]
+        )
 
 
 @dataclass
@@ -60,6 +131,30 @@ class GapAnalysisReport:
     bmad_version: Optional[str]
     leaders: List[LeaderStatus]
     recommendations: List[str]
+    # Leader directories and integration workflows no longer in the manifest
+    orphans: List[FileStatus] = field(default_factory=list)
+    
+    @property
+    def extras(self) -> List[FileStatus]:
+        """Every EXTRA artifact, in live leaders or not"""
+        return [f for leader in self.leaders for f in leader.extras] + self.orphans
+    
+    def to_dict(self) -> dict:
+        return {
+            'bmad_version': self.bmad_version,
+            'leaders': [leader.to_dict() for leader in self.leaders],
+            'orphans': [f.to_dict() for f in self.orphans],
+            'recommendations': self.recommendations
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'GapAnalysisReport':
+        return cls(
+            bmad_version=data.get('bmad_version'),
+            leaders=[LeaderStatus.from_dict(l) for l in data.get('leaders', [])],
+            recommendations=data.get('recommendations', []),
+            orphans=[FileStatus.from_dict(f) for f in data.get('orphans', [])]
+        )
     
     def summary(self) -> str:
         """Generate human-readable summary"""
@@ -76,6 +171,8 @@ class GapAnalysisReport:
         for leader in self.leaders:
             if leader.is_up_to_date:
                 lines.append(f"✅ {leader.name}: Up to date")
+                for file_status in leader.extras:
+                    lines.append(f"   {file_status}")
             elif not leader.installed:
                 lines.append(f"❌ {leader.name}: Not installed")
             elif leader.needs_update:
@@ -84,6 +181,11 @@ class GapAnalysisReport:
                     if file_status.change_type != ChangeType.UP_TO_DATE:
                         lines.append(f"   {file_status}")
         
+        if self.orphans:
+            lines.append("📦 Not in manifest:")
+            for file_status in self.orphans:
+                lines.append(f"   {file_status}")
+        
         lines.append("")
         
         # Recommendations
@@ -95,6 +197,68 @@ class GapAnalysisReport:
         return "\n".join(lines)
 
 
+@dataclass
+class UpgradeImpact:
+    """Which leaders a BMAD upgrade affects"""
+    has_baseline: bool
+    old_version: Optional[str]
+    new_version: Optional[str]
+    module_changes: Dict[str, Tuple[Optional[str], Optional[str]]]
+    changed_files: List[str]
+    affected: Dict[str, List[str]]
+    
+    def summary(self) -> str:
+        """Generate human-readable summary"""
+        lines = ["🔀 Upgrade Impact Report", "=" * 50, ""]
+        
+        if not self.has_baseline:
+            lines.append("⚠️  No provisioning baseline - every leader is considered affected")
+            lines.append("")
+        else:
+            lines.append(f"BMAD Version: {self.old_version} → {self.new_version}")
+            for module, (old, new) in sorted(self.module_changes.items()):
+                lines.append(f"   {module}: {old or '-'} → {new or '-'}")
+            lines.append(f"Changed BMAD files: {len(self.changed_files)}")
+            lines.append("")
+        
+        for leader_name, reasons in self.affected.items():
+            if reasons:
+                lines.append(f"⚠️  {leader_name}: re-provision")
+                for reason in reasons[:5]:
+                    lines.append(f"   - {reason}")
+                if len(reasons) > 5:
+                    lines.append(f"   - ... {len(reasons) - 5} more")
+            else:
+                lines.append(f"✅ {leader_name}: unaffected")
+        
+        return "\n".join(lines)
+    
+    @property
+    def affected_leaders(self) -> List[str]:
+        return [name for name, reasons in self.affected.items() if reasons]
+
+
+@dataclass
+class AnalysisContext:
+    """
+    What one run has learned about a project, shared by every step of a mode
+    
+    validate, analyze, diff and provision ask the same questions of the same
+    tree; answers are kept until GapAnalyzer.invalidate() (the tree changed).
+    The BMAD version and state describe the BMAD install, which provisioning
+    never writes, so they survive invalidation.
+    """
+    bmad_version: Optional[str] = None
+    version_known: bool = False
+    bmad_state: Optional[Dict] = None
+    leaders: Dict[str, LeaderStatus] = field(default_factory=dict)
+    report: Optional[GapAnalysisReport] = None
+    # The report came from the previous run (tree unchanged since)
+    reused: bool = False
+    # Contents of the persisted report file, read at most once
+    persisted: Optional[Dict] = None
+
+
 class GapAnalyzer:
     """Analyze gaps between manifest and installed BMAD"""
     
@@ -102,8 +266,33 @@ class GapAnalyzer:
         self.project_root = project_root
         self.bmad_root = project_root / "_bmad"
         self.custom_skills_root = self.bmad_root / "custom-skills"
+        self.baseline_path = self.bmad_root / ".cache" / "provisioned-baseline.json"
+        # Analysis is read-only: its saved report lives in the user cache directory
+        self.report_path = project_cache_dir(project_root) / "gap-analysis.json"
+        self.context = AnalysisContext()
+    
+    def invalidate(self) -> None:
+        """Forget the scan of custom-skills after writing to it"""
+        self.context.leaders.clear()
+        self.context.report = None
+        self.context.reused = False
+    
+    def _version_files(self) -> List[Path]:
+        return [self.bmad_root / "_config" / "manifest.yaml", self.project_root / "package.json"]
     
     def detect_bmad_version(self) -> Optional[str]:
+        """Detect installed BMAD version (once per run, or from the persisted report)"""
+        context = self.context
+        if not context.version_known:
+            persisted = self._load_persisted().get('bmad_version', {})
+            if persisted and persisted.get('key') == self._stat_digest(self._version_files())[0]:
+                context.bmad_version = persisted.get('value')
+            else:
+                context.bmad_version = self._read_bmad_version()
+            context.version_known = True
+        return context.bmad_version
+    
+    def _read_bmad_version(self) -> Optional[str]:
         """Detect installed BMAD version from _config/manifest.yaml"""
         manifest_path = self.project_root / "_bmad" / "_config" / "manifest.yaml"
     
@@ -137,6 +326,9 @@ class GapAnalyzer:
         
     def check_leader_installed(self, leader_name: str) -> bool:
         """Check if a leader is installed"""
+        known = self.context.leaders.get(leader_name)
+        if known is not None:
+            return known.installed
         leader_path = self.custom_skills_root / leader_name
         return leader_path.exists()
     
@@ -207,25 +399,31 @@ class GapAnalyzer:
     
     def analyze_leader(self, leader, manifest_leader) -> LeaderStatus:
         """Analyze a single leader"""
+        known = self.context.leaders.get(manifest_leader.name)
+        if known is not None:
+            return known
+        return LeaderStatus(
+            name=manifest_leader.name,
+            installed=self.check_leader_installed(manifest_leader.name),
+            files=list(self.iter_leader_files(manifest_leader))
+        )
+    
+    def iter_leader_files(self, manifest_leader) -> Iterator[FileStatus]:
+        """Yield the status of each file of a leader as soon as it is checked"""
         leader_name = manifest_leader.name
         leader_path = self.custom_skills_root / leader_name
         
         # Extract short leader name (remove -leader suffix if present)
         short_leader_name = leader_name.replace('-leader', '')
         
-        files = []
-        
         # Check leader installed
         if not self.check_leader_installed(leader_name):
-            return LeaderStatus(
-                name=leader_name,
-                installed=False,
-                files=[FileStatus(
-                    path=leader_path,
-                    change_type=ChangeType.MISSING,
-                    details="Leader not installed"
-                )]
+            yield FileStatus(
+                path=leader_path,
+                change_type=ChangeType.MISSING,
+                details="Leader not installed"
             )
+            return
         
         # Check key files
         key_files = [
@@ -235,41 +433,311 @@ class GapAnalyzer:
         ]
         
         for file_path in key_files:
-            files.append(self.check_file_status(file_path))
+            yield self.check_file_status(file_path)
         
         # Check specialist files
         for spec in manifest_leader.specialists:
             spec_file = leader_path / "agents" / f"specialist-{spec.id}.md"
-            files.append(self.check_file_status(spec_file))
+            yield self.check_file_status(spec_file)
+        
+        # Generated files the manifest no longer asks for
+        for rel in self.extra_artifacts(manifest_leader):
+            yield FileStatus(path=leader_path / rel, change_type=ChangeType.EXTRA, details=self._extra_details(rel))
         
         # Check CSV files if domain specific
         if manifest_leader.domain != 'generic':
             data_path = leader_path / "data"
             if data_path.exists():
                 for csv_file in data_path.glob("*.csv"):
-                    files.append(FileStatus(
+                    yield FileStatus(
                         path=csv_file,
                         change_type=ChangeType.UP_TO_DATE,
                         details="CSV exists (content check skipped)"
-                    ))
+                    )
+    
+    @staticmethod
+    def expected_artifacts(manifest_leader) -> Set[str]:
+        """Paths (relative to the leader directory) the generator writes for a leader"""
+        short_leader_name = manifest_leader.name.replace('-leader', '')
+        expected = {
+            "SKILL.md",
+            f"agents/leader-{short_leader_name}.md",
+            f"agents/leader-{short_leader_name}.agent.yaml",
+            "workflows/route-to-specialist.yaml",
+            f"workflows/{short_leader_name}-complete.yaml",
+            "references/routing-rules.md",
+        }
+        if len(manifest_leader.specialists) > 1:
+            expected.add(f"workflows/{short_leader_name}-multi.yaml")
+        for spec in manifest_leader.specialists:
+            expected.add(f"agents/specialist-{spec.id}.md")
+            expected.add(f"agents/specialist-{spec.id}.agent.yaml")
+            expected.add(f"references/knowledge-{spec.id}.md")
+        return expected
+    
+    @staticmethod
+    def _generated_files(leader_path: Path) -> Set[str]:
+        """Generator-owned files present in a leader directory"""
+        present = set()
+        if (leader_path / "SKILL.md").is_file():
+            present.add("SKILL.md")
+        for sub in ("agents", "workflows", "references"):
+            try:
+                entries = list(os.scandir(leader_path / sub))
+            except OSError:
+                continue
+            for entry in entries:
+                rel = f"{sub}/{entry.name}"
+                if entry.is_file() and any(fnmatch(rel, pattern) for pattern in GENERATED_PATTERNS):
+                    present.add(rel)
+        return present
+    
+    def extra_artifacts(self, manifest_leader) -> List[str]:
+        """Generated files in a leader directory that the manifest no longer produces"""
+        leader_path = self.custom_skills_root / manifest_leader.name
+        return sorted(self._generated_files(leader_path) - self.expected_artifacts(manifest_leader))
+    
+    @staticmethod
+    def _extra_details(rel: str) -> str:
+        if rel.startswith("agents/specialist-") or rel.startswith("references/knowledge-"):
+            return "Specialist not in manifest"
+        return "Not generated for this manifest"
+    
+    def find_orphans(self, manifest) -> List[FileStatus]:
+        """Leader directories and integration workflows the manifest no longer declares"""
+        if not self.custom_skills_root.is_dir():
+            return []
         
-        return LeaderStatus(
-            name=leader_name,
-            installed=True,
-            files=files
-        )
+        # Leaders left out by --only are still live
+        live = {leader.name for leader in manifest.project.leaders} | set(manifest.project.leader_names)
+        orphans = []
+        for entry in sorted(os.scandir(self.custom_skills_root), key=lambda e: e.name):
+            if not entry.is_dir() or entry.name in live or entry.name.startswith('.'):
+                continue
+            path = Path(entry.path)
+            if entry.name == INTEGRATIONS_DIR:
+                declared = {f"{integration.name}.yaml" for integration in manifest.project.integrations}
+                workflows_dir = path / "workflows"
+                if workflows_dir.is_dir():
+                    orphans.extend(
+                        FileStatus(path=p, change_type=ChangeType.EXTRA, details="Integration not in manifest")
+                        for p in sorted(workflows_dir.glob("*.yaml")) if p.name not in declared
+                    )
+                continue
+            # Only directories the generator created (user skills are left alone)
+            if not any((path / "agents").glob("leader-*.md")):
+                continue
+            count = sum(len(filenames) for _, _, filenames in os.walk(path))
+            orphans.append(FileStatus(
+                path=path,
+                change_type=ChangeType.EXTRA,
+                details=f"Leader not in manifest ({count} files)"
+            ))
+        return orphans
     
-    def analyze(self, manifest) -> GapAnalysisReport:
-        """Perform complete gap analysis"""
-        bmad_version = self.detect_bmad_version()
+    def prune(self, extras: List[FileStatus]) -> int:
+        """Delete EXTRA files and leader directories; returns how many were removed"""
+        import shutil
+        
+        removed = 0
+        for file_status in extras:
+            path = file_status.path
+            # Never follow a path outside custom-skills
+            if self.custom_skills_root.resolve() not in path.resolve().parents:
+                continue
+            if path.is_dir() and not path.is_symlink():
+                shutil.rmtree(path)
+            elif path.exists() or path.is_symlink():
+                path.unlink()
+            else:
+                continue
+            removed += 1
+        return removed
+    
+    def iter_analysis(self, manifest) -> Iterator[Tuple[str, Optional[str], object]]:
+        """
+        Analyze leader by leader, yielding results as soon as they are known
+        
+        A run scans the tree once: later calls (and the next run, if nothing
+        changed) replay the report instead. A completed scan is kept in the
+        context and persisted.
+        
+        Yields:
+            ('file', leader name, FileStatus) for each checked file,
+            ('leader', leader name, LeaderStatus) once a leader's files are done,
+            ('orphan', None, FileStatus) for artifacts outside the manifest (last)
+        """
+        report = self.context.report or self._reuse_persisted(manifest)
+        if report is not None:
+            for leader_status in report.leaders:
+                for file_status in leader_status.files:
+                    yield 'file', leader_status.name, file_status
+                yield 'leader', leader_status.name, leader_status
+            for file_status in report.orphans:
+                yield 'orphan', None, file_status
+            return
         
-        # Analyze each leader
         leaders = []
         for manifest_leader in manifest.project.leaders:
-            leader_status = self.analyze_leader(manifest_leader, manifest_leader)
+            leader_name = manifest_leader.name
+            installed = self.check_leader_installed(leader_name)
+            files = []
+            for file_status in self.iter_leader_files(manifest_leader):
+                files.append(file_status)
+                yield 'file', leader_name, file_status
+            leader_status = LeaderStatus(name=leader_name, installed=installed, files=files)
+            self.context.leaders[leader_name] = leader_status
             leaders.append(leader_status)
+            yield 'leader', leader_name, leader_status
+        
+        orphans = []
+        for file_status in self.find_orphans(manifest):
+            orphans.append(file_status)
+            yield 'orphan', None, file_status
+        
+        self.context.report = GapAnalysisReport(
+            bmad_version=self.detect_bmad_version(),
+            leaders=leaders,
+            recommendations=self.recommendations(
+                missing=[l.name for l in leaders if not l.installed],
+                outdated=[l.name for l in leaders if l.installed and l.needs_update],
+                extras=sum(len(l.extras) for l in leaders) + len(orphans)
+            ),
+            orphans=orphans
+        )
+        self._persist(manifest, self.context.report)
+    
+    def analyze(self, manifest) -> GapAnalysisReport:
+        """Perform complete gap analysis"""
+        for _ in self.iter_analysis(manifest):
+            pass
+        return self.context.report
+    
+    @staticmethod
+    def _stat_digest(paths: List[Path]) -> Tuple[str, int]:
+        """Digest of the size, mtime and inode of paths, and the newest mtime"""
+        import hashlib
+        
+        digest = hashlib.sha256()
+        newest = 0
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except OSError:
+                digest.update(f"{path}\0-\n".encode('utf-8', 'surrogateescape'))
+                continue
+            digest.update(f"{path}\0{st.st_size}:{st.st_mtime_ns}:{st.st_ino}\n".encode('utf-8', 'surrogateescape'))
+            newest = max(newest, st.st_mtime_ns)
+        return digest.hexdigest(), newest
+    
+    def _fingerprint(self, manifest, orphans: List[FileStatus]) -> Tuple[str, int]:
+        """
+        Digest of everything the analysis reads, and the newest mtime in it
+        
+        The analysis only tests which files exist, so the mtimes of the
+        directories it looks into (which change when an entry is added,
+        removed or renamed) stand in for their contents. The manifest counts
+        through the leaders, specialists and integrations it declares.
+        """
+        import json
+        import hashlib
+        
+        project = manifest.project
+        declared = json.dumps([
+            ANALYSIS_CACHE_VERSION,
+            str(self.project_root),
+            GENERATED_PATTERNS,
+            [[l.name, l.domain, [s.id for s in l.specialists]] for l in project.leaders],
+            project.leader_names,
+            [integration.name for integration in project.integrations],
+        ])
+        
+        root = self.custom_skills_root
+        paths = self._version_files() + [root, root / INTEGRATIONS_DIR / "workflows"]
+        for leader in project.leaders:
+            leader_path = root / leader.name
+            paths.append(leader_path)
+            paths.extend(leader_path / sub for sub in ("agents", "workflows", "references", "data"))
         
-        # Generate recommendations
+        # Directories the orphan scan looks into: every agents/ outside the
+        # manifest, and all of an orphaned leader (its file count is reported)
+        live = {leader.name for leader in project.leaders} | set(project.leader_names)
+        try:
+            entries = sorted(e.name for e in os.scandir(root) if e.is_dir())
+        except OSError:
+            entries = []
+        for name in entries:
+            if name not in live and name != INTEGRATIONS_DIR and not name.startswith('.'):
+                paths.append(root / name / "agents")
+        for file_status in orphans:
+            if file_status.path.parent == root:
+                paths.extend(Path(dirpath) for dirpath, _, _ in os.walk(file_status.path))
+        
+        digest, newest = self._stat_digest(paths)
+        return hashlib.sha256(f"{declared}\n{digest}".encode('utf-8')).hexdigest(), newest
+    
+    def _load_persisted(self) -> Dict:
+        import json
+        if self.context.persisted is None:
+            try:
+                with open(self.report_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}
+            if not isinstance(data, dict) or data.get('version') != ANALYSIS_CACHE_VERSION:
+                data = {}
+            self.context.persisted = data
+        return self.context.persisted
+    
+    def _reuse_persisted(self, manifest) -> Optional[GapAnalysisReport]:
+        """The previous run's report, if nothing it depends on changed since"""
+        data = self._load_persisted()
+        if 'report' not in data:
+            return None
+        try:
+            report = GapAnalysisReport.from_dict(data['report'])
+        except (KeyError, TypeError, ValueError):
+            return None
+        if self._fingerprint(manifest, report.orphans)[0] != data.get('fingerprint'):
+            return None
+        
+        self.context.report = report
+        self.context.reused = True
+        self.context.leaders.update((l.name, l) for l in report.leaders)
+        if not self.context.version_known:
+            self.context.bmad_version = report.bmad_version
+            self.context.version_known = True
+        return report
+    
+    def _persist(self, manifest, report: GapAnalysisReport) -> None:
+        """Store the report for the next run (only inside a BMAD install)"""
+        import json
+        import time
+        
+        if not self.bmad_root.is_dir():
+            return
+        fingerprint, newest = self._fingerprint(manifest, report.orphans)
+        if time.time_ns() - newest < RACY_WINDOW_NS:
+            return
+        
+        data = {
+            'version': ANALYSIS_CACHE_VERSION,
+            'fingerprint': fingerprint,
+            'bmad_version': {'key': self._stat_digest(self._version_files())[0], 'value': report.bmad_version},
+            'report': report.to_dict()
+        }
+        try:
+            self.report_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.report_path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp_path, self.report_path)
+        except OSError:
+            pass
+        self.context.persisted = data
+    
+    def recommendations(self, missing: List[str], outdated: List[str], extras: int) -> List[str]:
+        """Next steps for the given missing and outdated leaders and orphan count"""
         recommendations = []
         
         # Check if BMAD installed
@@ -277,25 +745,212 @@ class GapAnalyzer:
             recommendations.append("BMAD not installed - run: npx bmad-method@alpha install")
         
         # Check leaders
-        missing_leaders = [l for l in leaders if not l.installed]
-        if missing_leaders:
-            recommendations.append(
-                f"Install {len(missing_leaders)} missing leaders: "
-                f"{', '.join(l.name for l in missing_leaders)}"
-            )
+        if missing:
+            recommendations.append(f"Install {len(missing)} missing leaders: {', '.join(missing)}")
+        
+        if outdated:
+            recommendations.append(f"Update {len(outdated)} outdated leaders: {', '.join(outdated)}")
         
-        outdated_leaders = [l for l in leaders if l.installed and l.needs_update]
-        if outdated_leaders:
+        if extras:
             recommendations.append(
-                f"Update {len(outdated_leaders)} outdated leaders: "
-                f"{', '.join(l.name for l in outdated_leaders)}"
+                f"Remove {extras} orphaned artifact(s) no longer in the manifest: --mode provision --prune"
             )
         
-        if not missing_leaders and not outdated_leaders:
+        if not missing and not outdated:
             recommendations.append("All leaders up to date - safe to provision")
         
-        return GapAnalysisReport(
-            bmad_version=bmad_version,
-            leaders=leaders,
-            recommendations=recommendations
-        )
\ No newline at end of file
+        return recommendations
+    
+    def bmad_state(self) -> Dict:
+        """Current module versions and file hashes of the BMAD install (once per run)"""
+        if self.context.bmad_state is None:
+            self.context.bmad_state = self._read_bmad_state()
+        return self.context.bmad_state
+    
+    def _read_bmad_state(self) -> Dict:
+        state = {'version': self.detect_bmad_version(), 'modules': {}, 'files': {}}
+        
+        manifest_path = self.bmad_root / "_config" / "manifest.yaml"
+        if manifest_path.exists():
+            with open(manifest_path, 'r') as f:
+                data = yaml.safe_load(f) or {}
+            state['modules'] = {
+                m['name']: m.get('version')
+                for m in data.get('modules', []) if isinstance(m, dict) and 'name' in m
+            }
+        
+        files_manifest = self.bmad_root / "_config" / "files-manifest.csv"
+        if files_manifest.exists():
+            with open(files_manifest, 'r', newline='', encoding='utf-8') as f:
+                state['files'] = {row['path']: row['hash'] for row in csv.DictReader(f)}
+        
+        return state
+    
+    def save_baseline(self, leaders: List[str]) -> None:
+        """
+        Remember the BMAD state the given leaders were provisioned against
+        
+        Other leaders keep the state of their own last provision, so a run
+        with --only or --affected-only does not hide an upgrade from them.
+        Each distinct state is stored once and leaders point at it.
+        """
+        import json
+        import hashlib
+        
+        baseline = self.load_baseline() or {'states': {}, 'leaders': {}}
+        state = self.bmad_state()
+        key = hashlib.sha256(json.dumps(state, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+        baseline['states'][key] = state
+        baseline['leaders'].update((name, key) for name in leaders)
+        
+        used = set(baseline['leaders'].values())
+        if baseline.get('default'):
+            used.add(baseline['default'])
+        baseline['states'] = {k: v for k, v in baseline['states'].items() if k in used}
+        
+        self.baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.baseline_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, separators=(',', ':'))
+        os.replace(tmp_path, self.baseline_path)
+    
+    def load_baseline(self) -> Optional[Dict]:
+        """
+        {'states': {key: state}, 'leaders': {leader: key}, 'default'?: key}
+        
+        A baseline written before leaders were tracked is one state that
+        applies to every leader (the default).
+        """
+        import json
+        if not self.baseline_path.exists():
+            return None
+        try:
+            with open(self.baseline_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict):
+            return None
+        if isinstance(data.get('states'), dict) and isinstance(data.get('leaders'), dict):
+            return data
+        if 'files' in data or 'modules' in data:
+            return {'states': {'legacy': data}, 'leaders': {}, 'default': 'legacy'}
+        return None
+    
+    @staticmethod
+    def _state_changes(old: Dict, new: Dict) -> Tuple[Dict[str, Tuple[Optional[str], Optional[str]]], List[str]]:
+        """(module version changes, changed file paths) from one BMAD state to another"""
+        old_modules, new_modules = old.get('modules', {}), new['modules']
+        module_changes = {
+            name: (old_modules.get(name), new_modules.get(name))
+            for name in set(old_modules) | set(new_modules)
+            if old_modules.get(name) != new_modules.get(name)
+        }
+        old_files, new_files = old.get('files', {}), new['files']
+        changed_files = sorted(
+            path for path in set(old_files) | set(new_files)
+            if old_files.get(path) != new_files.get(path)
+        )
+        return module_changes, changed_files
+    
+    def _agent_modules(self) -> Dict[str, str]:
+        """BMAD agent name -> module, from agent-manifest.csv"""
+        agent_manifest = self.bmad_root / "_config" / "agent-manifest.csv"
+        if not agent_manifest.exists():
+            return {}
+        with open(agent_manifest, 'r', newline='', encoding='utf-8') as f:
+            return {row['name']: row['module'] for row in csv.DictReader(f)}
+    
+    def leader_references(self, leader, manifest, agent_modules: Dict[str, str]) -> Tuple[List[str], List[str]]:
+        """
+        BMAD artifacts a leader depends on
+        
+        Returns:
+            (path prefixes relative to _bmad, module names)
+        """
+        prefixes = []
+        modules = []
+        
+        # Phase workflows: '3-arch' -> bmm/workflows/3-solutioning/...
+        phase_number = leader.phase.split('-', 1)[0]
+        if phase_number.isdigit():
+            prefixes.append(f"bmm/workflows/{phase_number}-")
+        
+        # Domain templates lean on the matching BMAD module
+        if leader.domain == 'cis':
+            prefixes.append("cis/")
+        elif leader.domain == 'qa':
+            prefixes.append("bmm/testarch/")
+        
+        # Workflows wired into the customize file menu
+        customization = manifest.project.customizations.get(leader.name)
+        if customization:
+            for menu_item in customization.menu_additions:
+                workflow = str(menu_item.get('workflow', ''))
+                if '_bmad/' in workflow:
+                    prefixes.append(workflow.split('_bmad/', 1)[1])
+        
+        # BMAD agents chained with this leader in integration workflows
+        for integration in manifest.project.integrations:
+            if leader.name in integration.sequence:
+                modules.extend(
+                    agent_modules[step] for step in integration.sequence if step in agent_modules
+                )
+        
+        return prefixes, sorted(set(modules))
+    
+    def upgrade_impact(self, manifest) -> UpgradeImpact:
+        """Diff the BMAD install against the provisioning baseline and map changes to leaders"""
+        baseline = self.load_baseline()
+        current = self.bmad_state()
+        
+        if baseline is None:
+            return UpgradeImpact(
+                has_baseline=False,
+                old_version=None,
+                new_version=current['version'],
+                module_changes={},
+                changed_files=[],
+                affected={l.name: ["no baseline"] for l in manifest.project.leaders}
+            )
+        
+        states = baseline['states']
+        # Changes since each baseline state, computed once per state
+        changes = {}
+        agent_modules = self._agent_modules()
+        affected = {}
+        for leader in manifest.project.leaders:
+            key = baseline['leaders'].get(leader.name, baseline.get('default'))
+            if key not in states:
+                affected[leader.name] = ["no baseline"]
+                continue
+            if key not in changes:
+                changes[key] = self._state_changes(states[key], current)
+            module_changes, changed_files = changes[key]
+            
+            prefixes, modules = self.leader_references(leader, manifest, agent_modules)
+            reasons = [
+                f"{path} changed" for path in changed_files
+                if any(path.startswith(prefix) for prefix in prefixes)
+            ]
+            reasons.extend(
+                f"module {module} {module_changes[module][0]} → {module_changes[module][1]}"
+                for module in modules if module in module_changes
+            )
+            affected[leader.name] = reasons
+        
+        # The report covers every state the manifest's leaders were provisioned against
+        module_changes, changed_files = {}, set()
+        for key, (key_modules, key_files) in changes.items():
+            module_changes.update(key_modules)
+            changed_files.update(key_files)
+        old_versions = sorted({str(states[key].get('version')) for key in changes})
+        
+        return UpgradeImpact(
+            has_baseline=bool(changes),
+            old_version=", ".join(old_versions) if old_versions else None,
+            new_version=current['version'],
+            module_changes=module_changes,
+            changed_files=sorted(changed_files),
+            affected=affected
+        )
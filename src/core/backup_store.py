@@ -0,0 +1,254 @@
+"""
+Backup Store - Compressed, deduplicated archive for custom-skills snapshots
+"""
+
+import os
+import json
+import lzma
+import hashlib
+import datetime
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Dict, Optional
+
+
+@dataclass
+class SnapshotEntry:
+    """One file recorded in a snapshot"""
+    digest: str
+    size: int
+    mode: int
+
+
+@dataclass
+class Snapshot:
+    """Snapshot index: relative path -> content object"""
+    snapshot_id: str
+    created: str
+    leaders: List[str]
+    files: Dict[str, SnapshotEntry] = field(default_factory=dict)
+    
+    @property
+    def total_size(self) -> int:
+        return sum(entry.size for entry in self.files.values())
+    
+    def to_dict(self) -> dict:
+        return {
+            'id': self.snapshot_id,
+            'created': self.created,
+            'leaders': self.leaders,
+            'files': {
+                rel: [entry.digest, entry.size, entry.mode]
+                for rel, entry in sorted(self.files.items())
+            }
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Snapshot':
+        return cls(
+            snapshot_id=data['id'],
+            created=data['created'],
+            leaders=data['leaders'],
+            files={
+                rel: SnapshotEntry(digest=d, size=size, mode=mode)
+                for rel, (d, size, mode) in data['files'].items()
+            }
+        )
+
+
+class BackupArchive:
+    """
+    Content-addressed backup store under _bmad/.backups
+    
+    Layout:
+        objects/<aa>/<digest>.xz   one xz-compressed object per unique file content
+        snapshots/<id>.json        per-snapshot index (path -> digest, size, mode)
+    
+    Identical files across snapshots are stored once, and any single file
+    can be restored by looking up its digest in the snapshot index.
+    """
+    
+    PRESET = 6
+    
+    def __init__(self, backup_dir: Path):
+        self.backup_dir = backup_dir
+        self.objects_dir = backup_dir / "objects"
+        self.snapshots_dir = backup_dir / "snapshots"
+    
+    # -- objects ----------------------------------------------------------
+    
+    def object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / f"{digest}.xz"
+    
+    def put_object(self, data: bytes) -> str:
+        """Store content once, return its sha256 digest"""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.object_path(digest)
+        
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_bytes(lzma.compress(data, preset=self.PRESET))
+            os.replace(tmp_path, path)
+        
+        return digest
+    
+    def get_object(self, digest: str) -> bytes:
+        """Read and decompress an object"""
+        return lzma.decompress(self.object_path(digest).read_bytes())
+    
+    # -- snapshots --------------------------------------------------------
+    
+    def snapshot_path(self, snapshot_id: str) -> Path:
+        return self.snapshots_dir / f"{snapshot_id}.json"
+    
+    def create_snapshot(self, source_root: Path, leaders: List[str]) -> Snapshot:
+        """Archive the given leader directories of source_root"""
+        now = datetime.datetime.now()
+        snapshot_id = f"custom-skills_{now.strftime('%Y%m%d_%H%M%S')}"
+        suffix = 1
+        while self.snapshot_path(snapshot_id).exists():
+            suffix += 1
+            snapshot_id = f"custom-skills_{now.strftime('%Y%m%d_%H%M%S')}_{suffix}"
+        
+        snapshot = Snapshot(snapshot_id=snapshot_id, created=now.isoformat(timespec='seconds'), leaders=leaders)
+        
+        for leader_name in leaders:
+            leader_root = source_root / leader_name
+            for dirpath, _dirnames, filenames in os.walk(leader_root):
+                for filename in filenames:
+                    file_path = Path(dirpath) / filename
+                    data = file_path.read_bytes()
+                    rel = file_path.relative_to(source_root).as_posix()
+                    snapshot.files[rel] = SnapshotEntry(
+                        digest=self.put_object(data),
+                        size=len(data),
+                        mode=file_path.stat().st_mode & 0o777
+                    )
+        
+        self.snapshots_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.snapshot_path(snapshot_id).with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot.to_dict(), f, separators=(',', ':'))
+        os.replace(tmp_path, self.snapshot_path(snapshot_id))
+        
+        return snapshot
+    
+    def load_snapshot(self, snapshot_id: str) -> Optional[Snapshot]:
+        path = self.snapshot_path(snapshot_id)
+        if not path.exists():
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return Snapshot.from_dict(json.load(f))
+    
+    def list_snapshots(self) -> List[Snapshot]:
+        """All snapshots, oldest first"""
+        if not self.snapshots_dir.exists():
+            return []
+        snapshots = [self.load_snapshot(p.stem) for p in self.snapshots_dir.glob("*.json")]
+        return sorted((s for s in snapshots if s), key=lambda s: (s.created, s.snapshot_id))
+    
+    # -- restore ----------------------------------------------------------
+    
+    def extract(self, snapshot: Snapshot, dest_root: Path, leader_name: Optional[str] = None) -> int:
+        """
+        Extract a snapshot (or one leader of it) under dest_root
+        
+        Returns:
+            Number of files written
+        """
+        prefix = f"{leader_name}/" if leader_name else ""
+        count = 0
+        for rel, entry in snapshot.files.items():
+            if not rel.startswith(prefix):
+                continue
+            self._write_entry(entry, dest_root / rel[len(prefix):])
+            count += 1
+        return count
+    
+    def restore_file(self, snapshot: Snapshot, rel_path: str, dest: Path) -> bool:
+        """Random-access restore of a single file"""
+        entry = snapshot.files.get(rel_path)
+        if entry is None:
+            return False
+        self._write_entry(entry, dest)
+        return True
+    
+    def _write_entry(self, entry: SnapshotEntry, dest: Path) -> None:
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        dest.write_bytes(self.get_object(entry.digest))
+        os.chmod(dest, entry.mode)
+    
+    # -- maintenance ------------------------------------------------------
+    
+    def prune(self, keep: int) -> Dict[str, int]:
+        """
+        Keep the newest `keep` snapshots of each leader, then collect unreferenced objects
+        
+        Snapshots are per leader, so counting across leaders would let a
+        busy leader push out the only backup of a quiet one. A snapshot
+        survives while it is among the newest `keep` of any leader it holds.
+        
+        Returns:
+            Stats: snapshots and objects removed, bytes freed
+        """
+        snapshots = self.list_snapshots()
+        by_leader: Dict[str, List[Snapshot]] = {}
+        for snapshot in snapshots:
+            for leader_name in snapshot.leaders or ['']:
+                by_leader.setdefault(leader_name, []).append(snapshot)
+        
+        kept = set()
+        if keep > 0:
+            for leader_snapshots in by_leader.values():
+                kept.update(s.snapshot_id for s in leader_snapshots[-keep:])
+        
+        doomed = [s for s in snapshots if s.snapshot_id not in kept]
+        for snapshot in doomed:
+            self.snapshot_path(snapshot.snapshot_id).unlink()
+        
+        live = {entry.digest for s in snapshots if s.snapshot_id in kept for entry in s.files.values()}
+        
+        removed_objects = 0
+        freed = 0
+        if self.objects_dir.exists():
+            for path in self.objects_dir.glob("*/*.xz"):
+                if path.name[:-3] not in live:
+                    freed += path.stat().st_size
+                    path.unlink()
+                    removed_objects += 1
+        
+        return {'snapshots': len(doomed), 'objects': removed_objects, 'bytes': freed}
+    
+    def verify(self) -> List[str]:
+        """Check every referenced object exists and matches its digest"""
+        errors = []
+        checked = {}
+        
+        for snapshot in self.list_snapshots():
+            for rel, entry in snapshot.files.items():
+                if entry.digest not in checked:
+                    checked[entry.digest] = self._verify_object(entry.digest)
+                problem = checked[entry.digest]
+                if problem:
+                    errors.append(f"{snapshot.snapshot_id}: {rel}: {problem}")
+        
+        return errors
+    
+    def _verify_object(self, digest: str) -> Optional[str]:
+        path = self.object_path(digest)
+        if not path.exists():
+            return "object missing"
+        try:
+            data = self.get_object(digest)
+        except lzma.LZMAError as e:
+            return f"object corrupt ({e})"
+        if hashlib.sha256(data).hexdigest() != digest:
+            return "digest mismatch"
+        return None
+    
+    def disk_usage(self) -> int:
+        """Bytes used by stored objects"""
+        if not self.objects_dir.exists():
+            return 0
+        return sum(p.stat().st_size for p in self.objects_dir.glob("*/*.xz"))
@@ -3,11 +3,21 @@
 Smart CSV Merger - Preserve custom user data during re-provisioning
 """
 
+import io
+import os
 import csv
+import json
+import heapq
+import hashlib
 from pathlib import Path
-from typing import List, Dict, Set, Tuple, Optional
+from typing import Iterator, List, Dict, Set, Tuple, Optional
 from dataclasses import dataclass
 
+from .memory import CSV_MEMORY_FACTOR, MB, MemoryBudget
+
+
+BASE_STORE_VERSION = 2
+
 
 @dataclass
 class CSVMergeResult:
@@ -17,6 +27,121 @@ class CSVMergeResult:
     preserved_rows: int
     updated_rows: int
     custom_rows: int
+    removed_rows: int = 0
+    three_way: bool = False
+    # Set when the merge streamed through disk; merged_rows is then empty
+    spilled_rows: Optional[int] = None
+    
+    @property
+    def total_rows(self) -> int:
+        return len(self.merged_rows) if self.spilled_rows is None else self.spilled_rows
+
+
+@dataclass
+class BaseRow:
+    """Digest of a previously generated row"""
+    row_digest: str
+    cell_digests: List[str]
+
+
+class CSVBaseStore:
+    """
+    Compact snapshot of the last generated rows (the merge base)
+    
+    Only digests are stored: one per row plus one short digest per cell,
+    so the sidecar stays a fraction of the CSV size. The row digest answers
+    "did this side change at all?" in O(1); cell digests are only consulted
+    when both the user and the template changed the same row.
+    """
+    
+    def __init__(self, csv_path: Path):
+        self.csv_path = csv_path
+        self.path = csv_path.with_name(f".{csv_path.name}.base")
+    
+    @staticmethod
+    def normalize(value: str) -> str:
+        """Normalize a cell the same way two-way comparison does (case is kept)"""
+        return value.strip()
+    
+    @classmethod
+    def cell_digest(cls, value: str) -> str:
+        return hashlib.blake2b(cls.normalize(value).encode('utf-8'), digest_size=4).hexdigest()
+    
+    @classmethod
+    def row_digest(cls, row: List[str]) -> str:
+        joined = '\x1f'.join(cls.normalize(v) for v in row)
+        return hashlib.blake2b(joined.encode('utf-8'), digest_size=8).hexdigest()
+    
+    def load(self) -> Optional[Dict[str, BaseRow]]:
+        """Load base rows keyed by primary key (None if no usable base)"""
+        packed = self.load_packed()
+        if packed is None:
+            return None
+        return {key: self.unpack(value) for key, value in packed.items()}
+    
+    def load_packed(self) -> Optional[Dict[str, str]]:
+        """
+        Load base rows as stored (see unpack()), None if no usable base
+        
+        A fraction of the memory of load() for large CSVs.
+        """
+        if not self.path.exists():
+            return None
+        
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return self._parse(f.read())
+        except OSError:
+            return None
+    
+    @classmethod
+    def loads(cls, text: str) -> Optional[Dict[str, BaseRow]]:
+        """Parse sidecar contents (None if unusable)"""
+        packed = cls._parse(text)
+        if packed is None:
+            return None
+        return {key: cls.unpack(value) for key, value in packed.items()}
+    
+    @staticmethod
+    def _parse(text: str) -> Optional[Dict[str, str]]:
+        try:
+            data = json.loads(text)
+        except ValueError:
+            return None
+        
+        if data.get('version') != BASE_STORE_VERSION:
+            return None
+        return data.get('rows', {})
+        
+    @staticmethod
+    def unpack(packed: str) -> BaseRow:
+        """BaseRow of a stored row: its row digest, then one digest per cell"""
+        digests = packed.split(' ')
+        return BaseRow(row_digest=digests[0], cell_digests=digests[1:])
+    
+    @classmethod
+    def _dump_chunks(cls, keyed_rows: Dict[str, List[str]]) -> Iterator[str]:
+        """Sidecar JSON piece by piece (compact json.dumps of version and rows)"""
+        yield f'{{"version":{BASE_STORE_VERSION},"rows":{{'
+        separator = ''
+        for key, row in keyed_rows.items():
+            packed = ' '.join([cls.row_digest(row)] + [cls.cell_digest(v) for v in row])
+            yield f"{separator}{json.dumps(key)}:{json.dumps(packed)}"
+            separator = ','
+        yield '}}'
+    
+    @classmethod
+    def dumps(cls, keyed_rows: Dict[str, List[str]]) -> str:
+        """Sidecar contents for the generated rows"""
+        return ''.join(cls._dump_chunks(keyed_rows))
+    
+    def save(self, keyed_rows: Dict[str, List[str]]) -> None:
+        """Store digests of the generated rows (streamed, never held as one string)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.writelines(self._dump_chunks(keyed_rows))
+        os.replace(tmp_path, self.path)
 
 
 class SmartCSVMerger:
@@ -54,39 +179,50 @@ class SmartCSVMerger:
             return headers, data_rows
     
     def write_csv(self, csv_path: Path, headers: List[str], rows: List[List[str]]) -> None:
-        """Write CSV file"""
+        """Write CSV file (replaced by rename, never rewritten in place)"""
         csv_path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+        tmp_path = csv_path.with_name(f".{csv_path.name}.tmp")
+        with open(tmp_path, 'w', newline='', encoding='utf-8') as f:
             writer = csv.writer(f)
             writer.writerow(headers)
             writer.writerows(rows)
+        os.replace(tmp_path, csv_path)
     
     def merge(
         self,
         csv_path: Path,
         new_rows: List[List[str]],
-        headers: Optional[List[str]] = None
+        headers: Optional[List[str]] = None,
+        budget: Optional[MemoryBudget] = None
     ) -> CSVMergeResult:
         """
         Merge new rows with existing CSV, preserving custom data
         
         Strategy:
-        1. Read existing CSV
-        2. Build key map of existing rows
-        3. Build key map of new rows
-        4. Preserve custom rows (keys not in new_rows)
-        5. Update existing rows with new data (preserve user modifications)
-        6. Add completely new rows
+        1. Read existing CSV and the stored base (last generated rows)
+        2. Build key maps of existing and new rows
+        3. Preserve custom rows (keys never generated by the template)
+        4. Three-way merge common rows per cell when a base is available,
+           otherwise keep any row the user appears to have modified
+        5. Add completely new rows
+        6. Store the new rows as base for the next merge
         
         Args:
             csv_path: Path to CSV file
             new_rows: New rows to merge (without headers)
             headers: Optional headers (will read from existing if not provided)
+            budget: Memory budget; when the existing CSV would not fit in it,
+                the merge streams through sorted runs on disk (merge_spilled)
         
         Returns:
             CSVMergeResult with statistics
         """
+        base_store = CSVBaseStore(csv_path)
+        if (budget is not None and csv_path.exists()
+                and not budget.fits(self.projected_footprint(csv_path, new_rows))):
+            return self.merge_spilled(csv_path, new_rows, headers, base_store, budget)
+        
         # Read existing CSV
         existing_headers, existing_rows = self.read_csv(csv_path)
         
@@ -97,6 +233,7 @@ class SmartCSVMerger:
             else:
                 # No headers available - just write new rows
                 self.write_csv(csv_path, [], new_rows)
+                base_store.save(self._build_key_map(new_rows))
                 return CSVMergeResult(
                     merged_rows=new_rows,
                     new_rows=len(new_rows),
@@ -105,6 +242,216 @@ class SmartCSVMerger:
                     custom_rows=0
                 )
         
+        # A base only makes sense if there is something to merge against
+        base = base_store.load() if existing_rows else None
+        
+        result = self.merge_rows(existing_rows, new_rows, base)
+        
+        # Write merged CSV and remember what the template generated
+        self.write_csv(csv_path, headers, result.merged_rows)
+        base_store.save(self._build_key_map(new_rows))
+        
+        return result
+    
+    @staticmethod
+    def projected_footprint(csv_path: Path, new_rows: List[List[str]]) -> int:
+        """Bytes an in-memory merge of csv_path with new_rows is expected to hold"""
+        try:
+            existing = csv_path.stat().st_size
+        except OSError:
+            existing = 0
+        generated = sum(len(cell) for row in new_rows for cell in row)
+        return (existing + generated) * CSV_MEMORY_FACTOR
+    
+    def merge_spilled(
+        self,
+        csv_path: Path,
+        new_rows: List[List[str]],
+        headers: Optional[List[str]],
+        base_store: CSVBaseStore,
+        budget: MemoryBudget
+    ) -> CSVMergeResult:
+        """
+        merge() for CSVs too big to hold in memory
+        
+        The existing CSV is read once, row by row. Its rows are split into
+        custom rows (key not generated) and common rows, and each kind is
+        sorted in runs that fit the budget and spilled next to the CSV (not
+        to /tmp, which is often memory-backed in containers). The runs are
+        then merged back in key order straight into the output, so only the
+        generated rows, their keys and one row per run are held. Rows, order
+        and statistics are the same as merge_rows().
+        """
+        import tempfile
+        
+        new_map = self._build_key_map(new_rows)
+        # A quarter of what is left, for the run being sorted
+        run_bytes = max(MB, budget.available() // (4 * CSV_MEMORY_FACTOR))
+        
+        with tempfile.TemporaryDirectory(prefix=f".{csv_path.name}.", dir=csv_path.parent) as spill_dir:
+            spill_dir = Path(spill_dir)
+            runs = {'custom': [], 'common': []}
+            pending = {'custom': [], 'common': []}
+            pending_bytes = 0
+            seen_rows = 0
+            
+            def spill() -> None:
+                for kind, rows in pending.items():
+                    if not rows:
+                        continue
+                    rows.sort(key=lambda item: (item[0], item[1]))
+                    run_path = spill_dir / f"{kind}-{len(runs[kind])}.csv"
+                    with open(run_path, 'w', newline='', encoding='utf-8') as f:
+                        writer = csv.writer(f)
+                        for key, seq, row in rows:
+                            writer.writerow([key, seq] + row)
+                    runs[kind].append(run_path)
+                    rows.clear()
+            
+            with open(csv_path, 'r', newline='', encoding='utf-8') as f:
+                reader = csv.reader(f)
+                existing_headers = next(reader, [])
+                for seq, row in enumerate(reader):
+                    if not row or len(row) <= self.primary_key_column:
+                        continue
+                    key = row[self.primary_key_column].strip().lower()
+                    if not key:
+                        continue
+                    pending['common' if key in new_map else 'custom'].append((key, seq, row))
+                    seen_rows += 1
+                    pending_bytes += sum(len(cell) for cell in row)
+                    if pending_bytes >= run_bytes:
+                        spill()
+                        pending_bytes = 0
+            spill()
+            
+            if headers is None:
+                headers = existing_headers
+            # As in merge(): a base only makes sense if there is something to merge against
+            base = base_store.load_packed() if seen_rows else None
+            stats = {'new': 0, 'preserved': 0, 'updated': 0, 'custom': 0, 'removed': 0}
+            total = 0
+            # Generated keys not in the CSV, found by walking both in key order
+            new_keys = sorted(new_map)
+            fresh_keys = []
+            next_new = 0
+            
+            tmp_path = csv_path.with_name(f".{csv_path.name}.merged")
+            with open(tmp_path, 'w', newline='', encoding='utf-8') as out:
+                writer = csv.writer(out)
+                writer.writerow(headers)
+                
+                for key, existing_row in self._merge_runs(runs['custom']):
+                    if base is not None and key in base:
+                        if CSVBaseStore.row_digest(existing_row) == CSVBaseStore.unpack(base[key]).row_digest:
+                            stats['removed'] += 1
+                            continue
+                    writer.writerow(existing_row)
+                    stats['custom'] += 1
+                    total += 1
+                
+                for key, existing_row in self._merge_runs(runs['common']):
+                    while new_keys[next_new] != key:
+                        fresh_keys.append(new_keys[next_new])
+                        next_new += 1
+                    next_new += 1
+                    new_row = new_map[key]
+                    if base is not None and key in base:
+                        merged_row = self._three_way_merge(existing_row, new_row, CSVBaseStore.unpack(base[key]))
+                    elif self._has_user_modifications(existing_row, new_row):
+                        merged_row = existing_row
+                    else:
+                        merged_row = new_row
+                    stats['updated' if merged_row is new_row else 'preserved'] += 1
+                    writer.writerow(merged_row)
+                    total += 1
+                
+                fresh_keys.extend(new_keys[next_new:])
+                for key in fresh_keys:
+                    writer.writerow(new_map[key])
+                    stats['new'] += 1
+                    total += 1
+            os.replace(tmp_path, csv_path)
+        
+        base_store.save(new_map)
+        return CSVMergeResult(
+            merged_rows=[],
+            new_rows=stats['new'],
+            preserved_rows=stats['preserved'],
+            updated_rows=stats['updated'],
+            custom_rows=stats['custom'],
+            removed_rows=stats['removed'],
+            three_way=base is not None,
+            spilled_rows=total
+        )
+    
+    @staticmethod
+    def _merge_runs(run_paths: List[Path]) -> Iterator[Tuple[str, List[str]]]:
+        """(key, row) in key order from sorted runs; the last row of a duplicated key wins"""
+        files = [open(path, 'r', newline='', encoding='utf-8') for path in run_paths]
+        try:
+            streams = [
+                ((row[0], int(row[1]), row[2:]) for row in csv.reader(f))
+                for f in files
+            ]
+            last = None
+            for item in heapq.merge(*streams, key=lambda item: (item[0], item[1])):
+                if last is not None and item[0] != last[0]:
+                    yield last[0], last[2]
+                last = item
+            if last is not None:
+                yield last[0], last[2]
+        finally:
+            for f in files:
+                f.close()
+    
+    def merge_text(
+        self,
+        existing_csv: Optional[str],
+        base_text: Optional[str],
+        new_rows: List[List[str]],
+        headers: List[str]
+    ) -> Tuple[str, str, CSVMergeResult]:
+        """
+        merge() on file contents instead of files (for archive outputs)
+        
+        Args:
+            existing_csv: Current CSV text, or None if there is none
+            base_text: Its .base sidecar text, or None
+            new_rows: New rows to merge (without headers)
+            headers: Headers to write
+        
+        Returns:
+            (merged CSV text, new sidecar text, CSVMergeResult)
+        """
+        existing_rows = list(csv.reader(io.StringIO(existing_csv, newline='')))[1:] if existing_csv else []
+        base = CSVBaseStore.loads(base_text) if existing_rows and base_text else None
+        
+        result = self.merge_rows(existing_rows, new_rows, base)
+        
+        out = io.StringIO(newline='')
+        writer = csv.writer(out)
+        writer.writerow(headers)
+        writer.writerows(result.merged_rows)
+        return out.getvalue(), CSVBaseStore.dumps(self._build_key_map(new_rows)), result
+    
+    def merge_rows(
+        self,
+        existing_rows: List[List[str]],
+        new_rows: List[List[str]],
+        base: Optional[Dict[str, BaseRow]] = None
+    ) -> CSVMergeResult:
+        """
+        Merge rows in memory (no I/O)
+        
+        Args:
+            existing_rows: Rows currently on disk (user side)
+            new_rows: Rows generated by the template
+            base: Digests of the previously generated rows, enables three-way merge
+        
+        Returns:
+            CSVMergeResult with statistics
+        """
         # Build key maps
         existing_map = self._build_key_map(existing_rows)
         new_map = self._build_key_map(new_rows)
@@ -123,20 +470,38 @@ class SmartCSVMerger:
             'new': 0,
             'preserved': 0,
             'updated': 0,
-            'custom': 0
+            'custom': 0,
+            'removed': 0
         }
         
         # Add custom rows first (user-added, not in template)
         for key in sorted(custom_keys):
-            merged_rows.append(existing_map[key])
+            existing_row = existing_map[key]
+            
+            # Generated previously, dropped by the template and never edited
+            if base is not None and key in base:
+                if CSVBaseStore.row_digest(existing_row) == base[key].row_digest:
+                    stats['removed'] += 1
+                    continue
+            
+            merged_rows.append(existing_row)
             stats['custom'] += 1
         
-        # Add common rows (prefer existing to preserve user edits)
+        # Add common rows
         for key in sorted(common_keys):
             existing_row = existing_map[key]
             new_row = new_map[key]
             
-            # Check if user modified any non-key columns
+            if base is not None and key in base:
+                merged_row = self._three_way_merge(existing_row, new_row, base[key])
+                if merged_row is new_row:
+                    stats['updated'] += 1
+                else:
+                    stats['preserved'] += 1
+                merged_rows.append(merged_row)
+                continue
+            
+            # No base: check if user modified any non-key columns
             user_modified = self._has_user_modifications(existing_row, new_row)
             
             if user_modified:
@@ -153,17 +518,48 @@ class SmartCSVMerger:
             merged_rows.append(new_map[key])
             stats['new'] += 1
         
-        # Write merged CSV
-        self.write_csv(csv_path, headers, merged_rows)
-        
         return CSVMergeResult(
             merged_rows=merged_rows,
             new_rows=stats['new'],
             preserved_rows=stats['preserved'],
             updated_rows=stats['updated'],
-            custom_rows=stats['custom']
+            custom_rows=stats['custom'],
+            removed_rows=stats['removed'],
+            three_way=base is not None
         )
     
+    def _three_way_merge(self, existing_row: List[str], new_row: List[str], base_row: BaseRow) -> List[str]:
+        """
+        Merge one row per cell: user edits win, template changes propagate
+        
+        Returns new_row itself when the user did not touch the row.
+        """
+        # User never edited the row: take the template as-is
+        if CSVBaseStore.row_digest(existing_row) == base_row.row_digest:
+            return new_row
+        
+        # Template unchanged since last run: keep the user's row
+        if CSVBaseStore.row_digest(new_row) == base_row.row_digest:
+            return existing_row
+        
+        # Both sides changed: decide cell by cell
+        merged = []
+        for i in range(max(len(existing_row), len(new_row))):
+            user_val = existing_row[i] if i < len(existing_row) else None
+            template_val = new_row[i] if i < len(new_row) else None
+            base_digest = base_row.cell_digests[i] if i < len(base_row.cell_digests) else None
+            
+            if user_val is None:
+                merged.append(template_val)
+            elif template_val is None:
+                merged.append(user_val)
+            elif base_digest is None or CSVBaseStore.cell_digest(user_val) != base_digest:
+                merged.append(user_val)
+            else:
+                merged.append(template_val)
+        
+        return merged
+    
     def _build_key_map(self, rows: List[List[str]]) -> Dict[str, List[str]]:
         """Build map of primary key -> row"""
         key_map = {}
@@ -191,11 +587,8 @@ class SmartCSVMerger:
             if i == self.primary_key_column:
                 continue
             
-            # Normalize for comparison
-            existing_normalized = existing_val.strip().upper()
-            new_normalized = new_val.strip().upper()
-            
-            if existing_normalized != new_normalized:
+            # Surrounding whitespace is not an edit, a change of case is
+            if existing_val.strip() != new_val.strip():
                 return True
         
         return False
@@ -206,7 +599,8 @@ def merge_csv_safely(
     new_rows: List[List[str]],
     headers: Optional[List[str]] = None,
     primary_key_column: int = 0,
-    verbose: bool = False
+    verbose: bool = False,
+    budget: Optional[MemoryBudget] = None
 ) -> CSVMergeResult:
     """
     Convenience function for safe CSV merging
@@ -217,12 +611,13 @@ def merge_csv_safely(
         headers: Optional headers
         primary_key_column: Column to use as key
         verbose: Print merge statistics
+        budget: Memory budget that switches large merges to disk
     
     Returns:
         CSVMergeResult
     """
     merger = SmartCSVMerger(primary_key_column=primary_key_column)
-    result = merger.merge(csv_path, new_rows, headers)
+    result = merger.merge(csv_path, new_rows, headers, budget=budget)
     
     if verbose:
         print(f"📊 CSV Merge Results for {csv_path.name}:")
@@ -230,6 +625,10 @@ def merge_csv_safely(
         print(f"   🔄 Updated rows: {result.updated_rows}")
         print(f"   💾 Preserved rows: {result.preserved_rows}")
         print(f"   ⭐ Custom rows: {result.custom_rows}")
-        print(f"   📋 Total rows: {len(result.merged_rows)}")
+        if result.removed_rows:
+            print(f"   🗑️  Removed rows: {result.removed_rows}")
+        print(f"   📋 Total rows: {result.total_rows}")
+        if result.spilled_rows is not None:
+            print(f"   💽 Merged on disk to stay within the memory budget")
     
     return result
\ No newline at end of file
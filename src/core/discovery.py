@@ -0,0 +1,152 @@
+"""
+Project Discovery - Find BMAD installations across a workspace
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple
+import yaml
+
+
+# Directories never worth descending into
+PRUNED_DIRS = {
+    'node_modules', '.git', '.hg', '.svn', '__pycache__',
+    '.venv', 'venv', 'venv-bp', '.tox', '.nox', '.mypy_cache', '.pytest_cache',
+}
+
+
+@dataclass
+class DiscoveredProject:
+    """A BMAD installation found on disk"""
+    root: Path
+    bmad_version: Optional[str]
+    modules: Dict[str, str] = field(default_factory=dict)
+    leaders: List[str] = field(default_factory=list)
+    
+    def to_dict(self) -> dict:
+        return {
+            'root': str(self.root),
+            'bmad_version': self.bmad_version,
+            'modules': self.modules,
+            'custom_skills': self.leaders
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'DiscoveredProject':
+        return cls(
+            root=Path(data['root']).expanduser(),
+            bmad_version=data.get('bmad_version'),
+            modules=data.get('modules', {}),
+            leaders=data.get('custom_skills', [])
+        )
+
+
+class ProjectDiscovery:
+    """Walk a directory tree in parallel looking for _bmad/_config/manifest.yaml"""
+    
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+    
+    @staticmethod
+    def _is_pruned(entry: os.DirEntry) -> bool:
+        if entry.name in PRUNED_DIRS:
+            return True
+        # Virtualenvs with custom names
+        return os.path.exists(os.path.join(entry.path, 'pyvenv.cfg'))
+    
+    def _scan_dir(self, path: str) -> Tuple[List[str], bool]:
+        """List subdirectories to visit and whether path holds a BMAD install"""
+        subdirs = []
+        has_bmad = False
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if not entry.is_dir(follow_symlinks=False):
+                        continue
+                    if entry.name == '_bmad':
+                        has_bmad = os.path.isfile(os.path.join(entry.path, '_config', 'manifest.yaml'))
+                        continue
+                    if not self._is_pruned(entry):
+                        subdirs.append(entry.path)
+        except OSError:
+            pass
+        return subdirs, has_bmad
+    
+    def find_roots(self, root: Path) -> List[Path]:
+        """Return every directory containing a BMAD installation"""
+        found = []
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            pending = {pool.submit(self._scan_dir, str(root)): str(root)}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path = pending.pop(future)
+                    subdirs, has_bmad = future.result()
+                    if has_bmad:
+                        found.append(Path(path))
+                    for subdir in subdirs:
+                        pending[pool.submit(self._scan_dir, subdir)] = subdir
+        
+        return sorted(found)
+    
+    @staticmethod
+    def inspect(project_root: Path) -> DiscoveredProject:
+        """Read version, modules and installed leaders of a BMAD project"""
+        bmad_root = project_root / "_bmad"
+        version = None
+        modules = {}
+        
+        try:
+            with open(bmad_root / "_config" / "manifest.yaml", 'r') as f:
+                data = yaml.safe_load(f)
+        except (OSError, yaml.YAMLError):
+            data = None
+        
+        # Anything unexpected leaves the version unknown instead of aborting discovery
+        if isinstance(data, dict):
+            installation = data.get('installation')
+            if isinstance(installation, dict) and isinstance(installation.get('version'), (str, int, float)):
+                version = str(installation['version'])
+            if isinstance(data.get('modules'), list):
+                modules = {
+                    str(m['name']): m.get('version')
+                    for m in data['modules'] if isinstance(m, dict) and 'name' in m
+                }
+        
+        leaders = []
+        custom_skills = bmad_root / "custom-skills"
+        if custom_skills.is_dir():
+            leaders = sorted(
+                p.name for p in custom_skills.iterdir()
+                if p.is_dir() and not p.name.startswith(('.', '_'))
+            )
+        
+        return DiscoveredProject(root=project_root, bmad_version=version, modules=modules, leaders=leaders)
+    
+    def discover(self, root: Path) -> List[DiscoveredProject]:
+        """Find and inspect every BMAD project under root"""
+        roots = self.find_roots(root)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return list(pool.map(self.inspect, roots))
+
+
+def write_inventory(projects: List[DiscoveredProject], path: Optional[Path] = None) -> str:
+    """Serialize discovered projects as a YAML inventory (written to path if given)"""
+    content = yaml.safe_dump(
+        {'projects': [p.to_dict() for p in projects]},
+        default_flow_style=False,
+        sort_keys=False
+    )
+    if path is not None:
+        path.write_text(content)
+    return content
+
+
+def load_inventory(path: Path) -> List[DiscoveredProject]:
+    """Load an inventory written by write_inventory()"""
+    with open(path, 'r') as f:
+        data = yaml.safe_load(f) or {}
+    return [DiscoveredProject.from_dict(p) for p in data.get('projects', [])]
@@ -2,11 +2,14 @@
 Generator - Integrate with bmad-skill-generator to actually provision skills
 """
 
-import subprocess
+import os
+import json
 from pathlib import Path
 from typing import List, Dict, Optional
 import shutil
-from .csv_merger import merge_csv_safely
+from .backup_store import BackupArchive
+from .memory import GENERATOR_PROCESS_BYTES, MB, track
+from .scheduler import ProvisionGraph, LEADER, WORKFLOW
 
 class SkillGenerator:
     """Generate skills using bmad-skill-generator"""
@@ -15,16 +18,49 @@ class SkillGenerator:
         self.generator_script = generator_script
         self.project_root = project_root
         self.output_dir = project_root / "_bmad" / "custom-skills"
+        self.integrations_dir = self.output_dir / "_integrations"
+        self.workflow_results: Dict[str, Optional[bool]] = {}
+        self._generator_module = None
+        # Optional KnowledgeIndex; when set, each leader gets per-specialist references
+        self.knowledge = None
+        self.knowledge_top = 5
+        # Optional RenderCache shared across projects
+        self.render_cache = None
+        self._generator_digest = None
+        # Optional TarOutput; when set, nothing is written under project_root
+        self.tar_output = None
+        # Optional store of rendered specialists shared by every leader
+        self.shared_specialists: Optional[Path] = None
+        # Optional MemoryTracker (per-leader and CSV merge memory) and
+        # MemoryBudget (fewer concurrent leaders, CSV merges through disk)
+        self.memory = None
+        self.memory_budget = None
+        self._workers = 1
     
     def ensure_output_dir(self):
         """Ensure custom-skills directory exists"""
         self.output_dir.mkdir(parents=True, exist_ok=True)
     
+    def _write_output(self, path: Path, content: str) -> None:
+        """Write a generated file to disk, or to the tar output"""
+        if self.tar_output is not None:
+            self.tar_output.submit(path, content.encode('utf-8'))
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        tmp_path.write_text(content, encoding='utf-8')
+        os.replace(tmp_path, path)
+    
     def generate_leader(self, leader_config, domain: str = 'generic') -> bool:
-        """Generate a single leader skill"""
-        print(f"🔨 Generating {leader_config.name}...")
-        
-        # Build specialists arguments
+        """Generate a single leader skill (from the render cache when enabled)"""
+        if self.tar_output is not None:
+            return self._render_to_tar(leader_config, domain)
+        if self.render_cache is None:
+            return self._render(leader_config, domain, self.output_dir)
+        return self._generate_cached(leader_config, domain)
+    
+    def _command(self, leader_config, domain: str, output_dir: Path) -> List[str]:
+        """Generator script command line for one leader"""
         specialists_args = []
         for spec in leader_config.specialists:
             # Format: id:name:domain:skills
@@ -32,16 +68,43 @@ class SkillGenerator:
             spec_arg = f"{spec.id}:{spec.name}:{spec.domain}:{skills_str}"
             specialists_args.append(spec_arg)
         
-        # Build command
         cmd = [
             'python3',
             str(self.generator_script),
             leader_config.name,
-            '--output', str(self.output_dir),
+            '--output', str(output_dir),
             '--domain', domain,
-            '--phase', leader_config.phase,
-            '--specialists'
-        ] + specialists_args
+            '--phase', leader_config.phase
+        ]
+        if self.shared_specialists is not None:
+            cmd += ['--shared-specialists', str(self.shared_specialists)]
+        if self.memory_budget is not None:
+            # Each concurrent generator gets an equal share of what is left
+            share = self.memory_budget.available() // self._workers
+            cmd += ['--memory-budget', str(max(1, share // MB))]
+        if self.memory is not None:
+            cmd.append('--memory-report')
+        return cmd + ['--specialists'] + specialists_args
+    
+    def _record_process_peak(self, leader_name: str, output: str) -> None:
+        """Pick up the peak memory line printed by --memory-report"""
+        if self.memory is None:
+            return
+        for line in output.splitlines():
+            if line.startswith('📈 Peak memory: '):
+                self.memory.record_process_peak(leader_name, int(line.split()[3]))
+    
+    def _render(self, leader_config, domain: str, output_dir: Path, shown_dir: Optional[Path] = None) -> bool:
+        """
+        Run the generator script for one leader into output_dir
+        
+        shown_dir replaces output_dir in the echoed messages when output_dir
+        is a scratch directory the files are copied out of.
+        """
+        import subprocess
+        
+        print(f"🔨 Generating {leader_config.name}...")
+        cmd = self._command(leader_config, domain, output_dir)
         
         try:
             result = subprocess.run(
@@ -52,10 +115,13 @@ class SkillGenerator:
             )
             
             print(f"✅ Generated {leader_config.name}")
+            self._record_process_peak(leader_config.name, result.stdout)
             if result.stdout:
                 # Show key output lines
                 for line in result.stdout.split('\n'):
-                    if '✅' in line or '📦' in line:
+                    if '✅' in line or '📦' in line or '♻️' in line or '💽' in line:
+                        if shown_dir is not None:
+                            line = line.replace(str(output_dir), str(shown_dir))
                         print(f"   {line}")
             
             return True
@@ -65,13 +131,121 @@ class SkillGenerator:
             print(f"   Error: {e.stderr}")
             return False
     
+    def _render_to_tar(self, leader_config, domain: str) -> bool:
+        """Run the generator script for one leader with its output piped into the tar output"""
+        import io
+        import subprocess
+        
+        print(f"🔨 Generating {leader_config.name}...")
+        cmd = self._command(leader_config, domain, self.output_dir) + ['--tar', '-']
+        
+        try:
+            result = subprocess.run(cmd, capture_output=True, check=True)
+            prefix = self.output_dir.relative_to(self.project_root).as_posix()
+            count = self.tar_output.add_stream(prefix, io.BytesIO(result.stdout))
+            # Messages went to stderr
+            self._record_process_peak(leader_config.name, result.stderr.decode('utf-8', errors='replace'))
+        except subprocess.CalledProcessError as e:
+            print(f"❌ Failed to generate {leader_config.name}")
+            print(f"   Error: {e.stderr.decode('utf-8', errors='replace')}")
+            return False
+        
+        print(f"✅ Generated {leader_config.name} ({count} files streamed)")
+        return True
+    
+    @property
+    def generator_digest(self) -> str:
+        """Content hash of the generator script (its version, for cache keys)"""
+        if self._generator_digest is None:
+            from .render_cache import file_digest
+            self._generator_digest = file_digest(self.generator_script)
+        return self._generator_digest
+    
+    def _generate_cached(self, leader_config, domain: str) -> bool:
+        """Materialize a leader from the render cache, rendering it on a miss"""
+        import tempfile
+        from .render_cache import RenderCache
+        
+        key = RenderCache.key(leader_config, domain, self.generator_digest)
+        files = self.render_cache.get(key)
+        
+        if files is None:
+            # Render into a scratch directory so only generated files are cached
+            staging_root = self.render_cache.cache_dir / "staging"
+            staging_root.mkdir(parents=True, exist_ok=True)
+            staging = Path(tempfile.mkdtemp(prefix=f"{leader_config.name}-", dir=staging_root))
+            try:
+                if not self._render(leader_config, domain, staging, shown_dir=self.output_dir):
+                    return False
+                files = self.render_cache.put(key, staging / leader_config.name)
+            finally:
+                shutil.rmtree(staging, ignore_errors=True)
+        else:
+            print(f"♻️  {leader_config.name} served from render cache ({len(files)} files)")
+        
+        try:
+            self._materialize(leader_config.name, files)
+        except FileNotFoundError:
+            # Another provisioner sharing the cache evicted the objects after get() verified them
+            print(f"⚠️  {leader_config.name} was evicted from the render cache, rendering it")
+            return self._render(leader_config, domain, self.output_dir)
+        return True
+    
+    def _materialize(self, leader_name: str, files: Dict[str, list]) -> None:
+        """
+        Copy cached files into the leader; CSVs are merged
+        
+        As in a direct render, files of units whose fingerprint is unchanged
+        are left alone (user edits survive), and the render state goes last.
+        """
+        import csv
+        import io
+        from .render_cache import RENDER_STATE
+        
+        target_dir = self.output_dir / leader_name
+        kept = self._unchanged_unit_files(target_dir, files)
+        for rel in sorted(files):
+            if rel == RENDER_STATE or rel in kept:
+                continue
+            if rel.endswith('.csv'):
+                rows = list(csv.reader(io.StringIO(self.render_cache.read(files, rel), newline='')))
+                if rows:
+                    self.generate_csv_with_merge(target_dir / rel, rows[0], rows[1:], verbose=False)
+                    continue
+            self.render_cache.materialize(files, target_dir, rel)
+        if RENDER_STATE in files:
+            self.render_cache.materialize(files, target_dir, RENDER_STATE)
+    
+    def _unchanged_unit_files(self, target_dir: Path, files: Dict[str, list]) -> set:
+        """Files of cached units the leader already has, rendered from the same inputs"""
+        from .render_cache import RENDER_STATE
+        
+        if RENDER_STATE not in files:
+            return set()
+        try:
+            with open(target_dir / RENDER_STATE, 'r', encoding='utf-8') as f:
+                current = json.load(f)
+        except (OSError, ValueError):
+            return set()
+        cached = json.loads(self.render_cache.read(files, RENDER_STATE))
+        if current.get('format') != cached.get('format'):
+            return set()
+        
+        kept = set()
+        for unit, entry in cached.get('units', {}).items():
+            previous = current.get('units', {}).get(unit)
+            if (
+                previous and previous['fingerprint'] == entry['fingerprint']
+                and all((target_dir / rel).exists() for rel in entry['files'])
+            ):
+                kept.update(entry['files'])
+        return kept
+    
     def generate_customize_file(self, leader_name: str, customization) -> bool:
         """Generate _config/agents/*.customize.yaml file"""
         print(f"🔧 Creating customize file for {leader_name}...")
         
         config_dir = self.project_root / "_bmad" / "_config" / "agents"
-        config_dir.mkdir(parents=True, exist_ok=True)
-        
         customize_file = config_dir / f"custom-{leader_name}.customize.yaml"
         
         # Build YAML content
@@ -98,7 +272,7 @@ class SkillGenerator:
             content.append("")
         
         if content:
-            customize_file.write_text('\n'.join(content))
+            self._write_output(customize_file, '\n'.join(content))
             print(f"✅ Created {customize_file.name}")
             return True
         
@@ -126,14 +300,18 @@ class SkillGenerator:
         try:
             from .csv_merger import merge_csv_safely
             
-            result = merge_csv_safely(
-                csv_path=csv_path,
-                new_rows=rows,
-                headers=headers,
-                primary_key_column=0,
-                verbose=verbose
-            )
+            with track(self.memory, 'csv merge'):
+                result = merge_csv_safely(
+                    csv_path=csv_path,
+                    new_rows=rows,
+                    headers=headers,
+                    primary_key_column=0,
+                    verbose=verbose,
+                    budget=self.memory_budget
+                )
             
+            if result.spilled_rows is not None and not verbose:
+                print(f"   💽 {csv_path.name} merged on disk to stay within the memory budget")
             if verbose and (result.custom_rows > 0 or result.preserved_rows > 0):
                 print(f"   🔄 Smart merge preserved {result.custom_rows} custom rows + {result.preserved_rows} user modifications")
             
@@ -141,32 +319,127 @@ class SkillGenerator:
         except Exception as e:
             print(f"   ⚠️  CSV merge failed: {e}")
             # Fallback: write directly
-            csv_path.parent.mkdir(parents=True, exist_ok=True)
-            import csv
-            with open(csv_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(headers)
-                writer.writerows(rows)
+            from .csv_merger import SmartCSVMerger
+            SmartCSVMerger().write_csv(csv_path, headers, rows)
             return True    
     ######""
-    def generate_all(self, manifest) -> Dict[str, bool]:
-        """Generate all leaders from manifest"""
-        self.ensure_output_dir()
+    def load_generator_module(self):
+        """Import the generator script in-process (for helpers not exposed on its CLI)"""
+        if self._generator_module is None:
+            import importlib.util
+            spec = importlib.util.spec_from_file_location("init_bmad_skill", self.generator_script)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            self._generator_module = module
+        return self._generator_module
+    
+    def generate_integration_workflow(self, integration) -> bool:
+        """Generate a cross-leader workflow under custom-skills/_integrations"""
+        print(f"🔗 Generating cross-leader workflow {integration.name}...")
+        try:
+            module = self.load_generator_module()
+            workflow_path = module.generate_cross_leader_workflow(
+                self.integrations_dir, integration.name, integration.sequence, phase=integration.phase
+            )
+        except Exception as e:
+            print(f"❌ Failed to generate workflow {integration.name}")
+            print(f"   Error: {e}")
+            return False
         
-        results = {}
+        print(f"✅ Generated {workflow_path.name}")
+        return True
+    
+    def _run_node(self, node, manifest) -> bool:
+        """Execute one scheduler node"""
+        if node.kind == WORKFLOW:
+            return self.generate_integration_workflow(node.payload)
         
-        for leader in manifest.project.leaders:
-            # Generate leader skill
-            success = self.generate_leader(leader, leader.domain)
-            results[leader.name] = success
-            
-            if not success:
-                continue
+        leader = node.payload
+        with track(self.memory, leader.name, leader=True):
+            if not self.generate_leader(leader, leader.domain):
+                return False
             
             # Generate customize file if customizations exist
             if leader.name in manifest.project.customizations:
                 customization = manifest.project.customizations[leader.name]
                 self.generate_customize_file(leader.name, customization)
+            
+            if self.knowledge is not None:
+                self.generate_knowledge_references(leader)
+        return True
+    
+    def generate_knowledge_references(self, leader) -> None:
+        """Write references/knowledge-<specialist>.md for each specialist of a leader"""
+        references_dir = self.output_dir / leader.name / "references"
+        for spec in leader.specialists:
+            content = self.knowledge.specialist_references(leader.name, spec, self.knowledge_top)
+            self._write_output(references_dir / f"knowledge-{spec.id}.md", content)
+        print(f"📚 Attached knowledge references for {len(leader.specialists)} specialist(s) of {leader.name}")
+    
+    def generate_all(
+        self,
+        manifest,
+        stop_on_failure: bool = False,
+        leaders: Optional[List] = None,
+        max_workers: Optional[int] = None
+    ) -> Dict[str, bool]:
+        """
+        Generate leaders and cross-leader workflows from manifest
+        
+        Independent leaders run concurrently; a leader waits for its
+        depends_on leaders, and each integration workflow is emitted as
+        soon as its participating leaders are done. Anything downstream
+        of a failed leader is skipped.
+        
+        Args:
+            manifest: Skills manifest
+            stop_on_failure: Start nothing new after the first failure
+            leaders: Subset of manifest leaders to generate (default: all)
+            max_workers: Concurrent generations (default: min(4, CPUs)); one
+                while tracking memory, and as many generator processes as
+                fit in the memory budget
+        
+        Returns:
+            Leader name -> success for every leader that ran (skipped leaders
+            are absent); integration results are in self.workflow_results
+        """
+        if self.tar_output is None:
+            self.ensure_output_dir()
+        else:
+            # Integration workflows are rendered in-process
+            self.load_generator_module().set_sink(self.tar_output)
+        
+        if self.memory is not None:
+            # One leader at a time, so each leader's numbers are its own
+            max_workers = 1
+        elif self.memory_budget is not None:
+            wanted = max_workers or min(4, os.cpu_count() or 1)
+            max_workers = self.memory_budget.workers(GENERATOR_PROCESS_BYTES, wanted)
+            if max_workers < wanted:
+                print(f"💽 Memory budget: {max_workers} leader(s) at a time")
+        self._workers = max_workers or 1
+        
+        graph = ProvisionGraph.from_manifest(manifest, leaders)
+        try:
+            node_results = graph.run(
+                lambda node: self._run_node(node, manifest),
+                max_workers=max_workers,
+                stop_on_failure=stop_on_failure
+            )
+        finally:
+            if self.tar_output is not None:
+                self.load_generator_module().set_sink(None)
+        
+        # Keep manifest order for the summary
+        results = {}
+        self.workflow_results = {}
+        for key, node in graph.nodes.items():
+            outcome = node_results.get(key)
+            if node.kind == LEADER:
+                if outcome is not None:
+                    results[node.name] = outcome
+            else:
+                self.workflow_results[node.name] = outcome
         
         return results
 
@@ -177,41 +450,314 @@ class SkillBackup:
     def __init__(self, project_root: Path):
         self.project_root = project_root
         self.backup_dir = project_root / "_bmad" / ".backups"
+        self.custom_skills = project_root / "_bmad" / "custom-skills"
+        self.archive = BackupArchive(self.backup_dir)
+        # Live next to the backups so moves stay on the same filesystem
+        self.trash_dir = self.backup_dir / ".trash"
+        self.staging_dir = self.backup_dir / ".staging"
+        self._purge_thread = None
     
-    def backup_skills(self) -> Optional[Path]:
-        """Backup existing custom-skills directory"""
-        custom_skills = self.project_root / "_bmad" / "custom-skills"
+    def backup_skills(self, leaders: Optional[List[str]] = None) -> Optional[Path]:
+        """
+        Backup existing custom-skills directory into the compressed archive
+        
+        Args:
+            leaders: Only snapshot these leader directories (default: whole tree)
+        
+        Returns:
+            Path to the snapshot index, or None if there was nothing to back up
+        """
+        custom_skills = self.custom_skills
         
         if not custom_skills.exists():
             return None
         
-        # Create backup with timestamp
-        import datetime
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_path = self.backup_dir / f"custom-skills_{timestamp}"
+        # Leftovers from an interrupted purge
+        self.purge_trash()
         
-        self.backup_dir.mkdir(parents=True, exist_ok=True)
+        if leaders is None:
+            leaders = sorted(p.name for p in custom_skills.iterdir() if p.is_dir())
+        
+        # Leaders without a directory yet have nothing to snapshot
+        present = [name for name in leaders if (custom_skills / name).is_dir()]
         
-        print(f"💾 Backing up existing skills to {backup_path.name}...")
-        shutil.copytree(custom_skills, backup_path)
-        print(f"✅ Backup created")
+        print(f"💾 Backing up {len(present)} leader(s)...")
+        snapshot = self.archive.create_snapshot(custom_skills, present)
+        self._index_snapshot(snapshot.snapshot_id, present)
+        print(f"✅ Backup created: {snapshot.snapshot_id} ({len(snapshot.files)} files)")
         
-        return backup_path
+        return self.archive.snapshot_path(snapshot.snapshot_id)
     
-    def restore_backup(self, backup_path: Path) -> bool:
-        """Restore from backup"""
+    def latest_snapshot(self, leader_name: str) -> Optional[Path]:
+        """Most recent snapshot holding a leader (index lookup, no scan)"""
+        snapshots = self._load_index()['leaders'].get(leader_name, [])
+        for name in reversed(snapshots):
+            archived = self.archive.snapshot_path(name)
+            if archived.exists():
+                return archived
+            legacy = self.backup_dir / name
+            if (legacy / leader_name).exists():
+                return legacy
+        return None
+    
+    def restore_backup(self, backup_path: Path, leaders: Optional[List[str]] = None) -> bool:
+        """
+        Restore from backup by directory swap
+        
+        The broken tree is renamed into .backups/.trash and deleted in the
+        background, then the restored tree is renamed into place. Archived
+        snapshots are first extracted into .backups/.staging; legacy
+        directory snapshots are renamed directly and consumed.
+        
+        Args:
+            backup_path: Snapshot created by backup_skills() (or a legacy directory)
+            leaders: Only restore these leader directories (default: every
+                leader held by the snapshot, or the whole tree for legacy snapshots)
+        """
         if not backup_path.exists():
             print(f"❌ Backup not found: {backup_path}")
             return False
         
-        custom_skills = self.project_root / "_bmad" / "custom-skills"
+        if backup_path.is_file():
+            return self._restore_archived(backup_path, leaders)
+        
+        if leaders is None:
+            # Per-leader snapshots only restore the leaders they hold
+            indexed = self._load_index()['snapshots'].get(backup_path.name)
+            if indexed is not None:
+                leaders = list(indexed['leaders'])
+        
+        if leaders is None:
+            self._swap_in(backup_path, self.custom_skills)
+            self._unindex(backup_path.name)
+            print(f"✅ Restored from {backup_path.name}")
+        else:
+            for leader_name in leaders:
+                source = backup_path / leader_name
+                target = self.custom_skills / leader_name
+                
+                if source.exists():
+                    self._swap_in(source, target)
+                    print(f"✅ Restored {leader_name} from {backup_path.name}")
+                elif target.exists():
+                    # Leader did not exist before provisioning: drop the partial output
+                    self._move_to_trash(target)
+                    print(f"✅ Removed partially generated {leader_name}")
+            self._unindex(backup_path.name, leaders)
+        
+        self.purge_trash(background=True)
+        return True
+    
+    def _restore_archived(self, snapshot_path: Path, leaders: Optional[List[str]]) -> bool:
+        """
+        Extract leaders from an archived snapshot and swap them in
+        
+        Extraction decompresses every file of the leader, so this takes time
+        proportional to the leader's size; only the final swap is a rename.
+        """
+        import uuid
+        snapshot = self.archive.load_snapshot(snapshot_path.stem)
+        if snapshot is None:
+            print(f"❌ Backup not found: {snapshot_path}")
+            return False
+        if leaders is None:
+            leaders = list(snapshot.leaders)
+        
+        for leader_name in leaders:
+            target = self.custom_skills / leader_name
+            
+            if leader_name not in snapshot.leaders:
+                if target.exists():
+                    # Leader did not exist before provisioning: drop the partial output
+                    self._move_to_trash(target)
+                    print(f"✅ Removed partially generated {leader_name}")
+                continue
+            
+            staged = self.staging_dir / f"{leader_name}_{uuid.uuid4().hex[:8]}"
+            self.archive.extract(snapshot, staged, leader_name)
+            self._swap_in(staged, target)
+            print(f"✅ Restored {leader_name} from {snapshot.snapshot_id}")
+        self._unindex(snapshot.snapshot_id, leaders)
         
-        # Remove current
-        if custom_skills.exists():
-            shutil.rmtree(custom_skills)
+        self.purge_trash(background=True)
+        return True
+    
+    def restore_leaders(self, leaders: List[str]) -> bool:
+        """Restore each leader from its most recent snapshot"""
+        restored = True
+        for leader_name in leaders:
+            snapshot = self.latest_snapshot(leader_name)
+            if snapshot is None:
+                print(f"⚠️  No backup found for {leader_name}")
+                restored = False
+                continue
+            restored = self.restore_backup(snapshot, leaders=[leader_name]) and restored
+        return restored
+    
+    def restore_file(self, snapshot_id: str, rel_path: str, dest: Optional[Path] = None) -> bool:
+        """Restore a single file (path relative to custom-skills) from an archived snapshot"""
+        snapshot = self.archive.load_snapshot(snapshot_id)
+        if snapshot is None:
+            print(f"❌ Backup not found: {snapshot_id}")
+            return False
         
-        # Restore backup
-        shutil.copytree(backup_path, custom_skills)
-        print(f"✅ Restored from {backup_path.name}")
+        dest = dest or self.custom_skills / rel_path
+        if not self.archive.restore_file(snapshot, rel_path, dest):
+            print(f"❌ {rel_path} not in {snapshot_id}")
+            return False
         
+        print(f"✅ Restored {rel_path} from {snapshot_id}")
         return True
+    
+    def legacy_backups(self) -> List[Path]:
+        """Uncompressed custom-skills_<timestamp> directories, oldest first"""
+        if not self.backup_dir.exists():
+            return []
+        return sorted(p for p in self.backup_dir.glob("custom-skills_*") if p.is_dir())
+    
+    def list_backups(self) -> None:
+        """Print archived and legacy snapshots"""
+        snapshots = self.archive.list_snapshots()
+        legacy = self.legacy_backups()
+        
+        if not snapshots and not legacy:
+            print("No backups found")
+            return
+        
+        for snapshot in snapshots:
+            print(f"📦 {snapshot.snapshot_id}: {len(snapshot.leaders)} leader(s), "
+                  f"{len(snapshot.files)} files, {snapshot.total_size} bytes")
+            for leader_name in snapshot.leaders:
+                print(f"   - {leader_name}")
+        
+        for path in legacy:
+            print(f"📁 {path.name}: legacy directory backup")
+        
+        print(f"\nArchive size on disk: {self.archive.disk_usage()} bytes")
+    
+    def prune_backups(self, keep: int) -> None:
+        """Keep the newest `keep` archived snapshots per leader and `keep` legacy directories"""
+        stats = self.archive.prune(keep)
+        
+        legacy = self.legacy_backups()
+        doomed = legacy[:-keep] if keep > 0 else legacy
+        for path in doomed:
+            shutil.rmtree(path)
+        
+        # Drop index entries for snapshots that no longer exist
+        index = self._load_index()
+        for name in list(index['snapshots']):
+            if not self.archive.snapshot_path(name).exists() and not (self.backup_dir / name).exists():
+                self._unindex(name)
+        
+        print(f"🗑️  Pruned {stats['snapshots']} archived + {len(doomed)} legacy snapshot(s), "
+              f"{stats['objects']} objects ({stats['bytes']} bytes)")
+    
+    def verify_backups(self) -> bool:
+        """Check archive integrity"""
+        errors = self.archive.verify()
+        if errors:
+            print("❌ Backup verification failed:")
+            for error in errors:
+                print(f"   - {error}")
+            return False
+        
+        print(f"✅ {len(self.archive.list_snapshots())} snapshot(s) verified")
+        return True
+    
+    @property
+    def index_path(self) -> Path:
+        return self.backup_dir / "index.json"
+    
+    def _load_index(self) -> Dict:
+        """Load the per-leader snapshot index"""
+        if self.index_path.exists():
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                pass
+        return {'snapshots': {}, 'leaders': {}}
+    
+    def _save_index(self, index: Dict) -> None:
+        self.backup_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.index_path)
+    
+    def _index_snapshot(self, snapshot_name: str, leaders: List[str]) -> None:
+        """Record which leaders a snapshot holds"""
+        index = self._load_index()
+        index['snapshots'][snapshot_name] = {'leaders': leaders}
+        for leader_name in leaders:
+            index['leaders'].setdefault(leader_name, []).append(snapshot_name)
+        self._save_index(index)
+    
+    def _unindex(self, snapshot_name: str, leaders: Optional[List[str]] = None) -> None:
+        """Forget leaders consumed by a restore"""
+        index = self._load_index()
+        snapshot = index['snapshots'].get(snapshot_name)
+        if snapshot is None:
+            return
+        
+        consumed = snapshot['leaders'] if leaders is None else leaders
+        for leader_name in consumed:
+            names = index['leaders'].get(leader_name, [])
+            if snapshot_name in names:
+                names.remove(snapshot_name)
+            if not names:
+                index['leaders'].pop(leader_name, None)
+        
+        snapshot['leaders'] = [l for l in snapshot['leaders'] if l not in consumed]
+        if not snapshot['leaders']:
+            del index['snapshots'][snapshot_name]
+        self._save_index(index)
+    
+    def _move_to_trash(self, path: Path) -> Path:
+        """Move a tree aside for deferred deletion"""
+        import uuid
+        self.trash_dir.mkdir(parents=True, exist_ok=True)
+        trashed = self.trash_dir / f"{path.name}_{uuid.uuid4().hex[:8]}"
+        os.replace(path, trashed)
+        return trashed
+    
+    def _swap_in(self, source: Path, target: Path) -> None:
+        """Replace target with source using renames only"""
+        trashed = self._move_to_trash(target) if target.exists() else None
+        target.parent.mkdir(parents=True, exist_ok=True)
+        
+        try:
+            os.replace(source, target)
+        except OSError:
+            # Put the previous tree back rather than leaving a hole
+            if trashed is not None:
+                os.replace(trashed, target)
+            raise
+    
+    def purge_trash(self, background: bool = False) -> None:
+        """
+        Delete trees moved aside by restore
+        
+        A background purge runs on a daemon thread, which dies with the
+        interpreter: callers must wait_for_purge() before exiting or the
+        trash is left behind.
+        """
+        if not self.trash_dir.exists():
+            return
+        
+        if background:
+            import threading
+            self.wait_for_purge()
+            self._purge_thread = threading.Thread(target=self.purge_trash, daemon=True)
+            self._purge_thread.start()
+            return
+        
+        for entry in list(self.trash_dir.iterdir()):
+            shutil.rmtree(entry, ignore_errors=True)
+    
+    def wait_for_purge(self) -> None:
+        """Block until a background purge_trash() has finished"""
+        if self._purge_thread is not None:
+            self._purge_thread.join()
+            self._purge_thread = None
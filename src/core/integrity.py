@@ -0,0 +1,188 @@
+"""
+Integrity Verifier - Check the BMAD installation against _config/files-manifest.csv
+"""
+
+import os
+import csv
+import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple
+
+from .render_cache import project_cache_dir
+
+
+# Not part of the upstream install, or written by the provisioner itself
+IGNORED_PATHS = {'_config/files-manifest.csv'}
+IGNORED_PREFIXES = ('_config/agents/custom-',)
+
+
+@dataclass
+class ModuleIntegrity:
+    """Verification result for one BMAD module"""
+    module: str
+    verified: int = 0
+    missing: List[str] = field(default_factory=list)
+    modified: List[str] = field(default_factory=list)
+    extra: List[str] = field(default_factory=list)
+    
+    @property
+    def is_intact(self) -> bool:
+        return not self.missing and not self.modified
+
+
+@dataclass
+class IntegrityReport:
+    """Verification result for the whole installation"""
+    modules: Dict[str, ModuleIntegrity]
+    hashed: int
+    cached: int
+    
+    @property
+    def is_intact(self) -> bool:
+        return all(m.is_intact for m in self.modules.values())
+    
+    def summary(self) -> str:
+        """Generate human-readable summary"""
+        lines = ["🔐 Integrity Report", "=" * 50, ""]
+        
+        for name in sorted(self.modules):
+            module = self.modules[name]
+            status = "✅" if module.is_intact else "❌"
+            lines.append(
+                f"{status} {name}: {module.verified} ok, {len(module.missing)} missing, "
+                f"{len(module.modified)} modified, {len(module.extra)} extra"
+            )
+            for path in module.missing:
+                lines.append(f"   ❌ missing: {path}")
+            for path in module.modified:
+                lines.append(f"   ⚠️  modified: {path}")
+            for path in module.extra:
+                lines.append(f"   📦 extra: {path}")
+        
+        lines.append("")
+        lines.append(f"Hashed {self.hashed} file(s), {self.cached} unchanged per stat cache")
+        return "\n".join(lines)
+
+
+class IntegrityVerifier:
+    """Re-hash installed BMAD files in parallel, reusing hashes of unchanged files"""
+    
+    CACHE_VERSION = 1
+    
+    def __init__(self, project_root: Path, max_workers: Optional[int] = None):
+        self.bmad_root = project_root / "_bmad"
+        self.files_manifest = self.bmad_root / "_config" / "files-manifest.csv"
+        self.cache_path = project_cache_dir(project_root) / "stat-cache.json"
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) * 2)
+    
+    def load_manifest(self) -> Dict[str, Tuple[str, str]]:
+        """Map relative path -> (module, sha256) from files-manifest.csv"""
+        expected = {}
+        with open(self.files_manifest, 'r', newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                expected[row['path']] = (row['module'], row['hash'])
+        return expected
+    
+    def _load_cache(self) -> Dict[str, list]:
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data.get('files', {}) if data.get('version') == self.CACHE_VERSION else {}
+    
+    def _save_cache(self, entries: Dict[str, list]) -> None:
+        """Best effort: an unwritable cache only costs re-hashing next time"""
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': self.CACHE_VERSION, 'files': entries}, f, separators=(',', ':'))
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            pass
+    
+    @staticmethod
+    def hash_file(path: Path) -> str:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    def current_hashes(self, rel_paths: List[str]) -> Tuple[Dict[str, Optional[str]], int, int]:
+        """
+        Hash files, skipping those whose (size, mtime, inode) match the stat cache
+        
+        Returns:
+            (relative path -> sha256 or None if missing, files hashed, cache hits)
+        """
+        cache = self._load_cache()
+        hashes = {}
+        stats = {}
+        to_hash = []
+        
+        for rel in rel_paths:
+            try:
+                st = os.stat(self.bmad_root / rel)
+            except OSError:
+                hashes[rel] = None
+                continue
+            key = [st.st_size, st.st_mtime_ns, st.st_ino]
+            stats[rel] = key
+            cached = cache.get(rel)
+            if cached is not None and cached[:3] == key:
+                hashes[rel] = cached[3]
+            else:
+                to_hash.append(rel)
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for rel, digest in zip(to_hash, pool.map(lambda r: self.hash_file(self.bmad_root / r), to_hash)):
+                hashes[rel] = digest
+        
+        self._save_cache({rel: stats[rel] + [hashes[rel]] for rel in stats})
+        return hashes, len(to_hash), len(stats) - len(to_hash)
+    
+    def find_extra(self, expected: Dict[str, Tuple[str, str]]) -> Dict[str, List[str]]:
+        """Files under each module directory that the manifest does not list"""
+        extra = {}
+        for module in sorted({module for module, _ in expected.values()}):
+            module_root = self.bmad_root / module
+            if not module_root.is_dir():
+                continue
+            for dirpath, dirnames, filenames in os.walk(module_root):
+                dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+                for filename in filenames:
+                    rel = (Path(dirpath) / filename).relative_to(self.bmad_root).as_posix()
+                    if rel in expected or rel in IGNORED_PATHS or rel.startswith(IGNORED_PREFIXES):
+                        continue
+                    extra.setdefault(module, []).append(rel)
+        return extra
+    
+    def verify(self) -> IntegrityReport:
+        """Compare installed files with files-manifest.csv"""
+        expected = self.load_manifest()
+        hashes, hashed, cached = self.current_hashes(sorted(expected))
+        
+        modules = {}
+        for rel, (module, expected_hash) in expected.items():
+            status = modules.setdefault(module, ModuleIntegrity(module=module))
+            actual = hashes.get(rel)
+            if actual is None:
+                status.missing.append(rel)
+            elif actual != expected_hash:
+                status.modified.append(rel)
+            else:
+                status.verified += 1
+        
+        for module, paths in self.find_extra(expected).items():
+            modules.setdefault(module, ModuleIntegrity(module=module)).extra.extend(sorted(paths))
+        
+        for status in modules.values():
+            status.missing.sort()
+            status.modified.sort()
+        
+        return IntegrityReport(modules=modules, hashed=hashed, cached=cached)
@@ -0,0 +1,296 @@
+"""
+Knowledge Index - BM25 search over BMAD markdown for specialist references
+"""
+
+import os
+import re
+import json
+import math
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple
+
+from .integrity import IntegrityVerifier
+from .render_cache import project_cache_dir
+
+
+TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#]*')
+HEADING_RE = re.compile(r'^(#{1,3})\s+(.+?)\s*#*\s*$')
+
+STOPWORDS = frozenset("""
+a an and are as at be been but by can do does for from has have if in into is it its
+may must no not of on or our should so such that the their them then there these they
+this to was we were what when which while who will with you your all any each use using
+""".split())
+
+# Directories under _bmad that are not BMAD knowledge
+SKIPPED_DIRS = {'custom-skills', '_memory'}
+
+# Fragments shorter than this are headings without content
+MIN_FRAGMENT_TOKENS = 8
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in TOKEN_RE.findall(text.lower()) if len(t) > 1 and t not in STOPWORDS]
+
+
+def split_fragments(text: str) -> List[Tuple[str, int, int, str]]:
+    """
+    Split markdown into sections at level 1-3 headings (outside code fences)
+    
+    Returns:
+        [(heading, start line, end line, section text)] with 1-based inclusive lines
+    """
+    lines = text.splitlines()
+    fragments = []
+    heading, start = '', 1
+    in_fence = False
+    
+    for i, line in enumerate(lines, 1):
+        if line.lstrip().startswith(('```', '~~~')):
+            in_fence = not in_fence
+            continue
+        match = None if in_fence else HEADING_RE.match(line)
+        if match and i > start:
+            fragments.append((heading, start, i - 1, "\n".join(lines[start - 1:i - 1])))
+            heading, start = match.group(2), i
+        elif match:
+            heading = match.group(2)
+    
+    if start <= len(lines):
+        fragments.append((heading, start, len(lines), "\n".join(lines[start - 1:])))
+    return fragments
+
+
+@dataclass
+class Fragment:
+    """A section of a BMAD markdown document"""
+    path: str
+    heading: str
+    start_line: int
+    end_line: int
+    length: int
+    terms: Dict[str, int] = field(default_factory=dict)
+    
+    def to_dict(self) -> dict:
+        return {
+            'heading': self.heading,
+            'lines': [self.start_line, self.end_line],
+            'length': self.length,
+            'terms': self.terms
+        }
+    
+    @classmethod
+    def from_dict(cls, path: str, data: dict) -> 'Fragment':
+        return cls(
+            path=path,
+            heading=data['heading'],
+            start_line=data['lines'][0],
+            end_line=data['lines'][1],
+            length=data['length'],
+            terms=data['terms']
+        )
+
+
+@dataclass
+class KnowledgeHit:
+    """A fragment scored for a query"""
+    fragment: Fragment
+    score: float
+    matched: List[str]
+
+
+class KnowledgeIndex:
+    """
+    Inverted index over _bmad/**/*.md, persisted in the per-project user cache
+    (project_cache_dir()/knowledge-index.json), outside the project
+    
+    Documents listed in files-manifest.csv are keyed by their manifest hash, others
+    by size and mtime, so update() only re-tokenizes documents that changed.
+    """
+    
+    INDEX_VERSION = 1
+    
+    def __init__(self, project_root: Path):
+        self.bmad_root = project_root / "_bmad"
+        self.index_path = project_cache_dir(project_root) / "knowledge-index.json"
+        self.bmad_version: Optional[str] = None
+        self.documents: Dict[str, dict] = {}
+        self._postings: Optional[Dict[str, List[Tuple[int, int]]]] = None
+        self._fragments: List[Fragment] = []
+    
+    def _document_keys(self) -> Dict[str, str]:
+        """Relative path -> content key for every indexable markdown file"""
+        verifier = IntegrityVerifier(self.bmad_root.parent)
+        manifest = verifier.load_manifest() if verifier.files_manifest.exists() else {}
+        
+        keys = {}
+        for dirpath, dirnames, filenames in os.walk(self.bmad_root):
+            rel_dir = Path(dirpath).relative_to(self.bmad_root)
+            dirnames[:] = [
+                d for d in dirnames
+                if not d.startswith('.') and not (rel_dir == Path('.') and d in SKIPPED_DIRS)
+            ]
+            for filename in filenames:
+                if not filename.endswith('.md'):
+                    continue
+                rel = (rel_dir / filename).as_posix()
+                if rel in manifest:
+                    keys[rel] = manifest[rel][1]
+                else:
+                    st = os.stat(os.path.join(dirpath, filename))
+                    keys[rel] = f"stat:{st.st_size}:{st.st_mtime_ns}"
+        return keys
+    
+    def load(self) -> bool:
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get('version') != self.INDEX_VERSION:
+            return False
+        self.bmad_version = data.get('bmad_version')
+        self.documents = data.get('documents', {})
+        self._postings = None
+        return True
+    
+    def save(self) -> None:
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(
+                {'version': self.INDEX_VERSION, 'bmad_version': self.bmad_version, 'documents': self.documents},
+                f, separators=(',', ':')
+            )
+        os.replace(tmp_path, self.index_path)
+    
+    def _index_document(self, rel: str) -> List[dict]:
+        text = (self.bmad_root / rel).read_text(encoding='utf-8', errors='replace')
+        fragments = []
+        for heading, start, end, body in split_fragments(text):
+            tokens = tokenize(body)
+            if len(tokens) < MIN_FRAGMENT_TOKENS:
+                continue
+            fragments.append(Fragment(
+                path=rel, heading=heading, start_line=start, end_line=end,
+                length=len(tokens), terms=dict(Counter(tokens))
+            ).to_dict())
+        return fragments
+    
+    def update(self, bmad_version: Optional[str] = None) -> Tuple[int, int, int]:
+        """
+        Bring the index up to date with the install
+        
+        Returns:
+            (documents indexed, re-tokenized, removed)
+        """
+        self.load()
+        keys = self._document_keys()
+        
+        removed = [rel for rel in self.documents if rel not in keys]
+        for rel in removed:
+            del self.documents[rel]
+        
+        changed = [rel for rel, key in keys.items() if self.documents.get(rel, {}).get('key') != key]
+        for rel in changed:
+            self.documents[rel] = {'key': keys[rel], 'fragments': self._index_document(rel)}
+        
+        if changed or removed or bmad_version != self.bmad_version:
+            self.bmad_version = bmad_version
+            self.save()
+        # Build postings now so concurrent searches only read them
+        self._build_postings()
+        return len(keys), len(changed), len(removed)
+    
+    def _build_postings(self) -> None:
+        """Invert the stored per-fragment term counts"""
+        self._fragments = []
+        self._postings = {}
+        for rel in sorted(self.documents):
+            for data in self.documents[rel]['fragments']:
+                fragment_id = len(self._fragments)
+                self._fragments.append(Fragment.from_dict(rel, data))
+                for term, count in data['terms'].items():
+                    self._postings.setdefault(term, []).append((fragment_id, count))
+    
+    def search(self, query: str, top_k: int = 5, per_document: int = 1) -> List[KnowledgeHit]:
+        """BM25-rank fragments for a free-text query"""
+        if self._postings is None:
+            self._build_postings()
+        if not self._fragments:
+            return []
+        
+        total = len(self._fragments)
+        avg_length = sum(f.length for f in self._fragments) / total
+        scores: Dict[int, float] = {}
+        matched: Dict[int, List[str]] = {}
+        
+        for term in dict.fromkeys(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for fragment_id, tf in postings:
+                length = self._fragments[fragment_id].length
+                norm = tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length))
+                scores[fragment_id] = scores.get(fragment_id, 0.0) + idf * norm
+                matched.setdefault(fragment_id, []).append(term)
+        
+        hits = []
+        per_path: Dict[str, int] = {}
+        for fragment_id in sorted(scores, key=lambda i: (-scores[i], i)):
+            fragment = self._fragments[fragment_id]
+            if per_path.get(fragment.path, 0) >= per_document:
+                continue
+            per_path[fragment.path] = per_path.get(fragment.path, 0) + 1
+            hits.append(KnowledgeHit(fragment=fragment, score=scores[fragment_id], matched=matched[fragment_id]))
+            if len(hits) >= top_k:
+                break
+        return hits
+    
+    def excerpt(self, fragment: Fragment, max_chars: int = 400) -> str:
+        """First lines of a fragment's body (without its heading)"""
+        try:
+            lines = (self.bmad_root / fragment.path).read_text(encoding='utf-8', errors='replace').splitlines()
+        except OSError:
+            return ''
+        body = [l for l in lines[fragment.start_line - 1:fragment.end_line] if l.strip()]
+        if body and HEADING_RE.match(body[0]):
+            body = body[1:]
+        text = " ".join(" ".join(body).split())
+        return text if len(text) <= max_chars else text[:max_chars].rsplit(' ', 1)[0] + " …"
+    
+    def specialist_references(self, leader_name: str, specialist, top_k: int = 5) -> str:
+        """Markdown listing the fragments most relevant to a specialist's domain and skills"""
+        query = " ".join([specialist.name, specialist.domain] + list(specialist.skills))
+        hits = self.search(query, top_k)
+        
+        lines = [
+            f"# Knowledge References - {specialist.name}",
+            "",
+            f"BMAD knowledge most relevant to **{specialist.domain}** "
+            f"({', '.join(specialist.skills)}), selected for `{leader_name}`.",
+            ""
+        ]
+        if not hits:
+            lines.append("_No matching BMAD knowledge found._")
+        for rank, hit in enumerate(hits, 1):
+            fragment = hit.fragment
+            title = fragment.heading or Path(fragment.path).stem
+            lines.append(f"## {rank}. {title}")
+            lines.append("")
+            lines.append(
+                f"`{{project-root}}/_bmad/{fragment.path}` (lines {fragment.start_line}-{fragment.end_line}) "
+                f"- score {hit.score:.2f}, matched: {', '.join(hit.matched)}"
+            )
+            excerpt = self.excerpt(fragment)
+            if excerpt:
+                lines.append("")
+                lines.append(f"> {excerpt}")
+            lines.append("")
+        return "\n".join(lines).rstrip() + "\n"
@@ -0,0 +1,576 @@
+"""
+Manifest Validator - Check a whole skills manifest in one pass, with positions
+"""
+
+import csv
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import yaml
+from yaml.events import (
+    AliasEvent, MappingEndEvent, MappingStartEvent,
+    ScalarEvent, SequenceEndEvent, SequenceStartEvent
+)
+
+from models.manifest import YAML_LOADER, leader_shard_paths
+
+
+NULLS = frozenset(('', '~', 'null', 'Null', 'NULL'))
+
+SPECIALIST_FIELDS = {'id', 'name', 'domain', 'skills', 'compliance_notes'}
+SPECIALIST_REQUIRED = ('id', 'name', 'domain', 'skills')
+SPECIALIST_REQUIRED_SET = frozenset(SPECIALIST_REQUIRED)
+MENU_FIELDS = ('trigger', 'workflow', 'description')
+WORKFLOW_FIELDS = ('phase', 'name', 'sequence')
+
+Mark = Tuple[str, int, int]
+
+
+@dataclass
+class ValidationIssue:
+    """One problem found in a manifest (line and column are 1-based)"""
+    path: str
+    line: int
+    column: int
+    message: str
+    severity: str = 'error'
+    
+    def __str__(self) -> str:
+        prefix = "warning: " if self.severity == 'warning' else ""
+        return f"{self.path}:{self.line}:{self.column}: {prefix}{self.message}"
+
+
+class ManifestError(ValueError):
+    """A manifest that cannot be loaded, with every issue found in it"""
+    
+    def __init__(self, issues: List[ValidationIssue]):
+        self.issues = issues
+        errors = [issue for issue in issues if issue.severity == 'error']
+        super().__init__(
+            f"{len(errors)} manifest error(s):\n" + "\n".join(f"   - {issue}" for issue in errors)
+        )
+
+
+class ManifestValidator:
+    """
+    Validate a manifest (and its leader shards) from the YAML event stream
+    
+    The document is read once, without building Python objects, and every
+    structural problem is collected with its position instead of stopping at
+    the first one. Names are recorded in hash indexes as they are seen, and
+    cross-references (customizations and integrations naming unknown leaders,
+    depends_on, specialist_library refs, triggers colliding with each other or
+    with BMAD's workflow-manifest.csv) are resolved once the stream ends.
+    Values behind YAML aliases are not inspected.
+    """
+    
+    def __init__(self, project_root: Optional[Path] = None):
+        self.project_root = project_root
+        self.issues: List[ValidationIssue] = []
+        self._path = ""
+        self._next = None
+        # Cross-reference indexes, filled while walking
+        self.leaders: Dict[str, Mark] = {}
+        self.library: Dict[str, Tuple[Mark, Optional[str]]] = {}
+        self.library_refs: List[Tuple[str, Mark]] = []
+        self.library_fields: Dict[str, set] = {}
+        self.depends_on: Dict[str, List[Tuple[str, Mark]]] = {}
+        self.dependency_refs: List[Tuple[str, str, Mark]] = []
+        self.customized: List[Tuple[str, Mark]] = []
+        self.integration_steps: List[Tuple[str, str, Mark]] = []
+        self.triggers: Dict[str, Tuple[str, Mark]] = {}
+        self.root: Optional[Tuple[str, Mark]] = None
+        self.has_leaders = False
+        self._shard_patterns: List[Tuple[str, Mark]] = []
+    
+    # -- reporting ---------------------------------------------------------
+    
+    def _at(self, event) -> Mark:
+        mark = event.start_mark
+        return (self._path, mark.line + 1, mark.column + 1)
+    
+    def error(self, mark: Mark, message: str, severity: str = 'error') -> None:
+        self.issues.append(ValidationIssue(mark[0], mark[1], mark[2], message, severity))
+    
+    @property
+    def errors(self) -> List[ValidationIssue]:
+        return [issue for issue in self.issues if issue.severity == 'error']
+    
+    # -- event helpers -----------------------------------------------------
+    
+    def _skip(self, event) -> None:
+        """Consume the rest of a node whose start event was already read"""
+        if type(event) is not MappingStartEvent and type(event) is not SequenceStartEvent:
+            return
+        depth = 1
+        get = self._next
+        while depth:
+            kind = type(get())
+            if kind is MappingStartEvent or kind is SequenceStartEvent:
+                depth += 1
+            elif kind is MappingEndEvent or kind is SequenceEndEvent:
+                depth -= 1
+    
+    def _items(self, event, what: str):
+        """Yield (key, key event, value event) of a mapping; reports non-mappings"""
+        if type(event) is not MappingStartEvent:
+            if type(event) is not AliasEvent:
+                self.error(self._at(event), f"{what} must be a mapping")
+                self._skip(event)
+            return
+        get = self._next
+        while True:
+            key = get()
+            if type(key) is MappingEndEvent:
+                return
+            if type(key) is not ScalarEvent:
+                # The key's own events come before its value
+                self.error(self._at(key), f"{what} keys must be plain names")
+                self._skip(key)
+                self._skip(get())
+                continue
+            yield key.value, key, get()
+    
+    def _entries(self, event, what: str):
+        """Yield the item events of a sequence; reports non-sequences"""
+        if type(event) is not SequenceStartEvent:
+            if type(event) is not AliasEvent:
+                self.error(self._at(event), f"{what} must be a list")
+                self._skip(event)
+            return
+        get = self._next
+        while True:
+            item = get()
+            if type(item) is SequenceEndEvent:
+                return
+            yield item
+    
+    def _scalar(self, event, what: str, required: bool = True) -> Optional[str]:
+        """Value of a scalar node (None, reported, if it is not one)"""
+        kind = type(event)
+        if kind is ScalarEvent:
+            # Plain scalars have no style: None from PyYAML, '' from libyaml
+            if event.implicit[0] and not event.style and event.value in NULLS:
+                if required:
+                    self.error(self._at(event), f"{what} must not be empty")
+                return None
+            return event.value
+        if kind is not AliasEvent:
+            self.error(self._at(event), f"{what} must be a single value")
+            self._skip(event)
+        return None
+    
+    def _scalars(self, event, what: str) -> List[Tuple[str, Mark]]:
+        """(value, mark) of each entry of a list of scalars"""
+        if type(event) is not SequenceStartEvent:
+            for _ in self._entries(event, what):
+                pass
+            return []
+        get = self._next
+        values = []
+        while True:
+            item = get()
+            kind = type(item)
+            if kind is SequenceEndEvent:
+                return values
+            if kind is ScalarEvent and (item.style or not item.implicit[0] or item.value not in NULLS):
+                values.append((item.value, self._at(item)))
+            else:
+                self._scalar(item, f"each entry of {what}")
+    
+    def _check_scalars(self, event, what: str) -> None:
+        """Check a list of scalars whose values are not needed (nothing is kept)"""
+        if type(event) is not SequenceStartEvent:
+            for _ in self._entries(event, what):
+                pass
+            return
+        # Hot path (skills of every specialist): a plain entry costs one class
+        # check and one set lookup; marks are only built for reported entries
+        get = self._next
+        while True:
+            item = get()
+            if item.__class__ is ScalarEvent:
+                if item.value not in NULLS or item.style or not item.implicit[0]:
+                    continue
+            elif item.__class__ is SequenceEndEvent:
+                return
+            self._scalar(item, f"each entry of {what}")
+    
+    def _unknown(self, key: str, key_event, value, what: str) -> None:
+        self.error(self._at(key_event), f"Unknown field '{key}' in {what}", severity='warning')
+        self._skip(value)
+    
+    def _missing(self, seen, required, mark: Mark, what: str) -> None:
+        if '<<' in seen:
+            # Merged from an alias: fields may come from there
+            return
+        for name in required:
+            if name not in seen:
+                self.error(mark, f"{what} is missing '{name}'")
+    
+    # -- schema ------------------------------------------------------------
+    
+    def _document(self, event) -> None:
+        seen = set()
+        for key, key_event, value in self._items(event, "The manifest"):
+            seen.add(key)
+            if key == 'project':
+                self._project(value, self._at(key_event))
+            else:
+                self._unknown(key, key_event, value, "the manifest")
+        if 'project' not in seen:
+            self.error(self._at(event), "The manifest has no 'project' section")
+    
+    def _project(self, event, project_mark: Mark) -> None:
+        seen = set()
+        for key, key_event, value in self._items(event, "project"):
+            seen.add(key)
+            if key in ('name', 'bmad_version'):
+                self._scalar(value, f"project.{key}")
+            elif key == 'root':
+                root = self._scalar(value, "project.root")
+                if root is not None:
+                    self.root = (root, self._at(value))
+            elif key == 'leaders':
+                for item in self._entries(value, "project.leaders"):
+                    self.has_leaders = True
+                    self._leader(item)
+            elif key == 'leader_files':
+                self._shard_patterns = self._scalars(value, "project.leader_files")
+            elif key == 'specialist_library':
+                for name, name_event, entry in self._items(value, "specialist_library"):
+                    self._library_entry(name, self._at(name_event), entry)
+            elif key == 'customizations':
+                for leader, leader_event, entry in self._items(value, "customizations"):
+                    self.customized.append((leader, self._at(leader_event)))
+                    self._customization(entry, f"customizations.{leader}")
+            elif key == 'integration':
+                for sub, sub_event, sub_value in self._items(value, "integration"):
+                    if sub == 'workflows':
+                        for item in self._entries(sub_value, "integration.workflows"):
+                            self._workflow(item)
+                    else:
+                        self._unknown(sub, sub_event, sub_value, "integration")
+            else:
+                self._unknown(key, key_event, value, "project")
+        self._missing(seen, ('name', 'bmad_version', 'root'), project_mark, "project")
+    
+    def _leader(self, event, shard_name: Optional[str] = None) -> None:
+        start = self._at(event)
+        name = shard_name
+        name_mark = start
+        seen = set()
+        # id -> start event of the first specialist with it (marks built on error only)
+        specialist_ids: Dict[str, object] = {}
+        depends: List[Tuple[str, Mark]] = []
+        for key, key_event, value in self._items(event, "A leader"):
+            seen.add(key)
+            if key == 'name':
+                value_name = self._scalar(value, "leader name")
+                name_mark = self._at(value)
+                if shard_name is not None and value_name is not None and value_name != shard_name:
+                    self.error(name_mark, f"Leader '{value_name}' must be in {value_name}.yaml")
+                name = value_name if value_name is not None else name
+            elif key in ('domain', 'phase'):
+                self._scalar(value, f"leader {key}")
+            elif key == 'specialists':
+                for item in self._entries(value, "specialists"):
+                    spec_id = self._specialist(item)
+                    if spec_id is None:
+                        continue
+                    if spec_id in specialist_ids:
+                        first = specialist_ids[spec_id].start_mark.line + 1
+                        self.error(self._at(item), f"Duplicate specialist id '{spec_id}' (first at line {first})")
+                    else:
+                        specialist_ids[spec_id] = item
+            elif key == 'depends_on':
+                depends = self._scalars(value, "depends_on")
+            elif key == 'customization' and shard_name is not None:
+                self._customization(value, f"customization of {shard_name}")
+            else:
+                self._unknown(key, key_event, value, "leader")
+        
+        required = ('domain', 'specialists') if shard_name is not None else ('name', 'domain', 'specialists')
+        if not seen.issuperset(required):
+            self._missing(seen, required, start, f"Leader {name or ''}".rstrip())
+        if name is None:
+            return
+        if depends:
+            self.dependency_refs.extend((name, dep, mark) for dep, mark in depends)
+        if name in self.leaders:
+            first = self.leaders[name]
+            self.error(name_mark, f"Duplicate leader '{name}' (first at {first[0]}:{first[1]})")
+            return
+        self.leaders[name] = name_mark
+        self.depends_on[name] = depends
+        short = name.replace('-leader', '')
+        for trigger in (short, f"{short}-complete", f"{short}-multi"):
+            self._trigger(trigger, f"leader {name}", name_mark)
+    
+    def _specialist(self, event) -> Optional[str]:
+        """Check one specialists entry; returns its id (if known)"""
+        if type(event) is not MappingStartEvent:
+            for _ in self._items(event, "A specialist"):
+                pass
+            return None
+        
+        # Hot path (every specialist of every leader): no generator, the
+        # common keys are dispatched first
+        get = self._next
+        fields = {}
+        ref = extends = None
+        while True:
+            key_event = get()
+            if key_event.__class__ is not ScalarEvent:
+                if key_event.__class__ is MappingEndEvent:
+                    break
+                self.error(self._at(key_event), "A specialist keys must be plain names")
+                self._skip(key_event)
+                self._skip(get())
+                continue
+            value = get()
+            key = key_event.value
+            if key == 'skills':
+                self._check_scalars(value, "skills")
+                fields[key] = None
+            elif key in SPECIALIST_FIELDS:
+                if value.__class__ is ScalarEvent and value.value not in NULLS:
+                    fields[key] = value.value
+                else:
+                    fields[key] = self._scalar(value, f"specialist {key}")
+            elif key == 'ref':
+                ref = self._scalar(value, "ref")
+                if ref is not None:
+                    self.library_refs.append((ref, self._at(value)))
+                fields.setdefault(key, None)
+            elif key == 'extends':
+                extends = self._scalar(value, "extends")
+                if extends is not None:
+                    self.library_refs.append((extends, self._at(value)))
+                fields.setdefault(key, None)
+            elif key == '<<':
+                fields[key] = None
+                self._skip(value)
+            else:
+                self._unknown(key, key_event, value, "specialist")
+                fields.setdefault(key, None)
+        
+        if ref is not None:
+            extra = sorted(k for k in fields if k != 'ref')
+            if extra:
+                self.error(self._at(event), f"ref: {ref} cannot override {', '.join(extra)} (use extends:)")
+            return fields.get('id') or ref
+        if extends is not None:
+            return fields.get('id') or extends
+        if not fields.keys() >= SPECIALIST_REQUIRED_SET:
+            self._missing(fields, SPECIALIST_REQUIRED, self._at(event), "Specialist")
+        return fields.get('id')
+    
+    def _library_entry(self, name: str, mark: Mark, event) -> None:
+        if name in self.library:
+            self.error(mark, f"Duplicate specialist_library entry '{name}'")
+        extends = None
+        fields = set()
+        for key, key_event, value in self._items(event, f"specialist_library.{name}"):
+            fields.add(key)
+            if key == 'extends':
+                extends = self._scalar(value, "extends")
+            elif key == 'skills':
+                self._check_scalars(value, "skills")
+            elif key in SPECIALIST_FIELDS:
+                self._scalar(value, f"specialist {key}")
+            elif key == '<<':
+                self._skip(value)
+            else:
+                self._unknown(key, key_event, value, f"specialist_library.{name}")
+        self.library[name] = (mark, extends)
+        self.library_fields[name] = fields
+    
+    def _customization(self, event, what: str) -> None:
+        for key, key_event, value in self._items(event, what):
+            if key in ('memories', 'principles'):
+                self._check_scalars(value, f"{what}.{key}")
+            elif key == 'menu_additions':
+                for item in self._entries(value, f"{what}.menu_additions"):
+                    start = self._at(item)
+                    seen = set()
+                    for field_name, field_event, field_value in self._items(item, "A menu addition"):
+                        seen.add(field_name)
+                        if field_name in MENU_FIELDS:
+                            text = self._scalar(field_value, f"menu {field_name}")
+                            if field_name == 'trigger' and text is not None:
+                                self._trigger(text, f"menu item of {what}", self._at(field_value))
+                        else:
+                            self._unknown(field_name, field_event, field_value, "menu addition")
+                    self._missing(seen, MENU_FIELDS, start, "Menu addition")
+            else:
+                self._unknown(key, key_event, value, what)
+    
+    def _workflow(self, event) -> None:
+        start = self._at(event)
+        seen = set()
+        name = None
+        steps = []
+        for key, key_event, value in self._items(event, "An integration workflow"):
+            seen.add(key)
+            if key == 'sequence':
+                steps = self._scalars(value, "sequence")
+            elif key in ('phase', 'name'):
+                text = self._scalar(value, f"workflow {key}")
+                if key == 'name':
+                    name = text
+            else:
+                self._unknown(key, key_event, value, "integration workflow")
+        self._missing(seen, WORKFLOW_FIELDS, start, f"Integration workflow {name or ''}".rstrip())
+        if name is not None:
+            self._trigger(name, f"integration workflow {name}", start)
+            self.integration_steps.extend((name, step, mark) for step, mark in steps)
+    
+    def _trigger(self, trigger: str, owner: str, mark: Mark) -> None:
+        trigger = trigger.lstrip('/')
+        if trigger in self.triggers:
+            other, other_mark = self.triggers[trigger]
+            self.error(mark, f"Trigger '{trigger}' of {owner} collides with {other} (line {other_mark[1]})")
+        else:
+            self.triggers[trigger] = (owner, mark)
+    
+    # -- driver ------------------------------------------------------------
+    
+    def _walk(self, path: Path, root_handler) -> bool:
+        """Stream one YAML file through root_handler; False on a syntax error"""
+        self._path = str(path)
+        try:
+            with open(path, 'rb') as f:
+                loader = YAML_LOADER(f)
+                try:
+                    self._next = loader.get_event
+                    get = self._next
+                    get()  # stream start
+                    if not loader.check_event(yaml.DocumentStartEvent):
+                        self.error((self._path, 1, 1), "The file is empty")
+                        return True
+                    get()
+                    root_handler(get())
+                finally:
+                    loader.dispose()
+        except OSError as e:
+            self.error((self._path, 1, 1), f"Cannot read: {e.strerror}")
+            return False
+        except yaml.MarkedYAMLError as e:
+            mark = e.problem_mark or e.context_mark
+            line, column = (mark.line + 1, mark.column + 1) if mark else (1, 1)
+            self.error((self._path, line, column), f"YAML syntax: {e.problem or e}")
+            return False
+        return True
+    
+    def validate_file(self, manifest_path: Path) -> List[ValidationIssue]:
+        """Validate a manifest and its leader shards; returns every issue (errors and warnings)"""
+        if not self._walk(manifest_path, self._document):
+            return self.issues
+        
+        base_dir = Path(manifest_path).parent
+        for pattern, mark in self._shard_patterns:
+            shards = leader_shard_paths([pattern], base_dir)
+            if not shards:
+                self.error(mark, f"leader_files pattern '{pattern}' matches no file", severity='warning')
+            for name, shard_path in shards.items():
+                self.has_leaders = True
+                self._walk(shard_path, lambda event, name=name: self._leader(event, shard_name=name))
+        
+        self._path = str(manifest_path)
+        self._cross_references()
+        # Manifest first, then shards, each in document order
+        self.issues.sort(key=lambda i: (i.path != self._path, i.path, i.line, i.column))
+        return self.issues
+    
+    def _cross_references(self) -> None:
+        if not self.has_leaders:
+            self.error((self._path, 1, 1), "The manifest declares no leaders (project.leaders or project.leader_files)")
+        
+        for name, mark in self.library_refs:
+            if name not in self.library:
+                self.error(mark, f"Unknown specialist_library entry '{name}'")
+        for name, (mark, extends) in self.library.items():
+            if extends is not None and extends not in self.library:
+                self.error(mark, f"specialist_library.{name} extends unknown entry '{extends}'")
+        self._library_cycles()
+        
+        for leader, mark in self.customized:
+            if leader not in self.leaders:
+                self.error(mark, f"Customizations for unknown leader '{leader}'")
+        
+        for workflow, step, mark in self.integration_steps:
+            if step not in self.leaders and step.endswith('-leader'):
+                self.error(mark, f"Integration workflow {workflow} references unknown leader '{step}'")
+        
+        for leader, dep, mark in self.dependency_refs:
+            if dep not in self.leaders:
+                self.error(mark, f"Leader {leader} depends on unknown leader '{dep}'")
+        if any(self.depends_on.values()):
+            self._dependency_cycles()
+        
+        bmad_workflows = self._bmad_workflows()
+        for trigger, (owner, mark) in self.triggers.items():
+            if trigger in bmad_workflows:
+                self.error(mark, f"Trigger '{trigger}' of {owner} collides with BMAD workflow '{trigger}' ({bmad_workflows[trigger]})")
+        
+        root = self.project_root
+        if root is None and self.root is not None:
+            root = Path(self.root[0]).expanduser()
+        if root is not None:
+            mark = self.root[1] if self.root is not None and self.project_root is None else (self._path, 1, 1)
+            if not root.exists():
+                self.error(mark, f"Project root does not exist: {root}")
+            elif not (root / "_bmad").exists():
+                self.error(mark, f"BMAD not installed at {root}")
+    
+    def _library_cycles(self) -> None:
+        """Report extends cycles, and entries missing required fields once their chain is applied"""
+        for name in self.library:
+            fields, current, visited = set(), name, set()
+            while current in self.library and current not in visited:
+                visited.add(current)
+                fields |= self.library_fields[current]
+                current = self.library[current][1]
+            # Cycles are reported below
+            if current not in visited and '<<' not in fields:
+                missing = [f for f in SPECIALIST_REQUIRED[1:] if f not in fields]
+                if missing:
+                    self.error(self.library[name][0], f"specialist_library.{name} is missing {', '.join(repr(f) for f in missing)}")
+        
+        done = set()
+        for name in self.library:
+            chain = []
+            current = name
+            while current in self.library and current not in done:
+                if current in chain:
+                    cycle = chain[chain.index(current):] + [current]
+                    self.error(self.library[current][0], f"specialist_library cycle: {' → '.join(cycle)}")
+                    break
+                chain.append(current)
+                current = self.library[current][1]
+            done.update(chain)
+    
+    def _dependency_cycles(self) -> None:
+        from .scheduler import ProvisionGraph, Node, LEADER
+        
+        graph = ProvisionGraph()
+        for leader, deps in self.depends_on.items():
+            key = ProvisionGraph.leader_key(leader)
+            known = [ProvisionGraph.leader_key(dep) for dep, _ in deps if dep in self.leaders]
+            graph.nodes[key] = Node(key=key, kind=LEADER, name=leader, payload=None, depends_on=known)
+        for message in graph.find_cycles():
+            first = message.split(': ', 1)[1].split(' → ')[0]
+            self.error(self.leaders[first], message)
+    
+    def _bmad_workflows(self) -> Dict[str, str]:
+        """BMAD workflow name -> module from _config/workflow-manifest.csv (empty if absent)"""
+        root = self.project_root or (Path(self.root[0]).expanduser() if self.root else None)
+        if root is None:
+            return {}
+        try:
+            with open(root / "_bmad" / "_config" / "workflow-manifest.csv", 'r', encoding='utf-8', newline='') as f:
+                return {row['name']: row.get('module', '') for row in csv.DictReader(f) if row.get('name')}
+        except (OSError, KeyError, csv.Error):
+            return {}
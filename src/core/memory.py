@@ -0,0 +1,220 @@
+"""
+Memory - Per-phase memory tracking and a memory budget for provisioning
+"""
+
+import os
+import sys
+import threading
+import contextlib
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+
+MB = 1024 * 1024
+
+# Peak RSS of one generator subprocess (python + yaml + a leader render is ~44 MB)
+GENERATOR_PROCESS_BYTES = 48 * MB
+
+# In-memory size of parsed CSV rows relative to the file (str and list
+# overhead of short cells, plus the key maps and merged copy of merge_rows)
+CSV_MEMORY_FACTOR = 8
+
+# Generated files the renderer keeps waiting for a writer are at most this big
+PENDING_FILE_BYTES = 256 * 1024
+
+
+def format_bytes(size: int) -> str:
+    """Human readable size (negative for released memory)"""
+    sign = '-' if size < 0 else ''
+    size = abs(size)
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f"{sign}{size:.0f} {unit}" if unit == 'B' else f"{sign}{size:.1f} {unit}"
+        size /= 1024
+    return f"{sign}{size:.1f} GB"
+
+
+@dataclass
+class PhaseStats:
+    """Memory of one phase (or leader), over all its calls"""
+    name: str
+    calls: int = 0
+    peak: int = 0
+    retained: int = 0
+    # Leaders only: peak RSS reported by the generator subprocess
+    process_peak: int = 0
+
+
+class MemoryTracker:
+    """
+    Peak and retained Python memory per provisioning phase and per leader
+    
+    Uses tracemalloc: peak is the highest traced memory above the level the
+    phase started at, retained is what the phase left allocated when it
+    ended. Phases nest (a leader's CSV merges count towards the leader and
+    towards "csv merge") and are expected to run one at a time, which is
+    why generation runs one leader at a time while tracking. Only this
+    process is traced; generator subprocesses report their own peak RSS,
+    recorded per leader. A snapshot taken by start() is compared with the
+    final one to list the allocation sites that kept memory (leak candidates).
+    """
+    
+    TOP_SITES = 8
+    
+    def __init__(self):
+        self.enabled = False
+        self.phases: Dict[str, PhaseStats] = {}
+        self.leaders: Dict[str, PhaseStats] = {}
+        self._stack: List[List[int]] = []
+        self._lock = threading.RLock()
+        self._snapshot = None
+    
+    def start(self) -> None:
+        """Start tracing allocations"""
+        import tracemalloc
+        
+        tracemalloc.start()
+        self._snapshot = tracemalloc.take_snapshot()
+        self.enabled = True
+    
+    @contextlib.contextmanager
+    def phase(self, name: str, leader: bool = False):
+        """Record the memory used by the enclosed block under name"""
+        if not self.enabled:
+            yield
+            return
+        
+        import tracemalloc
+        
+        with self._lock:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                # The enclosing phase keeps the peak it reached so far
+                self._stack[-1][1] = max(self._stack[-1][1], peak)
+            tracemalloc.reset_peak()
+            frame = [current, current]
+            self._stack.append(frame)
+        try:
+            yield
+        finally:
+            with self._lock:
+                current, peak = tracemalloc.get_traced_memory()
+                self._stack.pop()
+                peak = max(frame[1], peak)
+                if self._stack:
+                    self._stack[-1][1] = max(self._stack[-1][1], peak)
+                tracemalloc.reset_peak()
+                
+                table = self.leaders if leader else self.phases
+                stats = table.setdefault(name, PhaseStats(name))
+                stats.calls += 1
+                stats.peak = max(stats.peak, peak - frame[0])
+                stats.retained += current - frame[0]
+    
+    def record_process_peak(self, leader_name: str, peak: int) -> None:
+        """Peak RSS of the subprocess that rendered a leader"""
+        with self._lock:
+            stats = self.leaders.setdefault(leader_name, PhaseStats(leader_name))
+            stats.process_peak = max(stats.process_peak, peak)
+    
+    def retained_sites(self) -> List[str]:
+        """Allocation sites holding the most memory allocated since start()"""
+        import tracemalloc
+        
+        ignore = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+        ]
+        snapshot = tracemalloc.take_snapshot().filter_traces(ignore)
+        diffs = snapshot.compare_to(self._snapshot.filter_traces(ignore), 'lineno')
+        return [
+            f"{diff.traceback[0].filename}:{diff.traceback[0].lineno}: "
+            f"{format_bytes(diff.size_diff)} in {diff.count_diff} block(s)"
+            for diff in diffs[:self.TOP_SITES] if diff.size_diff > 0
+        ]
+    
+    def report(self) -> str:
+        """Phase and leader tables, plus the top retained allocation sites"""
+        import tracemalloc
+        
+        current, _ = tracemalloc.get_traced_memory()
+        lines = [f"📈 Memory report (traced Python memory, {format_bytes(current)} still allocated)"]
+        lines.append(f"   {'Phase':<28} {'Calls':>5} {'Peak':>10} {'Retained':>10}")
+        for stats in self.phases.values():
+            lines.append(
+                f"   {stats.name:<28} {stats.calls:>5} "
+                f"{format_bytes(stats.peak):>10} {format_bytes(stats.retained):>10}"
+            )
+        
+        if self.leaders:
+            lines.append(f"\n   {'Leader':<28} {'Peak':>10} {'Retained':>10} {'Generator RSS':>14}")
+            for stats in self.leaders.values():
+                process = format_bytes(stats.process_peak) if stats.process_peak else '-'
+                lines.append(
+                    f"   {stats.name:<28} {format_bytes(stats.peak):>10} "
+                    f"{format_bytes(stats.retained):>10} {process:>14}"
+                )
+        
+        sites = self.retained_sites()
+        if sites:
+            lines.append("\n   Top retained allocations since start:")
+            lines.extend(f"   - {site}" for site in sites)
+        return '\n'.join(lines)
+
+
+def track(tracker: Optional[MemoryTracker], name: str, leader: bool = False):
+    """tracker.phase(name), or nothing when there is no tracker"""
+    if tracker is None:
+        return contextlib.nullcontext()
+    return tracker.phase(name, leader=leader)
+
+
+def process_peak_rss() -> int:
+    """Peak RSS of this process in bytes (0 where unavailable)"""
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class MemoryBudget:
+    """
+    Upper bound on the memory footprint of provisioning (--memory-budget)
+    
+    Work that would hold a lot in memory at once first asks fits() with its
+    projected size, and takes its streaming or spill-to-disk path when the
+    answer is no. Usage is the resident size of the process (/proc), or the
+    traced Python memory where /proc is unavailable.
+    """
+    
+    def __init__(self, limit: int):
+        self.limit = limit
+    
+    @classmethod
+    def from_mb(cls, megabytes: int) -> 'MemoryBudget':
+        return cls(megabytes * MB)
+    
+    @staticmethod
+    def usage() -> int:
+        """Current memory of this process in bytes"""
+        try:
+            with open('/proc/self/statm', 'r') as f:
+                return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except (OSError, ValueError, IndexError):
+            import tracemalloc
+            return tracemalloc.get_traced_memory()[0]
+    
+    def available(self) -> int:
+        return max(0, self.limit - self.usage())
+    
+    def fits(self, projected: int) -> bool:
+        """Would projected more bytes stay within the budget?"""
+        return projected <= self.available()
+    
+    def workers(self, per_worker: int, wanted: int) -> int:
+        """How many of wanted concurrent workers of per_worker bytes fit (at least one)"""
+        return max(1, min(wanted, self.available() // per_worker))
@@ -0,0 +1,232 @@
+"""
+Skill Packager - Reproducible, content-addressed archives of provisioned leaders
+"""
+
+import os
+import json
+import stat
+import time
+import hashlib
+import tarfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Dict, Optional
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+
+PACKAGE_FORMAT = 1
+FORMATS = ('zip', 'tar.zst')
+
+# Every entry gets the same timestamp (SOURCE_DATE_EPOCH when set, like other
+# reproducible build tools); zip cannot store dates before 1980
+DEFAULT_EPOCH = 315532800
+ZIP_LEVEL = 9
+ZSTD_LEVEL = 19
+
+INDEX_NAME = "index.json"
+
+
+def source_date_epoch() -> int:
+    try:
+        return max(int(os.environ['SOURCE_DATE_EPOCH']), DEFAULT_EPOCH)
+    except (KeyError, ValueError):
+        return DEFAULT_EPOCH
+
+
+@dataclass
+class PackageEntry:
+    """One file of a leader tree"""
+    name: str
+    path: Path
+    executable: bool
+    size: int
+    sha256: str
+
+
+@dataclass
+class PackageResult:
+    """Archive of one leader"""
+    leader: str
+    archive: Path
+    digest: str
+    files: int
+    size: int
+    sha256: str
+    reused: bool
+    
+    def to_dict(self) -> dict:
+        return {
+            'archive': self.archive.name,
+            'digest': self.digest,
+            'files': self.files,
+            'size': self.size,
+            'sha256': self.sha256
+        }
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class SkillPackager:
+    """
+    Package leader directories of custom-skills into out_dir
+    
+    Archives are named <leader>-<digest>.<format>, where the digest covers the
+    format and every entry's name, mode and content. Entries are sorted and
+    carry fixed timestamps and owners, so the same tree always gives the same
+    bytes, and a leader whose digest already has an archive is not repacked.
+    Hidden files (render state, CSV merge bases) are local state and skipped.
+    """
+    
+    def __init__(
+        self,
+        skills_root: Path,
+        out_dir: Path,
+        archive_format: str = 'zip',
+        max_workers: Optional[int] = None
+    ):
+        if archive_format not in FORMATS:
+            raise ValueError(f"Unknown archive format: {archive_format}")
+        if archive_format == 'tar.zst' and not HAS_ZSTD:
+            raise ValueError("tar.zst archives need the zstandard package (pip install zstandard)")
+        self.skills_root = skills_root
+        self.out_dir = out_dir
+        self.archive_format = archive_format
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.epoch = source_date_epoch()
+    
+    def entries(self, leader: str) -> List[PackageEntry]:
+        """Files of a leader in archive order"""
+        leader_dir = self.skills_root / leader
+        entries = []
+        for dirpath, dirnames, filenames in os.walk(leader_dir):
+            dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+            for filename in filenames:
+                if filename.startswith('.'):
+                    continue
+                path = Path(dirpath) / filename
+                st = path.lstat()
+                if not stat.S_ISREG(st.st_mode):
+                    continue
+                entries.append(PackageEntry(
+                    name=f"{leader}/{path.relative_to(leader_dir).as_posix()}",
+                    path=path,
+                    executable=bool(st.st_mode & 0o111),
+                    size=st.st_size,
+                    sha256=_file_sha256(path)
+                ))
+        entries.sort(key=lambda e: e.name)
+        return entries
+    
+    def tree_digest(self, entries: List[PackageEntry]) -> str:
+        digest = hashlib.sha256(f"{PACKAGE_FORMAT}:{self.archive_format}:{self.epoch}\n".encode())
+        for entry in entries:
+            digest.update(f"{entry.name}\0{int(entry.executable)}\0{entry.sha256}\n".encode('utf-8'))
+        return digest.hexdigest()
+    
+    def archive_path(self, leader: str, digest: str) -> Path:
+        return self.out_dir / f"{leader}-{digest[:16]}.{self.archive_format}"
+    
+    def _write_zip(self, entries: List[PackageEntry], target: Path) -> None:
+        date_time = time.gmtime(self.epoch)[:6]
+        with zipfile.ZipFile(target, 'w') as archive:
+            for entry in entries:
+                info = zipfile.ZipInfo(entry.name, date_time=date_time)
+                info.create_system = 3
+                info.external_attr = (0o100755 if entry.executable else 0o100644) << 16
+                # One file in memory at a time (skill files are small text)
+                archive.writestr(
+                    info, entry.path.read_bytes(),
+                    compress_type=zipfile.ZIP_DEFLATED, compresslevel=ZIP_LEVEL
+                )
+    
+    def _write_tar_zst(self, entries: List[PackageEntry], target: Path) -> None:
+        compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+        with open(target, 'wb') as raw, compressor.stream_writer(raw) as stream:
+            with tarfile.open(fileobj=stream, mode='w|', format=tarfile.GNU_FORMAT) as archive:
+                for entry in entries:
+                    info = tarfile.TarInfo(entry.name)
+                    info.size = entry.size
+                    info.mtime = self.epoch
+                    info.mode = 0o755 if entry.executable else 0o644
+                    info.uid = info.gid = 0
+                    info.uname = info.gname = ''
+                    with open(entry.path, 'rb') as src:
+                        archive.addfile(info, src)
+    
+    def package_leader(self, leader: str, known: Optional[dict] = None) -> PackageResult:
+        """Archive one leader, reusing the existing archive when its digest is unchanged"""
+        entries = self.entries(leader)
+        digest = self.tree_digest(entries)
+        target = self.archive_path(leader, digest)
+        
+        if target.exists():
+            size = target.stat().st_size
+            if known and known.get('digest') == digest and known.get('size') == size:
+                sha256 = known['sha256']
+            else:
+                sha256 = _file_sha256(target)
+            return PackageResult(leader, target, digest, len(entries), size, sha256, reused=True)
+        
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_name(f".{target.name}.tmp")
+        try:
+            if self.archive_format == 'zip':
+                self._write_zip(entries, tmp_path)
+            else:
+                self._write_tar_zst(entries, tmp_path)
+            os.replace(tmp_path, target)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        
+        # Older archives of this leader are reproducible from their trees
+        suffix = f".{self.archive_format}"
+        for stale in self.out_dir.glob(f"{leader}-*{suffix}"):
+            stale_digest = stale.name[len(leader) + 1:-len(suffix)]
+            if stale != target and len(stale_digest) == 16 and all(c in '0123456789abcdef' for c in stale_digest):
+                stale.unlink(missing_ok=True)
+        
+        return PackageResult(
+            leader, target, digest, len(entries), target.stat().st_size, _file_sha256(target), reused=False
+        )
+    
+    def load_index(self) -> Dict[str, dict]:
+        try:
+            with open(self.out_dir / INDEX_NAME, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get('format') != PACKAGE_FORMAT or data.get('archive_format') != self.archive_format:
+            return {}
+        return data.get('leaders', {})
+    
+    def package(self, leaders: List[str]) -> List[PackageResult]:
+        """Archive leaders in parallel and write out_dir/index.json (digests and sha256s)"""
+        index = self.load_index()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            results = list(pool.map(lambda name: self.package_leader(name, index.get(name)), leaders))
+        
+        # Keep entries of leaders not packaged this time
+        for result in results:
+            index[result.leader] = result.to_dict()
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.out_dir / f".{INDEX_NAME}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(
+                {'format': PACKAGE_FORMAT, 'archive_format': self.archive_format, 'leaders': index},
+                f, indent=2, sort_keys=True
+            )
+        os.replace(tmp_path, self.out_dir / INDEX_NAME)
+        return results
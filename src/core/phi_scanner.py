@@ -0,0 +1,301 @@
+"""
+PHI Scanner - Find PHI keywords from phi-keywords.csv across a source tree
+"""
+
+import os
+import re
+import csv
+import mmap
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, List, Dict, Optional, Tuple
+
+from .discovery import PRUNED_DIRS
+
+
+RISK_ORDER = {'LOW': 0, 'MEDIUM': 1, 'HIGH': 2, 'CRITICAL': 3}
+
+CHUNK_SIZE = 16 * 1024 * 1024
+BINARY_SNIFF = 8192
+# Group small files so each worker task carries a useful amount of work
+BATCH_BYTES = 8 * 1024 * 1024
+BATCH_FILES = 256
+
+
+@dataclass
+class PhiKeyword:
+    """One row of phi-keywords.csv"""
+    keyword: str
+    category: str
+    risk_level: str
+
+
+@dataclass
+class PhiFinding:
+    """A PHI keyword occurrence"""
+    path: str
+    line: int
+    keyword: str
+    category: str
+    risk_level: str
+    
+    def to_dict(self) -> dict:
+        return {
+            'path': self.path,
+            'line': self.line,
+            'keyword': self.keyword,
+            'category': self.category,
+            'risk_level': self.risk_level
+        }
+
+
+def load_phi_keywords(csv_paths: List[Path]) -> Dict[str, PhiKeyword]:
+    """
+    Read phi-keywords.csv files (generated rows plus user additions)
+    
+    Returns:
+        Case-folded keyword -> PhiKeyword, keeping the highest risk level
+        when a keyword appears more than once
+    """
+    keywords = {}
+    for csv_path in csv_paths:
+        with open(csv_path, 'r', newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                keyword = (row.get('keyword') or '').strip()
+                if not keyword:
+                    continue
+                entry = PhiKeyword(
+                    keyword=keyword,
+                    category=(row.get('category') or 'PHI').strip(),
+                    risk_level=(row.get('risk_level') or 'HIGH').strip().upper()
+                )
+                key = keyword.casefold()
+                current = keywords.get(key)
+                if current is None or RISK_ORDER.get(entry.risk_level, 0) > RISK_ORDER.get(current.risk_level, 0):
+                    keywords[key] = entry
+    return keywords
+
+
+def compile_matcher(keywords: List[str]) -> 're.Pattern':
+    """
+    Compile all keywords into one alternation, matched against case-folded text
+    
+    Word boundaries are checked on the (rare) hits instead of with lookarounds,
+    which would be evaluated at every character.
+    """
+    alternatives = sorted({re.escape(k.casefold()) for k in keywords}, key=len, reverse=True)
+    return re.compile('|'.join(alternatives))
+
+
+# Per-process matcher, set once by the pool initializer
+_matcher: Optional['re.Pattern'] = None
+_overlap = 0
+# Case-folded keywords by first character, longest first, for the retry of
+# shorter keywords when a longer match fails the word-boundary check
+_by_first: Dict[str, List[str]] = {}
+
+
+def _init_worker(keywords: List[str]) -> None:
+    global _matcher, _overlap, _by_first
+    _matcher = compile_matcher(keywords)
+    _overlap = max(len(k.encode('utf-8')) for k in keywords) + 1
+    _by_first = {}
+    for keyword in sorted({k.casefold() for k in keywords}, key=len, reverse=True):
+        _by_first.setdefault(keyword[0], []).append(keyword)
+
+
+def _is_binary(data) -> bool:
+    return b'\0' in data[:BINARY_SNIFF]
+
+
+def _is_word(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+def _char_start(mm, pos: int, size: int) -> int:
+    """First position at or after pos that does not split a UTF-8 sequence"""
+    while pos < size and 0x80 <= mm[pos] < 0xC0:
+        pos += 1
+    return pos
+
+
+def _bounded_match(text: str, pos: int, found: str) -> Optional[str]:
+    """
+    The longest keyword at pos that stands as a whole word
+    
+    found is what the alternation matched; when its end is inside a word, a
+    shorter keyword at the same position may still end on a boundary.
+    """
+    if pos > 0 and _is_word(text[pos - 1]):
+        return None
+    for keyword in [found] + [k for k in _by_first.get(found[0], ()) if len(k) < len(found)]:
+        stop = pos + len(keyword)
+        if text.startswith(keyword, pos) and (stop >= len(text) or not _is_word(text[stop])):
+            return keyword
+    return None
+
+
+def scan_file(path: str) -> Tuple[List[Tuple[int, str]], bool]:
+    """
+    Scan one file in mmap'd chunks, decoded and case-folded
+    
+    Returns:
+        ([(line number, matched keyword case-folded)], scanned) - scanned is
+        False for binary, empty or unreadable files
+    """
+    try:
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return [], False
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if _is_binary(mm):
+                    return [], False
+                
+                hits = []
+                line = 1
+                start = 0
+                while start < size:
+                    end = _char_start(mm, min(start + CHUNK_SIZE, size), size)
+                    # The character before the chunk for the word-boundary check,
+                    # plus enough past the end to see keywords straddling it
+                    before = mm[max(start - 4, 0):start].decode('utf-8', 'replace')[-1:].casefold()
+                    body = mm[start:end].decode('utf-8', 'replace').casefold()
+                    after = mm[end:min(end + _overlap, size)].decode('utf-8', 'ignore').casefold()
+                    text = before + body + after
+                    limit = len(before) + len(body)
+                    pos = counted = len(before)
+                    while True:
+                        match = _matcher.search(text, pos)
+                        if match is None or match.start() >= limit:
+                            break
+                        keyword = _bounded_match(text, match.start(), match.group())
+                        if keyword is None:
+                            # A keyword starting inside the rejected match may still stand alone
+                            pos = match.start() + 1
+                            continue
+                        pos = match.start() + len(keyword)
+                        line += text.count('\n', counted, match.start())
+                        counted = match.start()
+                        hits.append((line, keyword))
+                    line += text.count('\n', counted, limit)
+                    start = end
+                return hits, True
+    except (OSError, ValueError):
+        return [], False
+
+
+def _scan_batch(paths: List[str]) -> List[Tuple[str, List[Tuple[int, str]], bool, int]]:
+    results = []
+    for path in paths:
+        hits, scanned = scan_file(path)
+        results.append((path, hits, scanned, os.path.getsize(path) if scanned else 0))
+    return results
+
+
+@dataclass
+class ScanStats:
+    """Totals of a scan"""
+    files: int = 0
+    skipped: int = 0
+    bytes: int = 0
+    findings: int = 0
+
+
+def provisioner_paths(project_root: Path) -> List[Path]:
+    """
+    What the provisioner itself writes into a project: the generated skills
+    (whose data/phi-keywords.csv and agent docs quote the keywords), backups,
+    caches and packages. A scan of the project would otherwise find them.
+    """
+    bmad_root = project_root / "_bmad"
+    return [bmad_root / "custom-skills", bmad_root / ".backups", bmad_root / ".cache", bmad_root / ".packages"]
+
+
+class PhiScanner:
+    """Scan a tree for PHI keywords with a process pool"""
+    
+    def __init__(
+        self,
+        keywords: Dict[str, PhiKeyword],
+        max_workers: Optional[int] = None,
+        exclude: Optional[List[Path]] = None
+    ):
+        if not keywords:
+            raise ValueError("No PHI keywords to scan for")
+        self.keywords = keywords
+        self.max_workers = max_workers or os.cpu_count() or 1
+        # Files and directories never scanned (a directory excludes its whole tree)
+        self.exclude = {os.path.abspath(p) for p in exclude or []}
+        self.stats = ScanStats()
+    
+    def iter_files(self, root: Path) -> Iterator[Tuple[str, int]]:
+        """Yield (path, size) of regular files under root, skipping pruned and excluded paths"""
+        if os.path.abspath(root) in self.exclude:
+            return
+        if root.is_file():
+            yield str(root), root.stat().st_size
+            return
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [
+                d for d in dirnames
+                if d not in PRUNED_DIRS and os.path.abspath(os.path.join(dirpath, d)) not in self.exclude
+            ]
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                if self.exclude and os.path.abspath(path) in self.exclude:
+                    continue
+                try:
+                    st = os.stat(path, follow_symlinks=False)
+                except OSError:
+                    continue
+                if st.st_size and os.path.isfile(path) and not os.path.islink(path):
+                    yield path, st.st_size
+    
+    def _batches(self, root: Path) -> Iterator[List[str]]:
+        batch, batch_bytes = [], 0
+        for path, size in self.iter_files(root):
+            batch.append(path)
+            batch_bytes += size
+            if batch_bytes >= BATCH_BYTES or len(batch) >= BATCH_FILES:
+                yield batch
+                batch, batch_bytes = [], 0
+        if batch:
+            yield batch
+    
+    def _findings(self, root: Path, path: str, hits: List[Tuple[int, str]]) -> Iterator[PhiFinding]:
+        try:
+            display = str(Path(path).relative_to(root))
+        except ValueError:
+            display = path
+        for line, matched in hits:
+            keyword = self.keywords[matched]
+            yield PhiFinding(
+                path=display,
+                line=line,
+                keyword=keyword.keyword,
+                category=keyword.category,
+                risk_level=keyword.risk_level
+            )
+    
+    def scan(self, root: Path) -> Iterator[PhiFinding]:
+        """Yield findings as worker batches complete (file order within a batch)"""
+        self.stats = ScanStats()
+        base = root if root.is_dir() else root.parent
+        keywords = [k.keyword for k in self.keywords.values()]
+        
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_worker,
+            initargs=(keywords,)
+        ) as pool:
+            for results in pool.map(_scan_batch, self._batches(root)):
+                for path, hits, scanned, size in results:
+                    if not scanned:
+                        self.stats.skipped += 1
+                        continue
+                    self.stats.files += 1
+                    self.stats.bytes += size
+                    self.stats.findings += len(hits)
+                    yield from self._findings(base, path, hits)
@@ -0,0 +1,296 @@
+"""
+Render Cache - Content-addressed, cross-project cache of rendered leader skills
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+import threading
+import contextlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    # Windows
+    import msvcrt
+    HAS_FCNTL = False
+
+
+# 2: entries carry the generator's render state
+CACHE_FORMAT = 2
+
+# CSV merge state, not render output
+EXCLUDED_SUFFIXES = ('.csv.base',)
+
+# What each unit of a leader was rendered from (RenderState of the generator
+# script); cached with the files so materializing can skip unchanged units
+RENDER_STATE = '.render-state.json'
+
+
+def default_cache_dir() -> Path:
+    """$BMAD_PROVISIONER_CACHE, else the user cache directory"""
+    override = os.environ.get('BMAD_PROVISIONER_CACHE')
+    if override:
+        return Path(override).expanduser()
+    base = os.environ.get('XDG_CACHE_HOME') or Path.home() / ".cache"
+    return Path(base) / "bmad-provisioner" / "render"
+
+
+def project_cache_dir(project_root: Path) -> Path:
+    """
+    Per-project caches (stat cache, routing tables, rendered specialists...),
+    kept out of the project
+    
+    Next to the render cache (inside $BMAD_PROVISIONER_CACHE when set), in a
+    directory named after a hash of the resolved project root.
+    """
+    key = hashlib.sha256(str(Path(project_root).resolve()).encode('utf-8')).hexdigest()[:16]
+    override = os.environ.get('BMAD_PROVISIONER_CACHE')
+    base = Path(override).expanduser() if override else default_cache_dir().parent
+    return base / "projects" / key
+
+
+@contextlib.contextmanager
+def _file_lock(path: Path):
+    """Exclusive lock on path across processes (blocks until granted)"""
+    with open(path, 'a+b') as f:
+        if HAS_FCNTL:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if HAS_FCNTL:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """Render cache activity during one provision"""
+    hits: int = 0
+    misses: int = 0
+    stored: int = 0
+    evicted: int = 0
+    corrupt: int = 0
+    
+    def summary(self) -> str:
+        text = f"{self.hits} hit(s), {self.misses} miss(es)"
+        if self.evicted:
+            text += f", {self.evicted} evicted"
+        if self.corrupt:
+            text += f", {self.corrupt} corrupt entr{'y' if self.corrupt == 1 else 'ies'} dropped"
+        return text
+
+
+class RenderCache:
+    """
+    Rendered file sets keyed by a canonical hash of what produced them
+    
+    Layout:
+        objects/<aa>/<sha256>   file contents, stored once across entries
+        entries/<key>.json      {relative path: [sha256, size]} of one render
+    
+    An entry's mtime is its last use; put() evicts least recently used entries
+    until the objects fit in max_bytes. The cache is shared by every
+    provisioner of the user, so put() and evict() also hold the cache's lock
+    file: an eviction never deletes objects another process is still storing.
+    """
+    
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: int = 500 * 1024 * 1024):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.objects_dir = self.cache_dir / "objects"
+        self.entries_dir = self.cache_dir / "entries"
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def key(leader, domain: str, generator_digest: str) -> str:
+        """Hash of every input that affects a leader's rendered files"""
+        payload = {
+            'format': CACHE_FORMAT,
+            'generator': generator_digest,
+            'domain': domain,
+            'name': leader.name,
+            'phase': leader.phase,
+            'specialists': [
+                {'id': s.id, 'name': s.name, 'domain': s.domain, 'skills': list(s.skills)}
+                for s in leader.specialists
+            ]
+        }
+        canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+    
+    @contextlib.contextmanager
+    def _exclusive(self):
+        """Exclude other threads and other processes using the same cache directory"""
+        with self._lock:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with _file_lock(self.cache_dir / "lock"):
+                yield
+    
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+    
+    def _entry_path(self, key: str) -> Path:
+        return self.entries_dir / f"{key}.json"
+    
+    def get(self, key: str) -> Optional[Dict[str, list]]:
+        """
+        Return {relative path: [sha256, size]} for a verified entry, or None
+        
+        Every object is re-hashed; an entry with a missing or altered object is
+        dropped and counts as a miss.
+        """
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, 'r', encoding='utf-8') as f:
+                files = json.load(f)['files']
+        except (OSError, ValueError, KeyError):
+            with self._lock:
+                self.stats.misses += 1
+            return None
+        
+        for rel, (digest, size) in files.items():
+            object_path = self._object_path(digest)
+            try:
+                intact = object_path.stat().st_size == size and file_digest(object_path) == digest
+            except OSError:
+                intact = False
+            if not intact:
+                entry_path.unlink(missing_ok=True)
+                with self._lock:
+                    self.stats.corrupt += 1
+                    self.stats.misses += 1
+                return None
+        
+        os.utime(entry_path)
+        with self._lock:
+            self.stats.hits += 1
+        return files
+    
+    def put(self, key: str, source_dir: Path) -> Dict[str, list]:
+        """Store every file under source_dir as the entry for key"""
+        # Held until the entry references its objects, so evict() never sees them orphaned
+        with self._exclusive():
+            files = {}
+            for path in sorted(p for p in source_dir.rglob('*') if p.is_file()):
+                rel = path.relative_to(source_dir).as_posix()
+                if rel.endswith(EXCLUDED_SUFFIXES):
+                    continue
+                digest = file_digest(path)
+                object_path = self._object_path(digest)
+                if not object_path.exists():
+                    object_path.parent.mkdir(parents=True, exist_ok=True)
+                    fd, tmp_name = tempfile.mkstemp(dir=object_path.parent, prefix='.tmp-')
+                    os.close(fd)
+                    shutil.copyfile(path, tmp_name)
+                    os.replace(tmp_name, object_path)
+                files[rel] = [digest, path.stat().st_size]
+            
+            self.entries_dir.mkdir(parents=True, exist_ok=True)
+            entry_path = self._entry_path(key)
+            tmp_path = entry_path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'format': CACHE_FORMAT, 'files': files}, f, separators=(',', ':'))
+            os.replace(tmp_path, entry_path)
+            self.stats.stored += 1
+        
+        self.evict()
+        return files
+    
+    def materialize(self, files: Dict[str, list], target_dir: Path, rel: str) -> Path:
+        """
+        Copy one cached file to target_dir/rel (atomically)
+        
+        Files are always copied: generated skills are meant to be edited, and
+        an edit through a shared inode would change the cache object and every
+        project using it. A target that already has the cached contents is not
+        rewritten, unless it is hard-linked (left by older versions).
+        """
+        digest, size = files[rel]
+        target = target_dir / rel
+        # Leave identical files alone so only what changed gets a new mtime
+        try:
+            st = target.stat()
+            if st.st_nlink == 1 and st.st_size == size and file_digest(target) == digest:
+                return target
+        except OSError:
+            pass
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_name(f".{target.name}.tmp-{threading.get_ident()}")
+        shutil.copyfile(self._object_path(digest), tmp_path)
+        os.replace(tmp_path, target)
+        return target
+    
+    def read(self, files: Dict[str, list], rel: str) -> str:
+        return self._object_path(files[rel][0]).read_text(encoding='utf-8')
+    
+    def disk_usage(self) -> int:
+        total = 0
+        if self.objects_dir.exists():
+            for path in self.objects_dir.rglob('*'):
+                if path.is_file():
+                    total += path.stat().st_size
+        return total
+    
+    def evict(self) -> int:
+        """Drop least recently used entries until objects fit in max_bytes"""
+        with self._exclusive():
+            if not self.entries_dir.exists():
+                return 0
+            
+            entries = []
+            for entry_path in self.entries_dir.glob('*.json'):
+                try:
+                    with open(entry_path, 'r', encoding='utf-8') as f:
+                        files = json.load(f)['files']
+                    entries.append((entry_path.stat().st_mtime, entry_path, files))
+                except (OSError, ValueError, KeyError):
+                    entry_path.unlink(missing_ok=True)
+            
+            sizes = {}
+            for _, _, files in entries:
+                for digest, size in files.values():
+                    sizes[digest] = size
+            total = sum(sizes.values())
+            if total <= self.max_bytes:
+                return 0
+            
+            # Oldest first; the newest entry is kept even if it alone is over budget
+            entries.sort(key=lambda e: e[0])
+            evicted = 0
+            while len(entries) > 1 and total > self.max_bytes:
+                _, entry_path, _ = entries.pop(0)
+                entry_path.unlink(missing_ok=True)
+                evicted += 1
+                live = {digest for _, _, files in entries for digest, _ in files.values()}
+                total = sum(size for digest, size in sizes.items() if digest in live)
+            
+            # Remove objects no remaining entry references
+            live = {digest for _, _, files in entries for digest, _ in files.values()}
+            for object_path in self.objects_dir.rglob('*'):
+                if object_path.is_file() and object_path.name not in live and not object_path.name.startswith('.tmp-'):
+                    object_path.unlink(missing_ok=True)
+            
+            self.stats.evicted += evicted
+            return evicted
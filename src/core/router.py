@@ -0,0 +1,322 @@
+"""
+Routing Engine - Score requests against specialists using a compiled keyword automaton
+"""
+
+import os
+import re
+import csv
+import json
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator, List, Dict, Tuple
+import yaml
+
+from .render_cache import project_cache_dir
+
+
+# Weight of a keyword per source; explicit routing tables beat generated prose
+CSV_WEIGHT = 1.0
+TRIGGER_WEIGHT = 0.5
+
+TRIGGER_PREFIX = re.compile(r'^\s*(request\s+)?(involves|about|mentions)\s+', re.IGNORECASE)
+TRIGGER_SPLIT = re.compile(r'[,;]|\s+(?:and|or)\s+', re.IGNORECASE)
+
+
+def normalize(text: str) -> str:
+    """Case-fold and collapse whitespace so keywords and requests compare alike"""
+    return ' '.join(text.lower().split())
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton over normalized keywords (whole-word matches only)"""
+    
+    def __init__(self):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.out: List[List[int]] = [[]]
+        self.keywords: List[str] = []
+    
+    @classmethod
+    def build(cls, keywords: Iterable[str]) -> 'KeywordAutomaton':
+        automaton = cls()
+        for keyword in keywords:
+            automaton._add(keyword)
+        automaton._link()
+        return automaton
+    
+    def _add(self, keyword: str) -> None:
+        state = 0
+        for ch in keyword:
+            nxt = self.goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append([])
+                self.goto[state][ch] = nxt
+            state = nxt
+        self.out[state].append(len(self.keywords))
+        self.keywords.append(keyword)
+    
+    def _link(self) -> None:
+        """Compute failure links breadth-first and merge outputs along them"""
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+    
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Yield (keyword index, end offset) for every whole-word occurrence in text"""
+        goto, fail, out, keywords = self.goto, self.fail, self.out, self.keywords
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for index in out[state]:
+                start = i - len(keywords[index]) + 1
+                if start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if i + 1 < len(text) and _is_word_char(text[i + 1]):
+                    continue
+                yield index, i + 1
+    
+    def to_dict(self) -> dict:
+        return {'goto': self.goto, 'fail': self.fail, 'out': self.out, 'keywords': self.keywords}
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'KeywordAutomaton':
+        automaton = cls()
+        automaton.goto = data['goto']
+        automaton.fail = data['fail']
+        automaton.out = data['out']
+        automaton.keywords = data['keywords']
+        return automaton
+
+
+@dataclass
+class RouteMatch:
+    """Score of one specialist for a request"""
+    leader: str
+    specialist: str
+    score: float
+    keywords: List[str] = field(default_factory=list)
+    
+    def to_dict(self) -> dict:
+        return {
+            'leader': self.leader,
+            'specialist': self.specialist,
+            'score': round(self.score, 3),
+            'keywords': self.keywords
+        }
+
+
+class RoutingTable:
+    """Compiled routing rules of one leader"""
+    
+    def __init__(self, leader: str, automaton: KeywordAutomaton, targets: List[List[Tuple[str, float]]]):
+        self.leader = leader
+        self.automaton = automaton
+        # keyword index -> [(specialist, weight)]
+        self.targets = targets
+    
+    @property
+    def specialists(self) -> List[str]:
+        return sorted({specialist for entries in self.targets for specialist, _ in entries})
+    
+    @classmethod
+    def compile(cls, leader: str, rules: Dict[str, Dict[str, float]]) -> 'RoutingTable':
+        """Build from {keyword: {specialist: weight}}"""
+        keywords = sorted(rules)
+        automaton = KeywordAutomaton.build(keywords)
+        targets = [sorted(rules[k].items()) for k in keywords]
+        return cls(leader, automaton, targets)
+    
+    def route(self, request: str) -> List[RouteMatch]:
+        """Score every specialist in one pass over the request, best first"""
+        scores: Dict[str, float] = {}
+        hits: Dict[str, List[str]] = {}
+        for index, _ in self.automaton.iter_matches(normalize(request)):
+            keyword = self.automaton.keywords[index]
+            for specialist, weight in self.targets[index]:
+                scores[specialist] = scores.get(specialist, 0.0) + weight
+                matched = hits.setdefault(specialist, [])
+                if keyword not in matched:
+                    matched.append(keyword)
+        
+        matches = [
+            RouteMatch(self.leader, specialist, score, hits[specialist])
+            for specialist, score in scores.items()
+        ]
+        matches.sort(key=lambda m: (-m.score, m.specialist))
+        return matches
+    
+    def to_dict(self) -> dict:
+        return {
+            'leader': self.leader,
+            'automaton': self.automaton.to_dict(),
+            'targets': [[list(t) for t in entries] for entries in self.targets]
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'RoutingTable':
+        targets = [[(s, w) for s, w in entries] for entries in data['targets']]
+        return cls(data['leader'], KeywordAutomaton.from_dict(data['automaton']), targets)
+
+
+class RoutingEngine:
+    """Load (and cache) routing tables from generated leader skills"""
+    
+    CACHE_VERSION = 1
+    
+    def __init__(self, project_root: Path):
+        self.skills_dir = project_root / "_bmad" / "custom-skills"
+        self.cache_dir = project_cache_dir(project_root) / "routing"
+        self._tables: Dict[str, RoutingTable] = {}
+    
+    def source_files(self, leader: str) -> List[Path]:
+        """Files a leader's routing table is compiled from"""
+        leader_dir = self.skills_dir / leader
+        sources = sorted((leader_dir / "agents").glob("specialist-*.agent.yaml"))
+        routing_csv = leader_dir / "data" / "routing-keywords.csv"
+        if routing_csv.exists():
+            sources.append(routing_csv)
+        return sources
+    
+    @staticmethod
+    def trigger_keywords(trigger_conditions: str) -> List[str]:
+        """Split prose like 'Request involves React, Vue and CSS' into keywords"""
+        text = TRIGGER_PREFIX.sub('', trigger_conditions or '')
+        return [k for k in (normalize(part) for part in TRIGGER_SPLIT.split(text)) if len(k) > 1]
+    
+    def collect_rules(self, leader: str) -> Dict[str, Dict[str, float]]:
+        """Gather {keyword: {specialist: weight}} from agent YAMLs and routing-keywords.csv"""
+        rules: Dict[str, Dict[str, float]] = {}
+        
+        def add(keyword: str, specialist: str, weight: float):
+            targets = rules.setdefault(keyword, {})
+            targets[specialist] = max(targets.get(specialist, 0.0), weight)
+        
+        for path in self.source_files(leader):
+            if path.suffix == '.csv':
+                with open(path, 'r', newline='', encoding='utf-8') as f:
+                    for row in csv.DictReader(f):
+                        specialist = (row.get('specialist') or '').strip()
+                        for keyword in (row.get('keywords') or '').split(','):
+                            keyword = normalize(keyword)
+                            if specialist and keyword:
+                                add(keyword, specialist, CSV_WEIGHT)
+            else:
+                with open(path, 'r', encoding='utf-8') as f:
+                    agent = yaml.safe_load(f) or {}
+                specialist = agent.get('name', path.stem).replace('specialist-', '', 1)
+                specialist = specialist.replace('.agent', '')
+                trigger = (agent.get('routing') or {}).get('trigger_conditions', '')
+                for keyword in self.trigger_keywords(trigger):
+                    add(keyword, specialist, TRIGGER_WEIGHT)
+        
+        return rules
+    
+    def _fingerprint(self, leader: str) -> Dict[str, list]:
+        fingerprint = {}
+        for path in self.source_files(leader):
+            st = os.stat(path)
+            fingerprint[path.name] = [st.st_size, st.st_mtime_ns]
+        return fingerprint
+    
+    def load(self, leader: str) -> RoutingTable:
+        """Return the leader's table, recompiling only if its sources changed"""
+        if leader in self._tables:
+            return self._tables[leader]
+        
+        if not (self.skills_dir / leader).is_dir():
+            raise FileNotFoundError(f"Leader not provisioned: {self.skills_dir / leader}")
+        
+        fingerprint = self._fingerprint(leader)
+        cache_path = self.cache_dir / f"{leader}.json"
+        table = None
+        
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == self.CACHE_VERSION and data.get('sources') == fingerprint:
+                table = RoutingTable.from_dict(data['table'])
+        except (OSError, ValueError, KeyError):
+            table = None
+        
+        if table is None:
+            table = RoutingTable.compile(leader, self.collect_rules(leader))
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(
+                    {'version': self.CACHE_VERSION, 'sources': fingerprint, 'table': table.to_dict()},
+                    f, separators=(',', ':')
+                )
+            os.replace(tmp_path, cache_path)
+        
+        self._tables[leader] = table
+        return table
+    
+    def route(self, request: str, leaders: List[str]) -> List[RouteMatch]:
+        """Score a request against every specialist of the given leaders, best first"""
+        matches = []
+        for leader in leaders:
+            matches.extend(self.load(leader).route(request))
+        matches.sort(key=lambda m: (-m.score, m.leader, m.specialist))
+        return matches
+    
+    def route_batch(self, lines: Iterable[str], leaders: List[str], top: int = 3) -> Iterator[dict]:
+        """
+        Route NDJSON requests
+        
+        Each input line is {"request": "...", "id"?: ..., "leader"?: ..., "expected"?: "specialist"}.
+        Yields one result object per non-empty line; a line that cannot be
+        routed yields {"id": line_no, "error": "..."} and the batch goes on.
+        """
+        for line_no, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                item = json.loads(line)
+            except ValueError as e:
+                yield {'id': line_no, 'error': f"invalid JSON: {e}"}
+                continue
+            if not isinstance(item, dict):
+                yield {'id': line_no, 'error': "expected a JSON object"}
+                continue
+            if not isinstance(item.get('request'), str):
+                yield {'id': item.get('id', line_no), 'error': "missing \"request\" string"}
+                continue
+            
+            targets = [item['leader']] if item.get('leader') else leaders
+            try:
+                matches = self.route(item['request'], targets)
+            except FileNotFoundError as e:
+                yield {'id': item.get('id', line_no), 'error': str(e)}
+                continue
+            best = matches[0] if matches else None
+            
+            result = {
+                'id': item.get('id', line_no),
+                'leader': best.leader if best else None,
+                'specialist': best.specialist if best else None,
+                'score': round(best.score, 3) if best else 0.0,
+                'matches': [m.to_dict() for m in matches[:top]]
+            }
+            if 'expected' in item:
+                result['expected'] = item['expected']
+                result['ok'] = result['specialist'] == item['expected']
+            yield result
@@ -0,0 +1,187 @@
+"""
+Scheduler - Dependency-aware execution of leaders and cross-leader workflows
+"""
+
+import os
+from dataclasses import dataclass, field
+from typing import Callable, List, Dict, Optional, Set
+
+
+LEADER = 'leader'
+WORKFLOW = 'workflow'
+
+
+@dataclass
+class Node:
+    """One unit of provisioning work"""
+    key: str
+    kind: str
+    name: str
+    payload: object
+    depends_on: List[str] = field(default_factory=list)
+
+
+class ProvisionGraph:
+    """DAG of leaders (optionally depending on each other) and integration workflows"""
+    
+    def __init__(self):
+        self.nodes: Dict[str, Node] = {}
+        self.errors: List[str] = []
+    
+    @staticmethod
+    def leader_key(name: str) -> str:
+        return f"{LEADER}:{name}"
+    
+    @staticmethod
+    def workflow_key(name: str) -> str:
+        return f"{WORKFLOW}:{name}"
+    
+    @classmethod
+    def from_manifest(cls, manifest, leaders: Optional[List] = None) -> 'ProvisionGraph':
+        """
+        Build the graph for a manifest
+        
+        Args:
+            manifest: Skills manifest
+            leaders: Leaders being provisioned (default: all). Dependencies on
+                manifest leaders outside this set are treated as already satisfied;
+                integration workflows none of whose leaders are in it are left out.
+        """
+        graph = cls()
+        all_leaders = {l.name for l in manifest.project.leaders} | set(manifest.project.leader_names)
+        selected = manifest.project.leaders if leaders is None else leaders
+        selected_names = {l.name for l in selected}
+        everything = selected_names >= all_leaders
+        
+        for leader in selected:
+            deps = []
+            for dep in leader.depends_on:
+                if dep not in all_leaders:
+                    graph.errors.append(f"Leader {leader.name} depends on unknown leader '{dep}'")
+                elif dep in selected_names:
+                    deps.append(cls.leader_key(dep))
+            graph.nodes[cls.leader_key(leader.name)] = Node(
+                key=cls.leader_key(leader.name), kind=LEADER, name=leader.name,
+                payload=leader, depends_on=deps
+            )
+        
+        for integration in manifest.project.integrations:
+            deps = []
+            for step in integration.sequence:
+                if step in all_leaders:
+                    if step in selected_names:
+                        deps.append(cls.leader_key(step))
+                elif step.endswith('-leader'):
+                    graph.errors.append(
+                        f"Integration workflow {integration.name} references unknown leader '{step}'"
+                    )
+            if not deps and not everything:
+                # None of its leaders is being provisioned (--affected-only, --only)
+                continue
+            graph.nodes[cls.workflow_key(integration.name)] = Node(
+                key=cls.workflow_key(integration.name), kind=WORKFLOW, name=integration.name,
+                payload=integration, depends_on=sorted(set(deps))
+            )
+        
+        graph.errors.extend(graph.find_cycles())
+        return graph
+    
+    def find_cycles(self) -> List[str]:
+        """Report each dependency cycle once"""
+        errors = []
+        state: Dict[str, int] = {}  # 1 = visiting, 2 = done
+        seen_cycles: Set[frozenset] = set()
+        
+        def visit(key: str, path: List[str]):
+            state[key] = 1
+            path.append(key)
+            for dep in self.nodes[key].depends_on:
+                if state.get(dep) == 1:
+                    cycle = path[path.index(dep):]
+                    if frozenset(cycle) not in seen_cycles:
+                        seen_cycles.add(frozenset(cycle))
+                        names = [self.nodes[k].name for k in cycle + [dep]]
+                        errors.append(f"Dependency cycle: {' → '.join(names)}")
+                elif dep not in state:
+                    visit(dep, path)
+            path.pop()
+            state[key] = 2
+        
+        for key in self.nodes:
+            if key not in state:
+                visit(key, [])
+        return errors
+    
+    def run(
+        self,
+        execute: Callable[[Node], bool],
+        max_workers: Optional[int] = None,
+        stop_on_failure: bool = False
+    ) -> Dict[str, Optional[bool]]:
+        """
+        Execute nodes as soon as their dependencies succeed
+        
+        Nodes downstream of a failure are skipped (None); independent branches
+        keep running unless stop_on_failure is set.
+        
+        Returns:
+            node key -> True/False, or None if skipped
+        """
+        # Not imported at module level: validate builds graphs but never runs them
+        from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+        
+        if self.errors:
+            raise ValueError("; ".join(self.errors))
+        
+        max_workers = max_workers or min(4, os.cpu_count() or 1)
+        results: Dict[str, Optional[bool]] = {}
+        remaining = {key: set(node.depends_on) for key, node in self.nodes.items()}
+        dependents: Dict[str, List[str]] = {key: [] for key in self.nodes}
+        for key, node in self.nodes.items():
+            for dep in node.depends_on:
+                dependents[dep].append(key)
+        
+        def skip(key: str):
+            for child in dependents[key]:
+                if child not in results:
+                    results[child] = None
+                    remaining.pop(child, None)
+                    skip(child)
+        
+        stopped = False
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            running = {}
+            
+            def submit_ready():
+                for key in [k for k, deps in remaining.items() if not deps]:
+                    del remaining[key]
+                    running[pool.submit(execute, self.nodes[key])] = key
+            
+            submit_ready()
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = running.pop(future)
+                    try:
+                        success = bool(future.result())
+                    except Exception as e:
+                        print(f"❌ {self.nodes[key].name}: {e}")
+                        success = False
+                    results[key] = success
+                    
+                    if success:
+                        for child in dependents[key]:
+                            if child in remaining:
+                                remaining[child].discard(key)
+                    else:
+                        skip(key)
+                        stopped = stopped or stop_on_failure
+                
+                if not stopped:
+                    submit_ready()
+        
+        # Never started because of stop_on_failure
+        for key in remaining:
+            results.setdefault(key, None)
+        
+        return results
@@ -0,0 +1,123 @@
+"""
+Tar Output - Write provisioned skills as one tar stream instead of into the project
+"""
+
+import io
+import csv
+import time
+import tarfile
+import threading
+from pathlib import Path
+from typing import BinaryIO, Dict, Optional, Set
+
+from .csv_merger import SmartCSVMerger
+from .memory import track
+
+
+def _sidecar_name(name: str) -> str:
+    """Archive name of a CSV's merge base (same layout as CSVBaseStore)"""
+    parent, _, filename = name.rpartition('/')
+    return f"{parent}/.{filename}.base" if parent else f".{filename}.base"
+
+
+def _normalize(name: str) -> str:
+    while name.startswith('./'):
+        name = name[2:]
+    return name
+
+
+class TarOutput:
+    """
+    Generated files streamed into a tar archive
+    
+    Member names are relative to the project root (_bmad/custom-skills/...),
+    so the archive extracts over a project or into an image layer. CSVs are
+    merged in memory with the same-named CSVs of an optional base tarball
+    (e.g. the tree of the previous image) using their .base sidecars, like
+    the on-disk merge; base members that were not regenerated are copied
+    through by close(). Leaders may add files from several threads.
+    """
+    
+    def __init__(self, fileobj: BinaryIO, project_root: Path, base: Optional[Path] = None):
+        self.project_root = project_root
+        self.base = base
+        self.tar = tarfile.open(fileobj=fileobj, mode='w|', format=tarfile.GNU_FORMAT)
+        self.mtime = int(time.time())
+        self.written: Set[str] = set()
+        self.merged = 0
+        self._lock = threading.Lock()
+        self._merger = SmartCSVMerger(primary_key_column=0)
+        # Optional MemoryTracker; merges are recorded as "csv merge"
+        self.memory = None
+        # Only CSVs and their sidecars are kept from the base; everything
+        # else is streamed from it again on close()
+        self._base_csvs: Dict[str, str] = {}
+        if base is not None:
+            with tarfile.open(base, 'r:*') as base_tar:
+                for member in base_tar:
+                    if member.isfile() and member.name.endswith(('.csv', '.csv.base')):
+                        data = base_tar.extractfile(member).read()
+                        self._base_csvs[_normalize(member.name)] = data.decode('utf-8')
+    
+    def _add(self, name: str, data: bytes, mode: int = 0o644) -> None:
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = self.mtime
+        # Only the executable bit of the source is kept, as in packaged archives
+        info.mode = 0o755 if mode & 0o111 else 0o644
+        self.tar.addfile(info, io.BytesIO(data))
+        self.written.add(name)
+    
+    def _add_csv(self, name: str, data: bytes, mode: int) -> None:
+        rows = list(csv.reader(io.StringIO(data.decode('utf-8'), newline='')))
+        if not rows:
+            self._add(name, data, mode)
+            return
+        
+        existing = self._base_csvs.get(name)
+        merged, sidecar, result = self._merger.merge_text(
+            existing, self._base_csvs.get(_sidecar_name(name)), rows[1:], rows[0]
+        )
+        if existing is not None:
+            self.merged += 1
+        self._add(name, merged.encode('utf-8'), mode)
+        self._add(_sidecar_name(name), sidecar.encode('utf-8'))
+    
+    def add_file(self, name: str, data: bytes, mode: int = 0o644) -> None:
+        """Add one generated file (CSVs are merged with the base)"""
+        name = _normalize(name)
+        with self._lock:
+            if name.endswith('.csv'):
+                with track(self.memory, 'csv merge'):
+                    self._add_csv(name, data, mode)
+            else:
+                self._add(name, data, mode)
+    
+    def submit(self, path: Path, data: bytes) -> None:
+        """Sink interface of the generator script: path is under the project root"""
+        self.add_file(Path(path).relative_to(self.project_root).as_posix(), data)
+    
+    def add_stream(self, prefix: str, fileobj: BinaryIO) -> int:
+        """Add every file of a tar stream under prefix; returns the number of files"""
+        count = 0
+        with tarfile.open(fileobj=fileobj, mode='r|*') as source:
+            for member in source:
+                if not member.isfile():
+                    continue
+                self.add_file(f"{prefix}/{_normalize(member.name)}", source.extractfile(member).read(), member.mode)
+                count += 1
+        return count
+    
+    def close(self) -> None:
+        """Copy base members that were not regenerated, then end the archive"""
+        with self._lock:
+            if self.base is not None:
+                with tarfile.open(self.base, 'r:*') as base_tar:
+                    for member in base_tar:
+                        name = _normalize(member.name)
+                        if member.isdir() or name in self.written:
+                            continue
+                        member.name = name
+                        self.tar.addfile(member, base_tar.extractfile(member) if member.isfile() else None)
+                        self.written.add(name)
+            self.tar.close()
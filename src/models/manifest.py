@@ -2,19 +2,44 @@
 Models for BMAD Provisioner - Skills Manifest parsing
 """
 
+import os
+import json
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 import yaml
 
+# libyaml parser when PyYAML was built with it (several times faster)
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
 
-@dataclass
+
+def load_yaml(path: Path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=YAML_LOADER)
+
+
+def leader_shard_paths(patterns: List[str], base_dir: Path) -> Dict[str, Path]:
+    """
+    Leader name -> shard file for the leader_files globs of a manifest
+    
+    A shard holds one leader and is named after it (leaders/dev-leader.yaml),
+    so leaders can be selected without opening their files.
+    """
+    shards: Dict[str, Path] = {}
+    for pattern in patterns:
+        for path in sorted(base_dir.glob(pattern)):
+            if path.is_file() and path.stem not in shards:
+                shards[path.stem] = path
+    return shards
+
+
+@dataclass(frozen=True)
 class Specialist:
-    """Specialist configuration"""
+    """Specialist configuration (immutable: one instance is shared by every leader using it)"""
     id: str
     name: str
     domain: str
-    skills: List[str]
+    skills: Tuple[str, ...]
     compliance_notes: Optional[str] = None
     
     @classmethod
@@ -23,11 +48,74 @@ class Specialist:
             id=data['id'],
             name=data['name'],
             domain=data['domain'],
-            skills=data['skills'],
+            skills=tuple(data['skills']),
             compliance_notes=data.get('compliance_notes')
         )
 
 
+class SpecialistLibrary:
+    """
+    Specialist definitions shared across leaders (project.specialist_library)
+    
+    A leader lists `- ref: frontend` to use a definition as is, or
+    `- extends: frontend` with the fields it overrides; library entries may
+    extend each other. Resolution is memoized on the resolved fields, so every
+    occurrence of the same specialist (referenced, extended identically or
+    repeated inline) is built once and the same Specialist is shared.
+    """
+    
+    def __init__(self, definitions: Optional[Dict[str, dict]] = None):
+        import threading
+        
+        self.definitions = definitions or {}
+        self.references = 0
+        self._merged: Dict[str, dict] = {}
+        self._resolved: Dict[str, Specialist] = {}
+        # Shards resolve from several threads
+        self._lock = threading.Lock()
+    
+    def definition(self, name: str, chain: Tuple[str, ...] = ()) -> dict:
+        """Fields of a library entry with its extends chain applied"""
+        if name in self._merged:
+            return self._merged[name]
+        if name in chain:
+            raise ValueError(f"specialist_library cycle: {' → '.join(chain + (name,))}")
+        if name not in self.definitions:
+            raise ValueError(f"Unknown specialist_library entry: '{name}'")
+        
+        data = dict(self.definitions[name])
+        base = data.pop('extends', None)
+        merged = {**self.definition(base, chain + (name,)), **data} if base else data
+        merged['id'] = data.get('id', name)
+        self._merged[name] = merged
+        return merged
+    
+    def resolve(self, data: dict) -> Specialist:
+        """Specialist for one entry of a leader's specialists list"""
+        with self._lock:
+            if 'ref' in data:
+                if len(data) > 1:
+                    raise ValueError(f"ref: {data['ref']} cannot override fields (use extends:)")
+                fields = self.definition(data['ref'])
+            elif 'extends' in data:
+                overrides = {k: v for k, v in data.items() if k != 'extends'}
+                fields = {**self.definition(data['extends']), **overrides}
+            else:
+                fields = data
+            
+            self.references += 1
+            key = json.dumps(fields, sort_keys=True, default=str)
+            specialist = self._resolved.get(key)
+            if specialist is None:
+                specialist = self._resolved[key] = Specialist.from_dict(fields)
+            return specialist
+    
+    @property
+    def unique(self) -> int:
+        """Distinct specialists built so far"""
+        return len(self._resolved)
+
+
 @dataclass
 class Leader:
     """Leader skill configuration"""
@@ -35,15 +123,18 @@ class Leader:
     domain: str
     specialists: List[Specialist]
     phase: str = '3-arch'
+    depends_on: List[str] = field(default_factory=list)
     
     @classmethod
-    def from_dict(cls, data: dict) -> 'Leader':
-        specialists = [Specialist.from_dict(s) for s in data['specialists']]
+    def from_dict(cls, data: dict, library: Optional[SpecialistLibrary] = None) -> 'Leader':
+        library = library or SpecialistLibrary()
+        specialists = [library.resolve(s) for s in data['specialists']]
         return cls(
             name=data['name'],
             domain=data['domain'],
             specialists=specialists,
-            phase=data.get('phase', '3-arch')
+            phase=data.get('phase', '3-arch'),
+            depends_on=data.get('depends_on', [])
         )
 
 
@@ -88,14 +179,50 @@ class Project:
     leaders: List[Leader]
     customizations: Dict[str, Customization]
     integrations: List[WorkflowIntegration]
+    # Every leader the manifest declares, including shards that were not
+    # loaded because of an `only` selection
+    leader_names: List[str] = field(default_factory=list)
+    specialist_library: SpecialistLibrary = field(default_factory=SpecialistLibrary)
     
     @classmethod
-    def from_dict(cls, data: dict) -> 'Project':
-        leaders = [Leader.from_dict(l) for l in data['leaders']]
+    def from_dict(
+        cls,
+        data: dict,
+        base_dir: Optional[Path] = None,
+        only: Optional[List[str]] = None,
+        max_workers: Optional[int] = None
+    ) -> 'Project':
+        """
+        Build a project from the manifest's project mapping
+        
+        Args:
+            data: project mapping
+            base_dir: Directory leader_files globs are relative to (default: cwd)
+            only: Leaders to load (default: all); other shards are never opened
+            max_workers: Threads parsing shards (default: min(8, CPUs))
+        """
+        inline = data.get('leaders', [])
+        shards = leader_shard_paths(data.get('leader_files', []), base_dir or Path.cwd())
+        
+        leader_names = [l['name'] for l in inline] + list(shards)
+        if only is not None:
+            unknown = [name for name in only if name not in leader_names]
+            if unknown:
+                raise ValueError(f"Unknown leader(s): {', '.join(unknown)}")
+            inline = [l for l in inline if l['name'] in only]
+            shards = {name: path for name, path in shards.items() if name in only}
+        
+        library = SpecialistLibrary(data.get('specialist_library') or {})
+        leaders = [Leader.from_dict(l, library) for l in inline]
         customizations = {
             name: Customization.from_dict(custom)
             for name, custom in data.get('customizations', {}).items()
         }
+        for leader, customization in cls._load_shards(shards, library, max_workers):
+            leaders.append(leader)
+            if customization is not None:
+                customizations[leader.name] = customization
+        
         integrations = [
             WorkflowIntegration.from_dict(i) 
             for i in data.get('integration', {}).get('workflows', [])
@@ -107,8 +234,33 @@ class Project:
             root=Path(data['root']).expanduser(),
             leaders=leaders,
             customizations=customizations,
-            integrations=integrations
+            integrations=integrations,
+            leader_names=leader_names,
+            specialist_library=library
         )
+    
+    @staticmethod
+    def _load_shards(
+        shards: Dict[str, Path],
+        library: SpecialistLibrary,
+        max_workers: Optional[int] = None
+    ) -> List[tuple]:
+        """Parse leader shards in parallel; returns (Leader, Customization or None) in shard order"""
+        def load(item):
+            name, path = item
+            data = load_yaml(path) or {}
+            data.setdefault('name', name)
+            if data['name'] != name:
+                raise ValueError(f"{path}: leader '{data['name']}' must be in {data['name']}.yaml")
+            customization = data.get('customization')
+            return Leader.from_dict(data, library), Customization.from_dict(customization) if customization else None
+        
+        if len(shards) < 2:
+            return [load(item) for item in shards.items()]
+        # Not imported at module level: unsharded manifests never need it
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=max_workers or min(8, os.cpu_count() or 1)) as pool:
+            return list(pool.map(load, shards.items()))
 
 
 @dataclass
@@ -117,12 +269,17 @@ class SkillsManifest:
     project: Project
     
     @classmethod
-    def from_yaml(cls, yaml_path: Path) -> 'SkillsManifest':
-        """Load manifest from YAML file"""
-        with open(yaml_path, 'r') as f:
-            data = yaml.safe_load(f)
+    def from_yaml(cls, yaml_path: Path, only: Optional[List[str]] = None) -> 'SkillsManifest':
+        """
+        Load manifest from YAML file
+        
+        Leaders are declared inline under project.leaders and/or as one file
+        per leader matched by project.leader_files globs (relative to the
+        manifest). With only, just those leaders are parsed.
+        """
+        data = load_yaml(yaml_path)
         
-        project = Project.from_dict(data['project'])
+        project = Project.from_dict(data['project'], base_dir=Path(yaml_path).parent, only=only)
         return cls(project=project)
     
     def validate(self, project_root: Optional[Path] = None) -> List[str]:
@@ -141,8 +298,8 @@ class SkillsManifest:
         if not bmad_path.exists():
             errors.append(f"BMAD not installed at {root_to_check}")
         
-        # Check leader names are unique
-        leader_names = [l.name for l in self.project.leaders]
+        # Check leader names are unique (inline and sharded)
+        leader_names = self.project.leader_names or [l.name for l in self.project.leaders]
         if len(leader_names) != len(set(leader_names)):
             errors.append("Duplicate leader names found")
         
@@ -0,0 +1,151 @@
+"""
+Tests for core.analyzer: the saved gap analysis is reused across runs and
+never written into the project, generated files or leaders the manifest no
+longer produces are reported as EXTRA without touching user files, and
+iter_analysis / --format ndjson stream records as results are known
+"""
+
+import os
+import sys
+import json
+import time
+import subprocess
+from pathlib import Path
+
+from core.analyzer import ChangeType, GapAnalyzer
+from models.manifest import SkillsManifest
+
+MANIFEST = """project:
+  name: analyzer-test
+  bmad_version: v6.x
+  root: {root}
+  leaders:
+    - name: dev-leader
+      domain: generic
+      specialists: [{{id: backend, name: Backend, domain: APIs, skills: [REST]}}]
+    - name: qa-leader
+      domain: generic
+      specialists: [{{id: unit, name: Unit, domain: pytest, skills: [TDD]}}]
+"""
+
+
+def test_saved_report_is_reused_and_kept_out_of_the_project(tmp_path, monkeypatch):
+    monkeypatch.setenv('BMAD_PROVISIONER_CACHE', str(tmp_path / "cache"))
+    project = tmp_path / "project"
+    (project / "_bmad" / "_config").mkdir(parents=True)
+    (project / "_bmad" / "_config" / "manifest.yaml").write_text("installation:\n  version: 6.0.0\n")
+    (project / "_bmad" / "custom-skills" / "dev-leader" / "agents").mkdir(parents=True)
+    (project / "_bmad" / "custom-skills" / "dev-leader" / "SKILL.md").write_text("skill")
+    manifest_path = project / "skills-manifest.yaml"
+    manifest_path.write_text(MANIFEST.format(root=project))
+    manifest = SkillsManifest.from_yaml(manifest_path)
+    # Older than the racy window, so the report gets saved
+    stamp = time.time() - 60
+    for dirpath, dirnames, filenames in os.walk(project):
+        for name in dirnames + filenames:
+            os.utime(os.path.join(dirpath, name), (stamp, stamp))
+    before = sorted(p.relative_to(project) for p in project.rglob('*'))
+    
+    first = GapAnalyzer(project)
+    report = first.analyze(manifest)
+    second = GapAnalyzer(project)
+    
+    assert not first.context.reused
+    assert second.analyze(manifest).to_dict() == report.to_dict()
+    assert second.context.reused
+    assert first.report_path.is_file()
+    assert sorted(p.relative_to(project) for p in project.rglob('*')) == before
+
+
+def write(root, files):
+    for rel in files:
+        (root / rel).parent.mkdir(parents=True, exist_ok=True)
+        (root / rel).write_text(rel)
+
+
+def test_extras_and_orphans_are_generated_files_only(tmp_path, monkeypatch):
+    monkeypatch.setenv('BMAD_PROVISIONER_CACHE', str(tmp_path / "cache"))
+    project = tmp_path / "project"
+    skills = project / "_bmad" / "custom-skills"
+    write(skills, [
+        "dev-leader/SKILL.md", "dev-leader/agents/leader-dev.md", "dev-leader/agents/specialist-backend.md",
+        # Generated for a specialist or a specialist count the manifest no longer has
+        "dev-leader/agents/specialist-old.md", "dev-leader/references/knowledge-old.md",
+        "dev-leader/workflows/dev-multi.yaml",
+        # User files inside a leader
+        "dev-leader/agents/my-notes.md", "dev-leader/data/custom.csv",
+        "old-leader/agents/leader-old.md", "old-leader/SKILL.md",
+        "my-skill/SKILL.md", ".hidden/agents/leader-x.md",
+        "qa-leader/agents/leader-qa.md",
+        "_integrations/workflows/gone.yaml",
+    ])
+    manifest_path = project / "skills-manifest.yaml"
+    manifest_path.write_text(MANIFEST.format(root=project))
+    
+    report = GapAnalyzer(project).analyze(SkillsManifest.from_yaml(manifest_path, only=['dev-leader']))
+    
+    dev = report.leaders[0]
+    assert {f.path.relative_to(skills).as_posix(): f.details for f in dev.extras} == {
+        "dev-leader/agents/specialist-old.md": "Specialist not in manifest",
+        "dev-leader/references/knowledge-old.md": "Specialist not in manifest",
+        "dev-leader/workflows/dev-multi.yaml": "Not generated for this manifest",
+    }
+    # qa-leader is only left out by --only; my-skill and .hidden were not generated
+    assert [(f.path.relative_to(skills).as_posix(), f.details) for f in report.orphans] == [
+        ("_integrations/workflows/gone.yaml", "Integration not in manifest"),
+        ("old-leader", "Leader not in manifest (2 files)"),
+    ]
+    assert all(f.change_type == ChangeType.EXTRA for f in report.extras)
+    assert len(report.extras) == 5
+
+
+def stream_project(tmp_path):
+    project = tmp_path / "project"
+    write(project / "_bmad", [
+        "custom-skills/dev-leader/SKILL.md", "custom-skills/dev-leader/agents/leader-dev.md",
+        "custom-skills/dev-leader/agents/specialist-old.md", "custom-skills/old-leader/agents/leader-old.md",
+        "_config/manifest.yaml",
+    ])
+    (project / "_bmad" / "_config" / "manifest.yaml").write_text("installation:\n  version: 6.0.0\n")
+    (project / "skills-manifest.yaml").write_text(MANIFEST.format(root=project))
+    return project
+
+
+def test_iter_analysis_streams_each_leader_then_orphans(tmp_path, monkeypatch):
+    monkeypatch.setenv('BMAD_PROVISIONER_CACHE', str(tmp_path / "cache"))
+    project = stream_project(tmp_path)
+    manifest = SkillsManifest.from_yaml(project / "skills-manifest.yaml")
+    
+    records = [(kind, leader) for kind, leader, _ in GapAnalyzer(project).iter_analysis(manifest)]
+    
+    assert records == [('file', 'dev-leader')] * 5 + [('leader', 'dev-leader'), ('file', 'qa-leader'),
+                                                       ('leader', 'qa-leader'), ('orphan', None)]
+    # A second pass replays the same stream from the kept report
+    analyzer = GapAnalyzer(project)
+    first = [(kind, leader, status.to_dict()) for kind, leader, status in analyzer.iter_analysis(manifest)]
+    second = [(kind, leader, status.to_dict()) for kind, leader, status in analyzer.iter_analysis(manifest)]
+    assert first == second
+
+
+def test_ndjson_stdout_is_one_record_per_line(tmp_path):
+    project = stream_project(tmp_path)
+    script = Path(__file__).resolve().parents[1] / "bmad_provisioner.py"
+    env = {**os.environ, 'BMAD_PROVISIONER_CACHE': str(tmp_path / "cache")}
+    
+    result = subprocess.run(
+        [sys.executable, str(script), '--config', str(project / "skills-manifest.yaml"),
+         '--mode', 'analyze', '--format', 'ndjson'],
+        capture_output=True, text=True, env=env, check=True
+    )
+    
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [r['type'] for r in records] == ['analysis'] + ['file'] * 5 + ['leader', 'file', 'leader', 'orphan', 'summary']
+    assert all(r['project'] == str(project) for r in records)
+    assert records[0]['bmad_version'] == '6.0.0'
+    assert {r['leader'] for r in records if r['type'] == 'file'} == {'dev-leader', 'qa-leader'}
+    assert set(records[1]) == {'project', 'type', 'leader', 'path', 'change', 'details'}
+    leader = records[6]
+    assert leader['name'] == 'dev-leader' and 'files' not in leader
+    assert records[-2]['path'].endswith("old-leader")
+    assert records[-1]['recommendations']
+    assert "Validating manifest" in result.stderr
@@ -0,0 +1,98 @@
+"""
+Tests for core.backup_store: snapshots deduplicate content, restore whole
+leaders or single files with their modes, prune per leader and verify objects
+"""
+
+import pytest
+
+from core.backup_store import BackupArchive
+
+
+@pytest.fixture
+def skills(tmp_path):
+    root = tmp_path / "custom-skills"
+    for leader_name in ('dev-leader', 'qa-leader'):
+        (root / leader_name / "data").mkdir(parents=True)
+        (root / leader_name / "SKILL.md").write_text(f"# {leader_name}\n")
+        (root / leader_name / "data" / "shared.csv").write_text("keyword\nsame\n")
+    (root / "dev-leader" / "run.sh").write_text("#!/bin/sh\n")
+    (root / "dev-leader" / "run.sh").chmod(0o755)
+    return root
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return BackupArchive(tmp_path / ".backups")
+
+
+def test_snapshot_stores_identical_content_once(archive, skills):
+    snapshot = archive.create_snapshot(skills, ['dev-leader', 'qa-leader'])
+    
+    assert sorted(snapshot.files) == [
+        'dev-leader/SKILL.md', 'dev-leader/data/shared.csv', 'dev-leader/run.sh',
+        'qa-leader/SKILL.md', 'qa-leader/data/shared.csv',
+    ]
+    assert snapshot.files['dev-leader/data/shared.csv'].digest == snapshot.files['qa-leader/data/shared.csv'].digest
+    assert len(list(archive.objects_dir.glob("*/*.xz"))) == 4
+    assert archive.load_snapshot(snapshot.snapshot_id).files == snapshot.files
+
+
+def test_extract_one_leader_keeps_modes(archive, skills, tmp_path):
+    snapshot = archive.create_snapshot(skills, ['dev-leader', 'qa-leader'])
+    dest = tmp_path / "restored"
+    
+    assert archive.extract(snapshot, dest, 'dev-leader') == 3
+    assert sorted(p.relative_to(dest).as_posix() for p in dest.rglob("*") if p.is_file()) == [
+        'SKILL.md', 'data/shared.csv', 'run.sh'
+    ]
+    assert (dest / "SKILL.md").read_text() == "# dev-leader\n"
+    assert (dest / "run.sh").stat().st_mode & 0o777 == 0o755
+
+
+def test_restore_single_file(archive, skills, tmp_path):
+    snapshot = archive.create_snapshot(skills, ['qa-leader'])
+    (skills / "qa-leader" / "SKILL.md").write_text("edited\n")
+    
+    assert archive.restore_file(snapshot, 'qa-leader/SKILL.md', skills / "qa-leader" / "SKILL.md")
+    assert (skills / "qa-leader" / "SKILL.md").read_text() == "# qa-leader\n"
+    assert not archive.restore_file(snapshot, 'qa-leader/missing.md', tmp_path / "missing.md")
+    assert not (tmp_path / "missing.md").exists()
+
+
+def test_prune_keeps_newest_snapshots_per_leader(archive, skills):
+    quiet = archive.create_snapshot(skills, ['qa-leader'])
+    busy = []
+    for n in range(3):
+        (skills / "dev-leader" / "SKILL.md").write_text(f"# dev-leader v{n}\n")
+        busy.append(archive.create_snapshot(skills, ['dev-leader']))
+    
+    stats = archive.prune(1)
+    
+    assert [s.snapshot_id for s in archive.list_snapshots()] == [quiet.snapshot_id, busy[-1].snapshot_id]
+    assert (stats['snapshots'], stats['objects']) == (2, 2)
+    assert stats['bytes'] > 0
+    assert archive.verify() == []
+
+
+def test_prune_keeps_a_snapshot_still_newest_for_one_of_its_leaders(archive, skills):
+    both = archive.create_snapshot(skills, ['dev-leader', 'qa-leader'])
+    dev_only = archive.create_snapshot(skills, ['dev-leader'])
+    
+    archive.prune(1)
+    
+    assert [s.snapshot_id for s in archive.list_snapshots()] == [both.snapshot_id, dev_only.snapshot_id]
+    assert archive.prune(0)['snapshots'] == 2
+    assert archive.disk_usage() == 0
+
+
+def test_verify_reports_missing_and_corrupt_objects(archive, skills):
+    snapshot = archive.create_snapshot(skills, ['dev-leader'])
+    assert archive.verify() == []
+    
+    archive.object_path(snapshot.files['dev-leader/SKILL.md'].digest).unlink()
+    archive.object_path(snapshot.files['dev-leader/run.sh'].digest).write_bytes(b"not xz")
+    
+    errors = archive.verify()
+    assert len(errors) == 2
+    assert any("dev-leader/SKILL.md: object missing" in e for e in errors)
+    assert any("dev-leader/run.sh: object corrupt" in e for e in errors)
@@ -0,0 +1,159 @@
+"""
+Tests for core.csv_merger: the spilled merge writes the same CSV, sidecar and
+statistics as the in-memory merge, three-way merges keep user edits, and
+sidecars from an older format fall back to the two-way rule
+"""
+
+import json
+import shutil
+
+import pytest
+
+from core.csv_merger import CSVBaseStore, SmartCSVMerger
+from core.memory import MemoryBudget
+
+HEADERS = ['keyword', 'category', 'risk_level']
+
+
+def provision(csv_path, generated, edited=None):
+    """Generate a CSV (and its sidecar), then replace its rows like a user would"""
+    SmartCSVMerger().merge(csv_path, generated, HEADERS)
+    if edited is not None:
+        SmartCSVMerger().write_csv(csv_path, HEADERS, edited)
+
+
+def stats(result):
+    return (result.new_rows, result.preserved_rows, result.updated_rows,
+            result.custom_rows, result.removed_rows, result.three_way)
+
+
+@pytest.fixture
+def merge_both(tmp_path):
+    """Merge into two copies of a project CSV, in memory and spilled; both must agree"""
+    def run(setup, new_rows, headers=HEADERS):
+        memory_csv = tmp_path / "memory" / "keywords.csv"
+        memory_csv.parent.mkdir()
+        setup(memory_csv)
+        spill_dir = tmp_path / "spill"
+        shutil.copytree(memory_csv.parent, spill_dir)
+        spill_csv = spill_dir / memory_csv.name
+        
+        merger = SmartCSVMerger()
+        in_memory = merger.merge(memory_csv, new_rows, headers)
+        spilled = merger.merge(spill_csv, new_rows, headers, budget=MemoryBudget(0))
+        
+        assert in_memory.spilled_rows is None
+        assert spilled.spilled_rows == in_memory.total_rows
+        assert spill_csv.read_bytes() == memory_csv.read_bytes()
+        assert CSVBaseStore(spill_csv).path.read_bytes() == CSVBaseStore(memory_csv).path.read_bytes()
+        assert stats(spilled) == stats(in_memory)
+        assert sorted(p.name for p in spill_dir.iterdir()) == sorted(p.name for p in memory_csv.parent.iterdir())
+        return in_memory
+    return run
+
+
+def test_fresh_and_custom_rows(merge_both):
+    result = merge_both(
+        lambda path: provision(path, [['b', 'x', 'low']], [['b', 'x', 'low'], ['mine', 'user', 'high']]),
+        [['c', 'y', 'high'], ['b', 'x', 'medium'], ['a', 'z', 'low']]
+    )
+    assert result.merged_rows == [
+        ['mine', 'user', 'high'], ['b', 'x', 'medium'], ['a', 'z', 'low'], ['c', 'y', 'high']
+    ]
+
+
+def test_duplicate_keys_last_row_wins(merge_both):
+    edited = [['a', 'x', 'low'], ['mine', 'first', 'low'], ['A', 'x', 'critical'], ['Mine', 'second', 'low']]
+    result = merge_both(
+        lambda path: provision(path, [['a', 'x', 'low']], edited),
+        [['a', 'x', 'high'], ['b', 'y', 'low'], ['B', 'y', 'medium']]
+    )
+    assert result.merged_rows == [['Mine', 'second', 'low'], ['A', 'x', 'critical'], ['B', 'y', 'medium']]
+
+
+def test_header_only_csv(merge_both):
+    result = merge_both(
+        lambda path: path.write_text("keyword,category,risk_level\n"),
+        [['b', 'y', 'low'], ['a', 'x', 'high']]
+    )
+    assert result.merged_rows == [['a', 'x', 'high'], ['b', 'y', 'low']]
+    assert not result.three_way
+
+
+def test_headers_taken_from_existing_csv(merge_both):
+    result = merge_both(
+        lambda path: path.write_text("keyword,category,risk_level\na,x,low\n"),
+        [['a', 'x', 'low'], ['b', 'y', 'high']],
+        headers=None
+    )
+    assert result.merged_rows == [['a', 'x', 'low'], ['b', 'y', 'high']]
+
+
+def test_rows_without_base_use_two_way_rule(merge_both):
+    result = merge_both(
+        lambda path: path.write_text("keyword,category,risk_level\na,x, low \nb,y,Low\nc,z,low\n"),
+        [['a', 'x', 'high'], ['b', 'y', 'low'], ['c', 'z', 'low']]
+    )
+    # a: template changed, b: user changed case, c: untouched
+    assert result.merged_rows == [['a', 'x', ' low '], ['b', 'y', 'Low'], ['c', 'z', 'low']]
+    assert (result.preserved_rows, result.updated_rows) == (2, 1)
+    assert not result.three_way
+
+
+def test_rows_removed_by_template(merge_both):
+    generated = [['a', 'x', 'low'], ['b', 'y', 'low'], ['c', 'z', 'low']]
+    result = merge_both(
+        lambda path: provision(path, generated, [['a', 'x', 'low'], ['b', 'y', 'high'], ['c', 'z', 'low']]),
+        [['c', 'z', 'low']]
+    )
+    # a was never edited and goes away, b was edited and stays as a custom row
+    assert result.merged_rows == [['b', 'y', 'high'], ['c', 'z', 'low']]
+    assert (result.removed_rows, result.custom_rows) == (1, 1)
+    assert result.three_way
+
+
+def test_three_way_merge_per_cell(merge_both):
+    generated = [['a', 'x', 'low'], ['b', 'y', 'low'], ['c', 'z', 'low']]
+    edited = [['a', 'x', 'Low'], ['b', 'mine', 'low'], ['c', 'z', 'low']]
+    result = merge_both(
+        lambda path: provision(path, generated, edited),
+        [['a', 'x', 'high'], ['b', 'y', 'high'], ['c', 'z', 'high']]
+    )
+    # a: the case-only edit wins, b: user and template cells combine, c: template update
+    assert result.merged_rows == [['a', 'x', 'Low'], ['b', 'mine', 'high'], ['c', 'z', 'high']]
+    assert (result.preserved_rows, result.updated_rows) == (2, 1)
+
+
+def test_merge_text_three_way_against_its_own_sidecar():
+    merger = SmartCSVMerger()
+    generated, sidecar, first = merger.merge_text(None, None, [['a', 'x', 'low'], ['b', 'y', 'low']], HEADERS)
+    assert not first.three_way
+    edited = generated.replace("b,y,low", "b,y,HIGH") + "mine,user,low\r\n"
+    
+    merged, _, result = merger.merge_text(edited, sidecar, [['a', 'x', 'medium'], ['b', 'y', 'medium']], HEADERS)
+    
+    assert merged == "keyword,category,risk_level\r\nmine,user,low\r\na,x,medium\r\nb,y,HIGH\r\n"
+    assert result.three_way
+    assert (result.updated_rows, result.preserved_rows, result.custom_rows) == (1, 1, 1)
+
+
+def test_two_way_rule_ignores_whitespace_but_not_case():
+    merger = SmartCSVMerger()
+    
+    assert not merger._has_user_modifications(['a', ' x ', 'low'], ['a', 'x', 'low'])
+    assert merger._has_user_modifications(['a', 'x', 'LOW'], ['a', 'x', 'low'])
+    assert merger._has_user_modifications(['a', 'x'], ['a', 'x', 'low'])
+
+
+def test_sidecar_of_an_older_format_falls_back_to_two_way():
+    merger = SmartCSVMerger()
+    generated, sidecar, _ = merger.merge_text(None, None, [['a', 'x', 'low'], ['b', 'y', 'low']], HEADERS)
+    old = json.loads(sidecar)
+    old['version'] -= 1
+    
+    assert CSVBaseStore.loads(json.dumps(old)) is None
+    merged, _, result = merger.merge_text(generated, json.dumps(old), [['b', 'y', 'high']], HEADERS)
+    # Without a base, a dropped row looks custom and a template update looks like an edit
+    assert merged == "keyword,category,risk_level\r\na,x,low\r\nb,y,low\r\n"
+    assert not result.three_way
+    assert (result.custom_rows, result.removed_rows, result.preserved_rows) == (1, 0, 1)
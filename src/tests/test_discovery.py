@@ -0,0 +1,40 @@
+"""
+Tests for core.discovery: odd BMAD manifests leave the version unknown
+"""
+
+import pytest
+
+from core.discovery import ProjectDiscovery
+
+
+def project(tmp_path, manifest_text):
+    config = tmp_path / "_bmad" / "_config"
+    config.mkdir(parents=True)
+    (config / "manifest.yaml").write_text(manifest_text)
+    (tmp_path / "_bmad" / "custom-skills" / "dev-leader").mkdir(parents=True)
+    return tmp_path
+
+
+def test_reads_version_and_modules(tmp_path):
+    found = ProjectDiscovery.inspect(project(
+        tmp_path, "installation:\n  version: 6.0.0\nmodules:\n  - {name: bmm, version: 6.0.0}\n"
+    ))
+    assert found.bmad_version == "6.0.0"
+    assert found.modules == {'bmm': '6.0.0'}
+    assert found.leaders == ['dev-leader']
+
+
+@pytest.mark.parametrize('manifest_text', [
+    "- just\n- a list\n",
+    "plain string\n",
+    "installation: [6.0.0]\n",
+    "installation: 6.0.0\nmodules: bmm\n",
+    "installation: {version: {major: 6}}\n",
+    "installation: [unclosed\n",
+    "",
+])
+def test_unexpected_manifest_leaves_version_unknown(tmp_path, manifest_text):
+    found = ProjectDiscovery.inspect(project(tmp_path, manifest_text))
+    assert found.bmad_version is None
+    assert found.modules == {}
+    assert found.leaders == ['dev-leader']
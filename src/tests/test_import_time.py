@@ -0,0 +1,82 @@
+"""
+Tests for lazy imports: each CLI mode, run under `python -X importtime`,
+must not import the subsystems of other modes
+"""
+
+import os
+import sys
+import subprocess
+from pathlib import Path
+from typing import List
+
+import pytest
+
+CLI = Path(__file__).parent.parent / "bmad_provisioner.py"
+
+# Modules a mode must not import
+FORBIDDEN = {
+    'validate': [
+        'core.generator', 'core.analyzer', 'core.csv_merger', 'core.scheduler', 'core.memory',
+        'subprocess', 'concurrent.futures', 'threading',
+    ],
+    'analyze': ['core.generator', 'core.csv_merger', 'core.memory', 'concurrent.futures'],
+    'diff': ['core.generator', 'core.csv_merger', 'core.memory', 'concurrent.futures'],
+    'impact': ['core.generator', 'core.csv_merger', 'core.memory', 'concurrent.futures'],
+    'verify': ['core.generator', 'core.analyzer', 'core.memory'],
+    'backups': ['core.analyzer', 'core.csv_merger', 'subprocess'],
+    'discover': ['models.manifest', 'core.generator', 'core.analyzer', 'core.memory'],
+}
+
+MANIFEST = """project:
+  name: import-test
+  bmad_version: v6.x
+  root: {root}
+  leaders:
+    - name: dev-leader
+      domain: generic
+      specialists:
+        - id: backend
+          name: Backend Developer
+          domain: FastAPI
+          skills: [REST APIs]
+"""
+
+
+def imported_modules(stderr: str) -> List[str]:
+    """Module names from -X importtime output"""
+    return [
+        line.rsplit('|', 1)[1].strip()
+        for line in stderr.splitlines()
+        if line.startswith('import time:') and 'self [us]' not in line
+    ]
+
+
+@pytest.fixture(scope='module')
+def project(tmp_path_factory):
+    root = tmp_path_factory.mktemp("import-project")
+    config = root / "_bmad" / "_config"
+    config.mkdir(parents=True)
+    (config / "manifest.yaml").write_text("installation:\n  version: 6.0.0\nmodules: []\n")
+    (config / "files-manifest.csv").write_text("type,name,module,path,hash\n")
+    manifest = root / "skills-manifest.yaml"
+    manifest.write_text(MANIFEST.format(root=root))
+    return root, manifest
+
+
+def mode_args(mode: str, root: Path, manifest: Path) -> List[str]:
+    if mode == 'discover':
+        return [str(CLI), '--mode', 'discover', '--discover-root', str(root)]
+    return [str(CLI), '--config', str(manifest), '--mode', mode]
+
+
+@pytest.mark.parametrize('mode', sorted(FORBIDDEN))
+def test_mode_does_not_import_other_subsystems(project, tmp_path, mode):
+    root, manifest = project
+    env = dict(os.environ, BMAD_PROVISIONER_CACHE=str(tmp_path / "cache"))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime'] + mode_args(mode, root, manifest),
+        capture_output=True, text=True, env=env
+    )
+    modules = imported_modules(result.stderr)
+    assert 'models.manifest' in modules or mode == 'discover', result.stderr[-2000:]
+    assert [m for m in FORBIDDEN[mode] if m in modules] == []
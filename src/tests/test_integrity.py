@@ -0,0 +1,28 @@
+"""
+Tests for core.integrity: verify reuses its stat cache without writing to the project
+"""
+
+import hashlib
+
+from core.integrity import IntegrityVerifier
+
+
+def test_verify_keeps_its_stat_cache_out_of_the_project(tmp_path, monkeypatch):
+    monkeypatch.setenv('BMAD_PROVISIONER_CACHE', str(tmp_path / "cache"))
+    project = tmp_path / "project"
+    (project / "_bmad" / "_config").mkdir(parents=True)
+    (project / "_bmad" / "core").mkdir()
+    (project / "_bmad" / "core" / "agent.md").write_text("agent")
+    digest = hashlib.sha256(b"agent").hexdigest()
+    (project / "_bmad" / "_config" / "files-manifest.csv").write_text(
+        f"type,name,module,path,hash\nmd,agent,core,core/agent.md,{digest}\n"
+    )
+    before = sorted(p.relative_to(project) for p in project.rglob('*'))
+    
+    first = IntegrityVerifier(project).verify()
+    second = IntegrityVerifier(project).verify()
+    
+    assert first.is_intact and (first.hashed, first.cached) == (1, 0)
+    assert second.is_intact and (second.hashed, second.cached) == (0, 1)
+    assert sorted(p.relative_to(project) for p in project.rglob('*')) == before
+    assert IntegrityVerifier(project).cache_path.is_file()
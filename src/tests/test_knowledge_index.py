@@ -0,0 +1,100 @@
+"""
+Tests for core.knowledge_index: update() only re-tokenizes changed documents,
+the index lives outside the project, and search() ranks fragments with at most
+per_document hits from one file
+"""
+
+import pytest
+
+from core.knowledge_index import KnowledgeIndex
+
+FILLER = "filler words keep every fragment above the minimum token length here"
+
+
+def section(heading, text):
+    return f"## {heading}\n\n{text} {FILLER}\n\n"
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    monkeypatch.setenv('BMAD_PROVISIONER_CACHE', str(tmp_path / "cache"))
+    root = tmp_path / "project"
+    docs = root / "_bmad" / "bmm" / "docs"
+    docs.mkdir(parents=True)
+    (docs / "testing.md").write_text(
+        section("Unit tests", "pytest fixtures pytest markers pytest plugins")
+        + section("Integration tests", "pytest against a database")
+    )
+    (docs / "api.md").write_text(section("REST design", "endpoints versioning pagination pytest"))
+    (docs / "deploy.md").write_text(section("Releases", "containers rollout canary monitoring"))
+    (root / "_bmad" / "custom-skills" / "dev-leader").mkdir(parents=True)
+    (root / "_bmad" / "custom-skills" / "dev-leader" / "SKILL.md").write_text(section("Generated", "pytest " * 20))
+    return root
+
+
+@pytest.fixture
+def tokenized(monkeypatch):
+    """Record the documents _index_document() is asked to re-tokenize"""
+    calls = []
+    original = KnowledgeIndex._index_document
+    
+    def spy(self, rel):
+        calls.append(rel)
+        return original(self, rel)
+    
+    monkeypatch.setattr(KnowledgeIndex, '_index_document', spy)
+    return calls
+
+
+def test_update_retokenizes_only_changed_documents(project, tokenized):
+    assert KnowledgeIndex(project).update('6.0.0') == (3, 3, 0)
+    assert sorted(tokenized) == ['bmm/docs/api.md', 'bmm/docs/deploy.md', 'bmm/docs/testing.md']
+    
+    tokenized.clear()
+    assert KnowledgeIndex(project).update('6.0.0') == (3, 0, 0)
+    assert tokenized == []
+    
+    docs = project / "_bmad" / "bmm" / "docs"
+    (docs / "api.md").write_text(section("GraphQL design", "schemas resolvers"))
+    (docs / "deploy.md").unlink()
+    index = KnowledgeIndex(project)
+    
+    assert index.update('6.0.1') == (2, 1, 1)
+    assert tokenized == ['bmm/docs/api.md']
+    assert sorted(index.documents) == ['bmm/docs/api.md', 'bmm/docs/testing.md']
+    assert index.search("canary rollout") == []
+
+
+def test_index_is_stored_outside_the_project(project):
+    index = KnowledgeIndex(project)
+    index.update('6.0.0')
+    
+    assert index.index_path.is_file()
+    assert project not in index.index_path.parents
+    assert not (project / "_bmad" / ".cache").exists()
+
+
+def test_search_ranks_fragments_by_bm25(project):
+    index = KnowledgeIndex(project)
+    index.update('6.0.0')
+    
+    hits = index.search("pytest fixtures", top_k=5)
+    
+    assert [(h.fragment.path, h.fragment.heading) for h in hits] == [
+        ('bmm/docs/testing.md', 'Unit tests'), ('bmm/docs/api.md', 'REST design')
+    ]
+    assert hits[0].score > hits[1].score
+    assert hits[0].matched == ['pytest', 'fixtures']
+    assert hits[1].matched == ['pytest']
+
+
+def test_search_caps_hits_per_document(project):
+    index = KnowledgeIndex(project)
+    index.update('6.0.0')
+    
+    # Integration tests outranks REST design, but only one fragment per file by default
+    assert [h.fragment.heading for h in index.search("pytest", top_k=5)] == ['Unit tests', 'REST design']
+    assert [h.fragment.heading for h in index.search("pytest", top_k=5, per_document=2)] == [
+        'Unit tests', 'Integration tests', 'REST design'
+    ]
+    assert [h.fragment.heading for h in index.search("pytest", top_k=1, per_document=2)] == ['Unit tests']
@@ -0,0 +1,53 @@
+"""
+Tests for core.manifest_validator: empty values and complex keys are reported
+with their positions, with libyaml and with the pure-Python parser
+"""
+
+import yaml
+import pytest
+
+from core import manifest_validator
+from core.manifest_validator import ManifestValidator
+
+MANIFEST = """project:
+  name: validator-test
+  bmad_version: v6.x
+  root: {root}
+  leaders:
+    - name: dev-leader
+      domain: generic
+      specialists:
+        - {id: backend, name: ~, domain: APIs, skills: [REST, null, "", '']}
+        - {? [a, b] : c, id: frontend, name: Frontend, domain: UI, skills: [React]}
+    - name: qa-leader
+      ? {complex: key}
+      : ignored
+      domain: generic
+      specialists: [{id: unit, name: Unit, domain: pytest, skills: [TDD]}]
+"""
+
+
+@pytest.fixture(params=['libyaml', 'python'])
+def validate(request, tmp_path, monkeypatch):
+    if request.param == 'libyaml':
+        if not hasattr(yaml, 'CSafeLoader'):
+            pytest.skip("PyYAML built without libyaml")
+        monkeypatch.setattr(manifest_validator, 'YAML_LOADER', yaml.CSafeLoader)
+    else:
+        monkeypatch.setattr(manifest_validator, 'YAML_LOADER', yaml.SafeLoader)
+    
+    def run(text):
+        (tmp_path / "_bmad").mkdir()
+        path = tmp_path / "skills-manifest.yaml"
+        path.write_text(text.replace('{root}', str(tmp_path)))
+        return [(i.line, i.column, i.message) for i in ManifestValidator().validate_file(path)]
+    return run
+
+
+def test_empty_values_and_complex_keys_are_reported(validate):
+    assert validate(MANIFEST) == [
+        (9, 31, "specialist name must not be empty"),
+        (9, 63, "each entry of skills must not be empty"),
+        (10, 14, "A specialist keys must be plain names"),
+        (12, 9, "A leader keys must be plain names"),
+    ]
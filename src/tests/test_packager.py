@@ -0,0 +1,99 @@
+"""
+Tests for core.packager: archives are reproducible, reused while their digest
+holds, skip local state files, and replace only their own leader's older archives
+"""
+
+import os
+import zipfile
+
+import pytest
+
+from core.packager import SkillPackager, HAS_ZSTD
+
+
+def leader_tree(skills, leader, text="leader"):
+    root = skills / leader
+    (root / "agents").mkdir(parents=True, exist_ok=True)
+    (root / "data").mkdir(exist_ok=True)
+    (root / "SKILL.md").write_text(f"# {text}\n")
+    (root / "agents" / "leader.md").write_text("agent\n")
+    (root / "data" / "keywords.csv").write_text("keyword\nmine\n")
+    (root / "data" / ".keywords.csv.base").write_text("keyword\n")
+    (root / ".render-state.json").write_text("{}")
+    (root / "run.sh").write_text("#!/bin/sh\n")
+    (root / "run.sh").chmod(0o755)
+    return root
+
+
+@pytest.fixture
+def skills(tmp_path):
+    root = tmp_path / "custom-skills"
+    leader_tree(root, "dev-leader")
+    return root
+
+
+@pytest.mark.parametrize('archive_format', [
+    'zip',
+    pytest.param('tar.zst', marks=pytest.mark.skipif(not HAS_ZSTD, reason="zstandard not installed")),
+])
+def test_same_tree_gives_identical_bytes(skills, tmp_path, archive_format):
+    first = SkillPackager(skills, tmp_path / "first", archive_format).package(['dev-leader'])[0]
+    # Touching files changes mtimes but not the archive
+    for path in skills.rglob('*'):
+        os.utime(path, (1, 1))
+    second = SkillPackager(skills, tmp_path / "second", archive_format).package(['dev-leader'])[0]
+    
+    assert first.archive.name == second.archive.name
+    assert first.archive.read_bytes() == second.archive.read_bytes()
+    assert first.sha256 == second.sha256
+
+
+def test_unchanged_digest_reuses_the_archive(skills, tmp_path):
+    packager = SkillPackager(skills, tmp_path / "out")
+    first = packager.package(['dev-leader'])[0]
+    os.utime(first.archive, (1, 1))
+    
+    second = SkillPackager(skills, tmp_path / "out").package(['dev-leader'])[0]
+    
+    assert not first.reused and second.reused
+    assert second.archive == first.archive
+    assert second.sha256 == first.sha256
+    assert first.archive.stat().st_mtime == 1
+
+
+def test_local_state_files_are_not_packaged(skills, tmp_path):
+    result = SkillPackager(skills, tmp_path / "out").package(['dev-leader'])[0]
+    
+    with zipfile.ZipFile(result.archive) as archive:
+        assert archive.namelist() == [
+            'dev-leader/SKILL.md', 'dev-leader/agents/leader.md',
+            'dev-leader/data/keywords.csv', 'dev-leader/run.sh',
+        ]
+        assert archive.getinfo('dev-leader/run.sh').external_attr >> 16 == 0o100755
+    assert result.files == 4
+
+
+def test_changed_tree_replaces_the_stale_archive(skills, tmp_path):
+    out = tmp_path / "out"
+    first = SkillPackager(skills, out).package(['dev-leader'])[0]
+    (skills / "dev-leader" / "SKILL.md").write_text("# edited\n")
+    
+    second = SkillPackager(skills, out).package(['dev-leader'])[0]
+    
+    assert second.archive != first.archive
+    assert sorted(p.name for p in out.glob("*.zip")) == [second.archive.name]
+
+
+def test_prefix_named_leader_keeps_its_archives(skills, tmp_path):
+    leader_tree(skills, "qa")
+    leader_tree(skills, "qa-leader")
+    out = tmp_path / "out"
+    packager = SkillPackager(skills, out)
+    packaged = {r.leader: r for r in packager.package(['qa', 'qa-leader'])}
+    
+    (skills / "qa" / "SKILL.md").write_text("# qa v2\n")
+    qa = SkillPackager(skills, out).package(['qa'])[0]
+    
+    assert packaged['qa-leader'].archive.exists()
+    assert not packaged['qa'].archive.exists()
+    assert sorted(p.name for p in out.glob("*.zip")) == sorted([qa.archive.name, packaged['qa-leader'].archive.name])
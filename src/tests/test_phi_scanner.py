@@ -0,0 +1,57 @@
+"""
+Tests for core.phi_scanner: whole-word, case-insensitive keyword matching
+"""
+
+import pytest
+
+from core import phi_scanner
+from core.phi_scanner import PhiKeyword, PhiScanner, provisioner_paths
+
+
+@pytest.fixture
+def scan(tmp_path, monkeypatch):
+    """Scan text written to a file with the given keywords (optionally in tiny chunks)"""
+    def run(text, keywords, chunk_size=None):
+        if chunk_size:
+            monkeypatch.setattr(phi_scanner, 'CHUNK_SIZE', chunk_size)
+        path = tmp_path / "source.txt"
+        path.write_text(text, encoding='utf-8')
+        phi_scanner._init_worker(keywords)
+        hits, scanned = phi_scanner.scan_file(str(path))
+        assert scanned
+        return hits
+    return run
+
+
+def test_non_ascii_keywords_match_in_any_case(scan):
+    assert scan("Herr MÜLLER\nmüller\n", ['Müller']) == [(1, 'müller'), (2, 'müller')]
+
+
+def test_shorter_keyword_found_when_longer_fails_word_boundary(scan):
+    assert scan("medical recordings\n", ['medical record', 'medical']) == [(1, 'medical')]
+
+
+def test_keyword_inside_rejected_match_is_found(scan):
+    assert scan("xrecord id\n", ['record id', 'id']) == [(1, 'id')]
+
+
+def test_keywords_inside_words_are_ignored(scan):
+    assert scan("patients patient_name\n", ['patient']) == []
+
+
+@pytest.mark.parametrize('chunk_size', [3, 5, 7])
+def test_chunk_boundaries_do_not_split_matches(scan, chunk_size):
+    text = "é patient\nmédical\npatient é\n"
+    assert scan(text, ['patient', 'médical'], chunk_size) == [(1, 'patient'), (2, 'médical'), (3, 'patient')]
+
+
+def test_provisioner_output_is_not_scanned(tmp_path):
+    skills = tmp_path / "_bmad" / "custom-skills" / "qa-leader" / "data"
+    skills.mkdir(parents=True)
+    (skills / "phi-keywords.csv").write_text("keyword,category,risk_level\npatient,PHI,HIGH\n")
+    (tmp_path / "_bmad" / ".backups").mkdir()
+    (tmp_path / "_bmad" / ".backups" / "object").write_text("patient")
+    (tmp_path / "app.py").write_text("x = 1\n")
+    
+    scanner = PhiScanner({'patient': PhiKeyword('patient', 'PHI', 'HIGH')}, exclude=provisioner_paths(tmp_path))
+    assert [path for path, _ in scanner.iter_files(tmp_path)] == [str(tmp_path / "app.py")]
@@ -0,0 +1,203 @@
+"""
+Tests for BMADProvisioner.provision, end to end with the bundled generator:
+what lands in the project and what is kept out of it, and how --non-interactive
+runs answer the missing-version and failure questions
+"""
+
+import os
+import sys
+import tarfile
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from bmad_provisioner import BMADProvisioner, ProvisionPolicy
+from core.generator import SkillBackup
+from core.render_cache import project_cache_dir
+
+SRC = Path(__file__).resolve().parents[1]
+GENERATOR = SRC / "bmad-skill-generator" / "scripts" / "init_bmad_skill.py"
+
+# Leaves a partial leader behind, then fails
+FAILING_GENERATOR = """import sys
+from pathlib import Path
+leader = Path(sys.argv[sys.argv.index('--output') + 1]) / sys.argv[1]
+leader.mkdir(parents=True, exist_ok=True)
+(leader / "SKILL.md").write_text("partial")
+sys.exit("generator crashed")
+"""
+
+MANIFEST = """project:
+  name: provision-test
+  bmad_version: v6.x
+  root: {root}
+  leaders:
+    - name: dev-leader
+      domain: generic
+      phase: 4-implementation
+      specialists:
+        - {{id: backend, name: Backend Developer, domain: APIs, skills: [REST]}}
+        - {{id: frontend, name: Frontend Developer, domain: UI, skills: [React]}}
+"""
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    monkeypatch.setenv('BMAD_PROVISIONER_CACHE', str(tmp_path / "cache"))
+    root = tmp_path / "project"
+    (root / "_bmad" / "_config").mkdir(parents=True)
+    (root / "_bmad" / "_config" / "manifest.yaml").write_text("installation:\n  version: 6.0.0\n")
+    (root / "skills-manifest.yaml").write_text(MANIFEST.format(root=root))
+    return root
+
+
+def provision(project, policy=None, **kwargs):
+    provisioner = BMADProvisioner(project / "skills-manifest.yaml", project, policy=policy)
+    kwargs.setdefault('render_cache', 'off')
+    return provisioner.provision(generator_script=GENERATOR, **kwargs)
+
+
+def test_shared_specialists_are_stored_outside_the_project(project):
+    assert provision(project)
+    
+    assert (project / "_bmad" / "custom-skills" / "dev-leader" / "SKILL.md").is_file()
+    assert any((project_cache_dir(project) / "specialists").iterdir())
+    assert not (project / "_bmad" / ".cache" / "specialists").exists()
+
+
+@pytest.mark.parametrize('render_cache', ['off', 'copy'])
+def test_unchanged_units_keep_user_edits_with_and_without_render_cache(project, render_cache):
+    agents = project / "_bmad" / "custom-skills" / "dev-leader" / "agents"
+    assert provision(project, render_cache=render_cache)
+    for name in ('backend', 'frontend'):
+        (agents / f"specialist-{name}.md").write_text(f"my {name} notes\n")
+    
+    assert provision(project, render_cache=render_cache)
+    assert (agents / "specialist-backend.md").read_text() == "my backend notes\n"
+    
+    # Only the backend specialist's inputs change; frontend's unit is kept
+    manifest = project / "skills-manifest.yaml"
+    manifest.write_text(manifest.read_text().replace("skills: [REST]", "skills: [REST, GraphQL]"))
+    assert provision(project, render_cache=render_cache)
+    assert "GraphQL" in (agents / "specialist-backend.md").read_text()
+    assert (agents / "specialist-frontend.md").read_text() == "my frontend notes\n"
+
+
+def test_cache_miss_reports_the_project_path_not_the_staging_one(project, capsys):
+    assert provision(project, render_cache='copy')
+    
+    out = capsys.readouterr().out
+    assert f"generated successfully at {project / '_bmad' / 'custom-skills' / 'dev-leader'}" in out
+    assert "staging" not in out
+
+
+def test_tar_output_leaves_the_project_unchanged(project, tmp_path):
+    def tree():
+        return {p.relative_to(project): p.read_bytes() for p in project.rglob('*') if p.is_file()}
+    
+    assert provision(project)
+    before = tree()
+    archive = tmp_path / "skills.tar"
+    
+    assert provision(project, tar_output=archive)
+    
+    assert tree() == before
+    with tarfile.open(archive) as tar:
+        assert "_bmad/custom-skills/dev-leader/SKILL.md" in tar.getnames()
+
+
+def test_prune_removes_only_orphans_under_custom_skills(project):
+    skills = project / "_bmad" / "custom-skills"
+    assert provision(project)
+    (skills / "old-leader" / "agents").mkdir(parents=True)
+    (skills / "old-leader" / "agents" / "leader-old.md").write_text("generated")
+    (skills / "my-skill").mkdir()
+    (skills / "my-skill" / "SKILL.md").write_text("mine")
+    (skills / "dev-leader" / "agents" / "my-notes.md").write_text("mine")
+    manifest = project / "skills-manifest.yaml"
+    manifest.write_text(manifest.read_text().replace(
+        "{id: frontend, name: Frontend Developer, domain: UI, skills: [React]}",
+        "{id: mobile, name: Mobile Developer, domain: Apps, skills: [Swift]}"
+    ))
+    orphans = [
+        skills / "old-leader",
+        skills / "dev-leader" / "agents" / "specialist-frontend.md",
+        skills / "dev-leader" / "agents" / "specialist-frontend.agent.yaml",
+        skills / "dev-leader" / "references" / "knowledge-frontend.md",
+    ]
+    
+    # Reported but kept without --prune
+    assert provision(project)
+    assert all(path.exists() for path in orphans)
+    
+    assert provision(project, prune=True)
+    assert not any(path.exists() for path in orphans)
+    assert (skills / "my-skill" / "SKILL.md").read_text() == "mine"
+    assert (skills / "dev-leader" / "agents" / "my-notes.md").read_text() == "mine"
+    assert (skills / "dev-leader" / "agents" / "specialist-mobile.md").is_file()
+    # The pruned leader can still be restored
+    assert SkillBackup(project).latest_snapshot("old-leader") is not None
+
+
+def run_cli(project, *options, generator=GENERATOR):
+    env = {**os.environ, 'BMAD_PROVISIONER_CACHE': str(project.parent / "cache")}
+    return subprocess.run(
+        [sys.executable, str(SRC / "bmad_provisioner.py"), '--config', str(project / "skills-manifest.yaml"),
+         '--mode', 'provision', '--generator-script', str(generator), '--render-cache', 'off',
+         '--knowledge-top', '0', '--non-interactive', *options],
+        capture_output=True, text=True, env=env, stdin=subprocess.DEVNULL
+    )
+
+
+def test_policy_defaults_never_prompt(monkeypatch):
+    monkeypatch.setattr('builtins.input', lambda prompt: pytest.fail("prompted"))
+    policy = ProvisionPolicy(interactive=False)
+    
+    assert ProvisionPolicy.DEFAULTS == {'on_missing_version': 'abort', 'on_failure': 'keep'}
+    assert policy.resolve('on_missing_version', "Continue?", yes='continue', no='abort') == 'abort'
+    assert policy.resolve('on_failure', "Restore?", yes='restore', no='keep') == 'keep'
+    assert ProvisionPolicy(on_failure='restore', interactive=False).resolve(
+        'on_failure', "Restore?", yes='restore', no='keep'
+    ) == 'restore'
+
+
+def test_prompts_only_on_a_terminal(monkeypatch):
+    monkeypatch.setattr('builtins.input', lambda prompt: 'y')
+    monkeypatch.setattr(sys.stdin, 'isatty', lambda: False, raising=False)
+    assert ProvisionPolicy().resolve('on_failure', "Restore?", yes='restore', no='keep') == 'keep'
+    
+    monkeypatch.setattr(sys.stdin, 'isatty', lambda: True, raising=False)
+    assert ProvisionPolicy().resolve('on_failure', "Restore?", yes='restore', no='keep') == 'restore'
+
+
+def test_non_interactive_missing_version(project):
+    (project / "_bmad" / "_config" / "manifest.yaml").unlink()
+    
+    aborted = run_cli(project)
+    assert aborted.returncode == 1
+    assert "on-missing-version=abort" in aborted.stdout
+    assert not (project / "_bmad" / "custom-skills").exists()
+    
+    assert run_cli(project, '--on-missing-version', 'continue').returncode == 0
+    assert (project / "_bmad" / "custom-skills" / "dev-leader" / "SKILL.md").is_file()
+
+
+@pytest.mark.parametrize('on_failure, skill_md', [
+    (None, "partial"),
+    ('keep', "partial"),
+    ('restore', "provisioned"),
+])
+def test_non_interactive_failure_policy(project, tmp_path, on_failure, skill_md):
+    skill = project / "_bmad" / "custom-skills" / "dev-leader" / "SKILL.md"
+    assert provision(project)
+    skill.write_text("provisioned")
+    failing = tmp_path / "failing_generator.py"
+    failing.write_text(FAILING_GENERATOR)
+    
+    options = ['--on-failure', on_failure] if on_failure else []
+    result = run_cli(project, *options, generator=failing)
+    
+    assert result.returncode == 1
+    assert "Some skills failed to provision" in result.stdout
+    assert skill.read_text() == skill_md
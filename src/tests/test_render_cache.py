@@ -0,0 +1,78 @@
+"""
+Tests for core.render_cache: copies never share an inode with the cache,
+and eviction waits for other users of the cache directory
+"""
+
+import os
+import threading
+import importlib.util
+from pathlib import Path
+
+from core.render_cache import RenderCache, _file_lock
+
+GENERATOR = Path(__file__).parent.parent / "bmad-skill-generator" / "scripts" / "init_bmad_skill.py"
+
+
+def cached(tmp_path, contents):
+    source = tmp_path / "render"
+    for rel, text in contents.items():
+        (source / rel).parent.mkdir(parents=True, exist_ok=True)
+        (source / rel).write_text(text)
+    cache = RenderCache(tmp_path / "cache")
+    return cache, cache.put('key', source)
+
+
+def test_materialize_copies(tmp_path):
+    cache, files = cached(tmp_path, {'agents/leader.md': "leader"})
+    target = cache.materialize(files, tmp_path / "project", 'agents/leader.md')
+    
+    assert target.read_text() == "leader"
+    assert target.stat().st_nlink == 1
+    target.write_text("edited")
+    assert cache.read(files, 'agents/leader.md') == "leader"
+
+
+def test_materialize_breaks_links_left_by_older_versions(tmp_path):
+    cache, files = cached(tmp_path, {'SKILL.md': "skill"})
+    target = tmp_path / "project" / "SKILL.md"
+    target.parent.mkdir()
+    os.link(cache._object_path(files['SKILL.md'][0]), target)
+    
+    cache.materialize(files, tmp_path / "project", 'SKILL.md')
+    assert target.stat().st_nlink == 1
+    target.write_text("edited")
+    assert cache.read(files, 'SKILL.md') == "skill"
+
+
+def test_generator_writes_replace_files_instead_of_writing_through_links(tmp_path):
+    spec = importlib.util.spec_from_file_location("init_bmad_skill_under_test", GENERATOR)
+    generator = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(generator)
+    
+    shared = tmp_path / "shared.md"
+    shared.write_text("shared")
+    linked = tmp_path / "skill" / "linked.md"
+    linked.parent.mkdir()
+    os.link(shared, linked)
+    
+    generator.write_file(linked, "rendered")
+    with generator.open_pipeline(writers=2) as pipeline:
+        generator.write_file(tmp_path / "skill" / "other.md", "piped")
+    
+    assert linked.read_text() == "rendered"
+    assert shared.read_text() == "shared"
+    assert pipeline.written == [tmp_path / "skill" / "other.md"]
+    assert sorted(p.name for p in linked.parent.iterdir()) == ["linked.md", "other.md"]
+
+
+def test_evict_waits_for_the_lock_of_another_process(tmp_path):
+    cache, _ = cached(tmp_path, {'a.md': "a" * 100})
+    other = RenderCache(tmp_path / "cache", max_bytes=0)
+    
+    with _file_lock(cache.cache_dir / "lock"):
+        thread = threading.Thread(target=other.evict)
+        thread.start()
+        thread.join(0.3)
+        assert thread.is_alive()
+    thread.join(5)
+    assert not thread.is_alive()
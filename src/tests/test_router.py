@@ -0,0 +1,52 @@
+"""
+Tests for core.router: NDJSON batches route every line, reporting bad lines
+instead of aborting
+"""
+
+import pytest
+
+from core.router import RoutingEngine
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    monkeypatch.setenv('BMAD_PROVISIONER_CACHE', str(tmp_path / "cache"))
+    data = tmp_path / "_bmad" / "custom-skills" / "dev-leader" / "data"
+    data.mkdir(parents=True)
+    (data / "routing-keywords.csv").write_text(
+        "specialist,keywords\nbackend,\"rest api,database\"\nfrontend,\"react,css\"\n"
+    )
+    return RoutingEngine(tmp_path)
+
+
+def test_batch_routes_and_checks_expected(engine):
+    lines = ['{"id": "a", "request": "fix the REST API", "expected": "backend"}\n', '\n',
+             '{"request": "style with CSS"}\n']
+    results = list(engine.route_batch(lines, ['dev-leader']))
+    
+    assert [(r['id'], r['specialist']) for r in results] == [('a', 'backend'), (3, 'frontend')]
+    assert results[0]['ok'] is True
+
+
+def test_bad_lines_yield_errors_and_the_batch_goes_on(engine):
+    lines = [
+        '{"request": "react page"}',
+        '{"request": "broken',
+        '["not", "an", "object"]',
+        '{"id": "no-request"}',
+        '{"id": "ghost", "request": "css", "leader": "ghost-leader"}',
+        '{"request": "database index"}',
+    ]
+    results = list(engine.route_batch(lines, ['dev-leader']))
+    
+    assert [r['id'] for r in results] == [1, 2, 3, 'no-request', 'ghost', 6]
+    assert [('error' in r) for r in results] == [False, True, True, True, True, False]
+    assert "ghost-leader" in results[4]['error']
+    assert results[5]['specialist'] == 'backend'
+
+
+def test_compiled_tables_are_cached_outside_the_project(engine, tmp_path):
+    list(engine.route_batch(['{"request": "css"}'], ['dev-leader']))
+    
+    assert (engine.cache_dir / "dev-leader.json").is_file()
+    assert not (tmp_path / "_bmad" / ".cache").exists()
@@ -0,0 +1,65 @@
+"""
+Tests for core.scheduler and the provision summary: integration workflows
+follow the leaders being provisioned, and their failures fail the run
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from bmad_provisioner import BMADProvisioner
+from core.scheduler import ProvisionGraph, WORKFLOW
+from models.manifest import SkillsManifest
+
+MANIFEST = """project:
+  name: scheduler-test
+  bmad_version: v6.x
+  root: {root}
+  leaders:
+    - name: dev-leader
+      domain: generic
+      specialists: [{{id: backend, name: Backend, domain: APIs, skills: [REST]}}]
+    - name: qa-leader
+      domain: generic
+      specialists: [{{id: unit, name: Unit, domain: pytest, skills: [TDD]}}]
+    - name: cis-leader
+      domain: cis
+      specialists: [{{id: research, name: Research, domain: Markets, skills: [interviews]}}]
+  integration:
+    workflows:
+      - {{phase: 4-implementation, name: dev-flow, sequence: [sm, dev-leader, qa-leader]}}
+      - {{phase: 1-discovery, name: discovery, sequence: [analyst, cis-leader]}}
+      - {{phase: 2-planning, name: bmad-only, sequence: [pm, architect]}}
+"""
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    path = tmp_path / "skills-manifest.yaml"
+    path.write_text(MANIFEST.format(root=tmp_path))
+    return SkillsManifest.from_yaml(path)
+
+
+def workflows(graph):
+    return sorted(node.name for node in graph.nodes.values() if node.kind == WORKFLOW)
+
+
+def test_all_leaders_keep_every_workflow(manifest):
+    assert workflows(ProvisionGraph.from_manifest(manifest)) == ['bmad-only', 'dev-flow', 'discovery']
+
+
+def test_subset_keeps_only_workflows_of_selected_leaders(manifest):
+    qa = [l for l in manifest.project.leaders if l.name == 'qa-leader']
+    graph = ProvisionGraph.from_manifest(manifest, qa)
+    
+    assert workflows(graph) == ['dev-flow']
+    assert graph.errors == []
+
+
+def test_failed_workflow_counts_as_a_failure(manifest, tmp_path, capsys):
+    provisioner = BMADProvisioner(tmp_path / "skills-manifest.yaml", project_root=tmp_path)
+    generator = SimpleNamespace(workflow_results={'dev-flow': False, 'discovery': True, 'bmad-only': None})
+    results = {'dev-leader': True, 'qa-leader': True, 'cis-leader': True}
+    
+    assert provisioner._print_summary(generator, manifest.project.leaders, results) == 1
+    assert "1 workflow(s) failed" in capsys.readouterr().out
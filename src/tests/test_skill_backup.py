@@ -0,0 +1,62 @@
+"""
+Tests for core.generator.SkillBackup: failed leaders are restored from
+archived snapshots and the snapshot index follows what was consumed
+"""
+
+import pytest
+
+from core.generator import SkillBackup
+
+
+@pytest.fixture
+def backup(tmp_path):
+    skills = tmp_path / "_bmad" / "custom-skills"
+    for leader, text in (('dev-leader', "dev"), ('qa-leader', "qa")):
+        (skills / leader / "agents").mkdir(parents=True)
+        (skills / leader / "SKILL.md").write_text(text)
+        (skills / leader / "agents" / "leader.md").write_text(f"{text} leader")
+    return SkillBackup(tmp_path)
+
+
+def test_restore_archived_leader_and_unindex_it(backup):
+    snapshot_path = backup.backup_skills(['dev-leader', 'qa-leader'])
+    (backup.custom_skills / "dev-leader" / "SKILL.md").write_text("broken")
+    (backup.custom_skills / "dev-leader" / "partial.md").write_text("partial")
+    
+    assert backup.restore_backup(snapshot_path, leaders=['dev-leader'])
+    
+    restored = backup.custom_skills / "dev-leader"
+    assert sorted(p.name for p in restored.rglob('*')) == ['SKILL.md', 'agents', 'leader.md']
+    assert (restored / "SKILL.md").read_text() == "dev"
+    index = backup._load_index()
+    assert index['snapshots'][snapshot_path.stem]['leaders'] == ['qa-leader']
+    assert 'dev-leader' not in index['leaders']
+    assert backup.latest_snapshot('qa-leader') == snapshot_path
+
+
+def test_restore_removes_leaders_the_snapshot_does_not_hold(backup):
+    snapshot_path = backup.backup_skills(['dev-leader'])
+    (backup.custom_skills / "new-leader").mkdir()
+    
+    assert backup.restore_backup(snapshot_path, leaders=['new-leader'])
+    assert not (backup.custom_skills / "new-leader").exists()
+
+
+def test_restore_of_a_vanished_snapshot_fails(backup, capsys):
+    snapshot_path = backup.backup_skills(['dev-leader'])
+    snapshot_path.unlink()
+    
+    assert not backup._restore_archived(snapshot_path, None)
+    assert "Backup not found" in capsys.readouterr().out
+    assert (backup.custom_skills / "dev-leader" / "SKILL.md").read_text() == "dev"
+
+
+def test_wait_for_purge_empties_the_trash(backup):
+    snapshot_path = backup.backup_skills(['dev-leader'])
+    (backup.custom_skills / "dev-leader" / "SKILL.md").write_text("broken")
+    
+    assert backup.restore_backup(snapshot_path, leaders=['dev-leader'])
+    backup.wait_for_purge()
+    
+    assert backup._purge_thread is None
+    assert list(backup.trash_dir.iterdir()) == []
@@ -0,0 +1,101 @@
+"""
+Tests for core.tar_output: CSVs are merged three-way with a base tarball and
+its sidecars, base members that were not regenerated are copied through, and
+file modes are kept
+"""
+
+import io
+import tarfile
+
+import pytest
+
+from core.csv_merger import SmartCSVMerger
+from core.tar_output import TarOutput
+
+HEADERS = ['keyword', 'category']
+DATA = "_bmad/custom-skills/dev-leader/data"
+
+
+def tar_bytes(members):
+    """A tarball of name -> (text, mode)"""
+    out = io.BytesIO()
+    with tarfile.open(fileobj=out, mode='w') as tar:
+        for name, (text, mode) in members.items():
+            data = text.encode('utf-8')
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mode = mode
+            tar.addfile(info, io.BytesIO(data))
+    return out.getvalue()
+
+
+def read_tar(data):
+    with tarfile.open(fileobj=io.BytesIO(data), mode='r') as tar:
+        return {
+            m.name: (tar.extractfile(m).read().decode('utf-8'), m.mode)
+            for m in tar.getmembers() if m.isfile()
+        }
+
+
+@pytest.fixture
+def base(tmp_path):
+    """Previous image: generated from two rows, then edited by the user"""
+    generated, sidecar, _ = SmartCSVMerger().merge_text(None, None, [['a', 'x'], ['b', 'y']], HEADERS)
+    assert generated == "keyword,category\r\na,x\r\nb,y\r\n"
+    path = tmp_path / "base.tar"
+    path.write_bytes(tar_bytes({
+        f"./{DATA}/keywords.csv": ("keyword,category\r\na,x\r\nb,mine\r\ncustom,user\r\n", 0o644),
+        f"{DATA}/.keywords.csv.base": (sidecar, 0o644),
+        "_bmad/custom-skills/dev-leader/SKILL.md": ("old skill\n", 0o644),
+        "_bmad/custom-skills/qa-leader/run.sh": ("#!/bin/sh\n", 0o755),
+    }))
+    return path
+
+
+def test_csv_merged_three_way_with_base_sidecar(tmp_path, base):
+    out = io.BytesIO()
+    output = TarOutput(out, tmp_path, base)
+    output.add_file(f"{DATA}/keywords.csv", b"keyword,category\na,z\nb,z\n")
+    output.close()
+    
+    members = read_tar(out.getvalue())
+    # a: template update, b: user edit kept, custom: user row kept
+    assert members[f"{DATA}/keywords.csv"][0] == "keyword,category\r\ncustom,user\r\na,z\r\nb,mine\r\n"
+    assert output.merged == 1
+    # The new sidecar is the new template, so the next merge sees b as edited
+    rerun = SmartCSVMerger().merge_text(
+        members[f"{DATA}/keywords.csv"][0], members[f"{DATA}/.keywords.csv.base"][0],
+        [['a', 'z'], ['b', 'z']], HEADERS
+    )[0]
+    assert rerun == members[f"{DATA}/keywords.csv"][0]
+
+
+def test_close_copies_base_members_not_regenerated(tmp_path, base):
+    out = io.BytesIO()
+    output = TarOutput(out, tmp_path, base)
+    output.submit(tmp_path / "_bmad/custom-skills/dev-leader/SKILL.md", b"new skill\n")
+    output.close()
+    
+    members = read_tar(out.getvalue())
+    names = [m.name for m in tarfile.open(fileobj=io.BytesIO(out.getvalue())).getmembers()]
+    assert len(names) == len(set(names))
+    assert members["_bmad/custom-skills/dev-leader/SKILL.md"][0] == "new skill\n"
+    assert members["_bmad/custom-skills/qa-leader/run.sh"] == ("#!/bin/sh\n", 0o755)
+    # Not regenerated: user's CSV and its sidecar pass through untouched
+    assert members[f"{DATA}/keywords.csv"][0] == "keyword,category\r\na,x\r\nb,mine\r\ncustom,user\r\n"
+    assert f"{DATA}/.keywords.csv.base" in members
+
+
+def test_streamed_members_keep_their_mode(tmp_path):
+    out = io.BytesIO()
+    output = TarOutput(out, tmp_path)
+    count = output.add_stream("_bmad/custom-skills", io.BytesIO(tar_bytes({
+        "dev-leader/run.sh": ("#!/bin/sh\n", 0o775),
+        "dev-leader/SKILL.md": ("skill\n", 0o600),
+    })))
+    output.close()
+    
+    members = read_tar(out.getvalue())
+    assert count == 2
+    assert members["_bmad/custom-skills/dev-leader/run.sh"][1] == 0o755
+    assert members["_bmad/custom-skills/dev-leader/SKILL.md"][1] == 0o644
@@ -0,0 +1,99 @@
+"""
+Tests for GapAnalyzer.upgrade_impact: BMAD changes since each leader's
+provisioning baseline are mapped to the leaders referencing them
+"""
+
+import json
+
+import pytest
+
+from core.analyzer import GapAnalyzer
+from models.manifest import SkillsManifest
+
+MANIFEST = """project:
+  name: impact-test
+  bmad_version: v6.x
+  root: {root}
+  leaders:
+    - name: dev-leader
+      domain: generic
+      phase: 4-implementation
+      specialists: [{{id: backend, name: Backend, domain: APIs, skills: [REST]}}]
+    - name: pm-leader
+      domain: generic
+      phase: 2-planning
+      specialists: [{{id: prd, name: PRD, domain: Product, skills: [specs]}}]
+"""
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "_bmad" / "_config").mkdir(parents=True)
+    (tmp_path / "skills-manifest.yaml").write_text(MANIFEST.format(root=tmp_path))
+    return tmp_path
+
+
+def install(project, files):
+    """Write files-manifest.csv with the given path -> hash"""
+    rows = "".join(f"md,x,bmm,{path},{digest}\n" for path, digest in files.items())
+    (project / "_bmad" / "_config" / "files-manifest.csv").write_text("type,name,module,path,hash\n" + rows)
+
+
+def impact(project):
+    manifest = SkillsManifest.from_yaml(project / "skills-manifest.yaml")
+    return GapAnalyzer(project).upgrade_impact(manifest)
+
+
+def test_partial_provision_keeps_the_baseline_of_other_leaders(project):
+    install(project, {'bmm/workflows/4-implementation/dev.md': 'a', 'bmm/workflows/2-plan/prd.md': 'a'})
+    GapAnalyzer(project).save_baseline(['dev-leader', 'pm-leader'])
+    
+    # Upgrade touches both phases, then only pm-leader is re-provisioned
+    install(project, {'bmm/workflows/4-implementation/dev.md': 'b', 'bmm/workflows/2-plan/prd.md': 'b'})
+    GapAnalyzer(project).save_baseline(['pm-leader'])
+    
+    result = impact(project)
+    assert result.affected_leaders == ['dev-leader']
+    assert result.affected['pm-leader'] == []
+    assert len(json.loads((project / "_bmad" / ".cache" / "provisioned-baseline.json").read_text())['states']) == 2
+
+
+def test_leader_without_baseline_is_affected(project):
+    install(project, {'bmm/workflows/2-plan/prd.md': 'a'})
+    GapAnalyzer(project).save_baseline(['pm-leader'])
+    
+    result = impact(project)
+    assert result.affected == {'dev-leader': ["no baseline"], 'pm-leader': []}
+
+
+def test_baseline_from_before_per_leader_tracking_applies_to_every_leader(project):
+    install(project, {'bmm/workflows/4-implementation/dev.md': 'b'})
+    legacy = {'version': '6.0.0', 'modules': {}, 'files': {'bmm/workflows/4-implementation/dev.md': 'a'}}
+    (project / "_bmad" / ".cache").mkdir()
+    (project / "_bmad" / ".cache" / "provisioned-baseline.json").write_text(json.dumps(legacy))
+    
+    assert impact(project).affected_leaders == ['dev-leader']
+    
+    GapAnalyzer(project).save_baseline(['dev-leader'])
+    result = impact(project)
+    assert result.affected_leaders == []
+    assert result.has_baseline
+
+
+def test_phase_maps_to_its_numbered_workflow_directory(project):
+    install(project, {
+        'bmm/workflows/4-implementation/dev.md': 'a', 'bmm/workflows/2-plan/prd.md': 'a',
+        'bmm/workflows/1-analysis/brief.md': 'a', 'bmm/workflows/42-extra/x.md': 'a', 'core/tasks/task.md': 'a',
+    })
+    GapAnalyzer(project).save_baseline(['dev-leader', 'pm-leader'])
+    
+    # Nothing under 2-... changes, and 42-... is not phase 4
+    install(project, {
+        'bmm/workflows/4-implementation/dev.md': 'b', 'bmm/workflows/2-plan/prd.md': 'a',
+        'bmm/workflows/1-analysis/brief.md': 'b', 'bmm/workflows/42-extra/x.md': 'b', 'core/tasks/task.md': 'b',
+    })
+    
+    result = impact(project)
+    assert result.affected_leaders == ['dev-leader']
+    assert result.affected['dev-leader'] == ['bmm/workflows/4-implementation/dev.md changed']
+    assert result.affected['pm-leader'] == []
@@ -0,0 +1,92 @@
+"""
+Tests for the generator's WritePipeline: submit() blocks once the queue is
+full, writer errors reach the caller, and a pipelined render writes the same
+bytes as serial writes
+"""
+
+import sys
+import threading
+import contextlib
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+GENERATOR = Path(__file__).parent.parent / "bmad-skill-generator" / "scripts" / "init_bmad_skill.py"
+
+
+@pytest.fixture
+def generator():
+    spec = importlib.util.spec_from_file_location("init_bmad_skill_under_test", GENERATOR)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_submit_blocks_while_the_queue_is_full(generator, tmp_path, monkeypatch):
+    release = threading.Event()
+    original = generator.replace_file
+    
+    def slow_replace(path, data, fsync=False):
+        release.wait(5)
+        original(path, data, fsync=fsync)
+    
+    monkeypatch.setattr(generator, 'replace_file', slow_replace)
+    pipeline = generator.WritePipeline(writers=1, max_pending=2)
+    # One file held by the writer, two queued, the fourth has to wait
+    submitter = threading.Thread(target=lambda: [
+        pipeline.submit(tmp_path / f"{n}.md", b"x") for n in range(4)
+    ])
+    submitter.start()
+    submitter.join(0.3)
+    
+    assert submitter.is_alive()
+    assert pipeline.queue.qsize() == 2
+    
+    release.set()
+    submitter.join(5)
+    pipeline.close()
+    assert sorted(p.name for p in pipeline.written) == ['0.md', '1.md', '2.md', '3.md']
+
+
+def test_writer_error_reaches_the_caller(generator, tmp_path):
+    (tmp_path / "not-a-dir").write_text("file")
+    
+    with pytest.raises(OSError):
+        with generator.open_pipeline(writers=2):
+            generator.write_file(tmp_path / "ok.md", "ok")
+            generator.write_file(tmp_path / "not-a-dir" / "agent.md", "lost")
+    
+    assert generator._pipeline is None
+    assert (tmp_path / "ok.md").read_text() == "ok"
+    
+    pipeline = generator.WritePipeline(writers=1)
+    pipeline.submit(tmp_path / "not-a-dir" / "agent.md", b"lost")
+    pipeline.queue.join()
+    with pytest.raises(OSError):
+        pipeline.submit(tmp_path / "later.md", b"later")
+    with pytest.raises(OSError):
+        pipeline.close()
+
+
+def render(generator, output, monkeypatch, *options):
+    monkeypatch.setattr(sys, 'argv', [
+        'init_bmad_skill.py', 'dev-leader', '--output', str(output), '--domain', 'healthcare',
+        '--specialists', 'backend:Backend:APIs:REST,SQL', 'frontend:Frontend:UI:React', *options
+    ])
+    generator.main()
+    return {
+        p.relative_to(output).as_posix(): p.read_bytes()
+        for p in output.rglob('*') if p.is_file()
+    }
+
+
+def test_pipelined_output_matches_serial_writes(generator, tmp_path, monkeypatch, capsys):
+    pipelined = render(generator, tmp_path / "pipelined", monkeypatch, '--writers', '8', '--max-pending', '1')
+    
+    # Without a pipeline, write_file() writes synchronously
+    monkeypatch.setattr(generator, 'open_pipeline', lambda **kwargs: contextlib.nullcontext())
+    serial = render(generator, tmp_path / "serial", monkeypatch)
+    
+    assert len(pipelined) > 10
+    assert pipelined == serial